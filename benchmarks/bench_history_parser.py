@@ -0,0 +1,83 @@
+"""Micro-benchmark for the F10 history parser.
+
+Parses synthetic pages from `benchmarks.fixtures`, which match the upstream
+format and are seeded for repeatability. See that module for why recorded
+payloads are not used.
+
+Usage: python -m benchmarks.bench_history_parser [rows]
+"""
+
+import re
+import sys
+import timeit
+from datetime import datetime
+from decimal import Decimal
+
+from lxml import html as lxml_html
+
+from benchmarks.fixtures import history_payload
+from fund_assistant.api.history_parser import parse_history
+from fund_assistant.models import HistoricalNav
+
+
+def parse_legacy(text: str) -> list[HistoricalNav]:
+    """Original multi-pass parser, kept here as the baseline."""
+    match = re.search(r'content:"(.*?)",records', text, re.DOTALL)
+    rows = re.findall(r"<tr>(.*?)</tr>", match.group(1))
+    results = []
+    for row in rows[1:]:
+        cells = re.findall(r"<td[^>]*>(.*?)</td>", row)
+        if len(cells) >= 4:
+            date_str = re.sub(r"<[^>]+>", "", cells[0])
+            nav_str = re.sub(r"<[^>]+>", "", cells[1])
+            acc_str = re.sub(r"<[^>]+>", "", cells[2])
+            change_str = re.sub(r"<[^>]+>", "", cells[3])
+            try:
+                results.append(
+                    HistoricalNav(
+                        date=datetime.strptime(date_str, "%Y-%m-%d").date(),
+                        nav=Decimal(nav_str),
+                        accumulated_nav=Decimal(acc_str),
+                        daily_change=(
+                            Decimal(change_str.replace("%", ""))
+                            if change_str not in ("", "---")
+                            else None
+                        ),
+                    )
+                )
+            except (ArithmeticError, ValueError):
+                continue
+    return results
+
+
+def parse_lxml(text: str) -> list[tuple[str, ...]]:
+    """lxml tree walk extracting raw cell text (no model construction)."""
+    match = re.search(r'content:"(.*?)",records', text, re.DOTALL)
+    tree = lxml_html.fromstring(match.group(1))
+    return [
+        tuple(cell.text_content() for cell in row[:4])
+        for row in tree.iter("tr")
+        if row[0].tag == "td"
+    ]
+
+
+def main(rows: int = 4000):
+    text = history_payload(rows)
+    assert len(parse_history(text)[0]) == len(parse_legacy(text)) == rows
+
+    cases = {
+        "legacy multi-pass regex": lambda: parse_legacy(text),
+        "lxml (cells only)": lambda: parse_lxml(text),
+        "history_parser": lambda: parse_history(text),
+    }
+    print(f"F10 lsjz payload: {rows} rows, {len(text) / 1024:.0f} KiB")
+    baseline = None
+    for name, func in cases.items():
+        runs = 10
+        best = min(timeit.repeat(func, number=runs, repeat=3)) / runs
+        baseline = baseline or best
+        print(f"  {name:<26} {best * 1000:8.2f} ms  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -0,0 +1,99 @@
+"""Micro-benchmark for model construction on bulk loads.
+
+Compares validated construction of already-converted rows with pydantic's
+unvalidated `model_construct`, and a full catalog listing with and without
+the per-row FundBasic cache.
+
+Validation runs in pydantic-core and is cheaper than `model_construct`,
+which fills fields in Python, so parsers keep the validated constructor;
+the saving on bulk loads comes from not rebuilding catalog rows at all.
+
+Usage: python -m benchmarks.bench_models [rows]
+"""
+
+import sys
+import timeit
+from array import array
+from decimal import Decimal
+
+from benchmarks.fixtures import history_rows
+from fund_assistant.models import FundBasic, HistoricalNav
+from fund_assistant.services.catalog import FUND_TYPES, RISK_LEVELS, FundCatalog
+
+
+def history_fields(rows: int) -> list[dict]:
+    """Already-converted HistoricalNav fields, as the parsers produce them."""
+    return [
+        {
+            "date": day,
+            "nav": Decimal(f"{nav:.4f}"),
+            "accumulated_nav": Decimal(f"{acc:.4f}"),
+            "daily_change": Decimal(f"{change:.2f}") if change is not None else None,
+        }
+        for day, nav, acc, change in history_rows(rows)
+    ]
+
+
+def synthetic_catalog(rows: int) -> FundCatalog:
+    """A catalog of `rows` funds cycling through every type and risk level."""
+    return FundCatalog(
+        codes=[f"{i:06d}" for i in range(rows)],
+        names=[f"测试基金{i}" for i in range(rows)],
+        initials=[f"csjj{i}" for i in range(rows)],
+        fund_types=array("B", (i % len(FUND_TYPES) for i in range(rows))),
+        risk_levels=array("B", (i % len(RISK_LEVELS) for i in range(rows))),
+        hot=array("B", bytes(rows)),
+        fingerprint="bench",
+    )
+
+
+def basic_validated(catalog: FundCatalog, position: int) -> FundBasic:
+    """Original `FundCatalog.basic`, building a new model per call."""
+    return FundBasic(
+        code=catalog.codes[position],
+        name=catalog.names[position],
+        fund_type=FUND_TYPES[catalog.fund_types[position]],
+        risk_level=RISK_LEVELS[catalog.risk_levels[position]],
+    )
+
+
+def report(title: str, rows: int, cases: dict):
+    print(f"{title}: {rows} rows")
+    baseline = None
+    for name, func in cases.items():
+        runs = 5
+        best = min(timeit.repeat(func, number=runs, repeat=3)) / runs
+        baseline = baseline or best
+        per_row = best / rows * 1e6
+        print(f"  {name:<26} {best * 1000:8.2f} ms  {per_row:6.2f} us/row  {baseline / best:5.2f}x")
+
+
+def main(rows: int = 20000):
+    fields = history_fields(rows)
+    assert [HistoricalNav(**f) for f in fields[:50]] == [
+        HistoricalNav.model_construct(**f) for f in fields[:50]
+    ]
+    report(
+        "HistoricalNav",
+        rows,
+        {
+            "validated": lambda: [HistoricalNav(**f) for f in fields],
+            "model_construct": lambda: [HistoricalNav.model_construct(**f) for f in fields],
+        },
+    )
+
+    catalog = synthetic_catalog(rows)
+    positions = catalog.positions()
+    assert basic_validated(catalog, 7) == catalog.basic(7)
+    report(
+        "FundBasic listing",
+        rows,
+        {
+            "validated": lambda: [basic_validated(catalog, p) for p in positions],
+            "cached": lambda: [catalog.basic(p) for p in positions],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
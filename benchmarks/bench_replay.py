@@ -0,0 +1,72 @@
+"""Batch latency against a simulated upstream.
+
+Records the fixture payloads into a temporary cassette, then replays them
+with realistic latency, jitter and faults. It times `get_fund_prices` and
+`sync_histories` at several concurrency levels and reports the injected
+outcomes.
+
+Usage: python -m benchmarks.bench_replay [funds] [latency]
+"""
+
+import sys
+import tempfile
+import time
+
+from benchmarks.fixtures import upstream_transport
+from fund_assistant.api import TianTianAPI
+from fund_assistant.api.replay import RecordingTransport, ReplayTransport
+from fund_assistant.api.resilience import Resilience
+from fund_assistant.services import FundService
+from fund_assistant.storage import NavStore
+
+# Concurrency levels compared for each batch
+CONCURRENCY = (1, 4, 16, 64)
+
+# History rows per fund: a few F10 pages each
+HISTORY_ROWS = 1000
+
+
+def service(transport, concurrency: int = 8) -> FundService:
+    """A service on `transport` with a fresh in-memory store.
+
+    The client keeps the default retry and breaker policy but drops the
+    rate limit, so only the simulated upstream shapes the timings.
+    """
+    api = TianTianAPI(transport=transport, resilience=Resilience(rate=1e9, burst=10**9))
+    return FundService(concurrency=concurrency, nav_store=NavStore(":memory:"), api=api)
+
+
+def main(funds: int = 100, latency: float = 0.08):
+    codes = [f"{110000 + i:06d}" for i in range(funds)]
+    with tempfile.TemporaryDirectory(prefix="fund-cassette-") as cassette:
+        recorder = RecordingTransport(cassette, transport=upstream_transport(HISTORY_ROWS))
+        recording = service(recorder)
+        recording.get_fund_prices(codes)
+        recording.sync_histories(codes)
+        print(f"Recorded {recorder.recorded} responses for {funds} funds")
+        print(f"Replaying with {latency * 1000:.0f} ms ± {latency * 250:.0f} ms, 2% 503s")
+
+        batches = {
+            "get_fund_prices": lambda svc: svc.get_fund_prices(codes),
+            "sync_histories": lambda svc: svc.sync_histories(codes),
+        }
+        for name, batch in batches.items():
+            print(f"  {name}")
+            for concurrency in CONCURRENCY:
+                player = ReplayTransport(
+                    cassette, latency=latency, jitter=latency / 4, error_rate=0.02, seed=1
+                )
+                replaying = service(player, concurrency)
+                start = time.perf_counter()
+                batch(replaying)
+                elapsed = time.perf_counter() - start
+                counts = sorted(player.counts.items())
+                outcomes = ", ".join(f"{key} {count}" for key, count in counts)
+                print(f"    concurrency {concurrency:<3} {elapsed:7.2f} s  ({outcomes})")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 100,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 0.08,
+    )
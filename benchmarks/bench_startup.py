@@ -0,0 +1,83 @@
+"""CLI cold-start benchmark.
+
+Reports `python -X importtime` totals for the CLI module and its heaviest
+imports, plus median wall time of offline commands run as fresh processes.
+
+Usage: python -m benchmarks.bench_startup [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Offline commands only, so numbers do not depend on the network
+COMMANDS = {
+    "--help": ["--help"],
+    "calc": ["calc", "110022", "1000", "10"],
+    "summary": ["summary"],
+}
+
+# Modules whose presence in the import graph would indicate an eager import
+WATCHED_MODULES = ["typer", "rich.console", "httpx", "pydantic", "fund_assistant.services"]
+
+
+def import_times() -> dict[str, int]:
+    """Cumulative import time in microseconds per top-level import of the CLI."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import fund_assistant.cli"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        times.setdefault(name, int(cumulative))
+    return times
+
+
+def command_time(args: list[str], runs: int, env: dict) -> float:
+    """Median wall time in milliseconds of `python -m fund_assistant <args>`."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "fund_assistant", *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            check=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main(runs: int = 5):
+    times = import_times()
+    print(f"import fund_assistant.cli: {times['fund_assistant.cli'] / 1000:.1f} ms cumulative")
+    for name in WATCHED_MODULES:
+        status = f"{times[name] / 1000:.1f} ms" if name in times else "not imported"
+        print(f"  {name:<26} {status}")
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "FUND_ASSISTANT_HOME": home}
+        interpreter = statistics.median(_interpreter_time() for _ in range(runs))
+        print(f"\nwall time (median of {runs}, bare interpreter {interpreter:.0f} ms)")
+        for label, args in COMMANDS.items():
+            print(f"  {label:<10} {command_time(args, runs, env):7.0f} ms")
+
+
+def _interpreter_time() -> float:
+    """Wall time in milliseconds of an empty interpreter run."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
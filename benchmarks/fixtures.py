@@ -0,0 +1,210 @@
+"""Upstream payload fixtures for offline benchmarks.
+
+The payloads are synthetic. They use the same wire format as the eastmoney
+endpoints: the F10 history table, the fundgz JSONP and the mobile API
+envelopes. The values come from a seeded random walk, not from recorded
+responses. There are two
+reasons. The benchmarks must run without network access. They also need
+payloads of any chosen size, for example 10 000 history rows, that are
+byte-identical on every run so results stay comparable with baseline.json.
+A recorded cassette fixes both the size and the content.
+
+To benchmark against real responses, set FUND_ASSISTANT_CASSETTE to a directory
+and FUND_ASSISTANT_CASSETTE_MODE=record. `RecordingTransport` then saves them
+while the CLI runs, and `ReplayTransport` serves them back afterwards.
+
+`upstream_transport` serves the synthetic payloads to a TianTianAPI through
+httpx.MockTransport.
+"""
+
+import functools
+import json
+import random
+from datetime import date, timedelta
+
+import httpx
+
+_HISTORY_HEADER = (
+    "<table class='w782 comm lsjz'><thead><tr><th class='first'>净值日期</th>"
+    "<th>单位净值</th><th>累计净值</th><th>日增长率</th><th>申购状态</th>"
+    "<th>赎回状态</th><th class='tor last'>分红送配</th></tr></thead><tbody>"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def history_rows(total: int, seed: int = 110022) -> list[tuple[date, float, float, float | None]]:
+    """生成净值序列 / Random-walk NAV rows for `total` weekdays, newest first.
+
+    Cached, so callers must not modify the returned list.
+    """
+    rng = random.Random(seed)
+    day = date(2024, 12, 31)
+    days = []
+    while len(days) < total:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    days.reverse()
+
+    rows = []
+    nav = 1.0
+    dividends = 0.0
+    for index, day in enumerate(days):
+        change = None if index == 0 else rng.gauss(0.03, 1.4)
+        if change is not None:
+            nav = max(0.1, nav * (1 + change / 100))
+        rows.append((day, round(nav, 4), round(nav + dividends, 4), change))
+    rows.reverse()
+    return rows
+
+
+@functools.lru_cache(maxsize=256)
+def history_payload(
+    total: int,
+    page: int = 1,
+    per: int | None = None,
+    start: date | None = None,
+    seed: int = 110022,
+) -> str:
+    """F10 历史净值响应 / F10DataApi `lsjz` payload for one page of a `total`-row history.
+
+    Args:
+        total: Rows in the full history
+        page: Page number, from 1
+        per: Rows per page (defaults to the whole history)
+        start: Only include rows on or after this date, like `sdate`
+        seed: Random-walk seed, so different funds get different paths
+    """
+    rows = history_rows(total, seed)
+    if start:
+        rows = [row for row in rows if row[0] >= start]
+    per = per or total
+    pages = -(-len(rows) // per)
+    body = []
+    for day, nav, acc, change in rows[(page - 1) * per : page * per]:
+        if change is None:
+            change_cell = "<td class='tor bold'></td>"
+        else:
+            color = "red" if change >= 0 else "grn"
+            change_cell = f"<td class='tor bold {color}'>{change:.2f}%</td>"
+        body.append(
+            f"<tr><td>{day.isoformat()}</td><td class='tor bold'>{nav:.4f}</td>"
+            f"<td class='tor bold'>{acc:.4f}</td>{change_cell}"
+            "<td>开放申购</td><td>开放赎回</td><td class='red unbold'></td></tr>"
+        )
+    html = _HISTORY_HEADER + "".join(body) + "</tbody></table>"
+    records = len(rows)
+    return f'var apidata={{ content:"{html}",records:{records},pages:{pages},curpage:{page}}};'
+
+
+def estimate_payload(code: str) -> str:
+    """估值 JSONP 响应 / fundgz `{code}.js` payload."""
+    data = {
+        "fundcode": code,
+        "name": f"基准测试混合{code[-2:]}",
+        "jzrq": "2024-12-30",
+        "dwjz": "1.8214",
+        "gsz": "1.8307",
+        "gszzl": "0.51",
+        "gztime": "2024-12-31 15:00",
+    }
+    return f"jsonpgz({json.dumps(data, ensure_ascii=False, separators=(',', ':'))});"
+
+
+def detail_payload(code: str) -> str:
+    """基金详情响应 / Mobile API FundMNBasicInformation payload."""
+    info = {
+        "FCODE": code,
+        "SHORTNAME": f"基准测试混合{code[-2:]}",
+        "FTYPE": "混合型-偏股",
+        "ESTABDATE": "2015-06-18",
+        "JJGS": "基准基金管理有限公司",
+        "JJJL": "张三",
+        "ENDNAV": "12873460123.52",
+        "RATE": "0.15%",
+        "SOURCERATE": "1.50%",
+        "RISKLEVEL": "4",
+        "SYL_Y": "2.31",
+        "SYL_3Y": "-1.27",
+        "SYL_6Y": "8.92",
+        "SYL_1N": "12.04",
+        "SYL_2N": "-6.51",
+        "SYL_3N": "-18.77",
+        "SYL_5N": "41.20",
+        "SYL_JN": "10.85",
+        "SYL_LN": "182.14",
+    }
+    return _mobile_envelope(info)
+
+
+def holdings_payload(code: str) -> str:
+    """基金持仓响应 / Mobile API FundMNInverstPosition payload with ten stocks."""
+    rng = random.Random(int(code))
+    stocks = [
+        {
+            "GPDM": f"{600000 + rng.randrange(4000):06d}",
+            "GPJC": f"测试股份{i}",
+            "JZBL": f"{rng.uniform(2, 9.9):.2f}",
+            "TEXCH": "1",
+            "ISINVISBL": "0",
+            "PCTNVCHGTYPE": rng.choice(["增持", "减持", "新增"]),
+            "PCTNVCHG": f"{rng.uniform(-2, 2):.2f}",
+            "NEWTEXCH": "1",
+        }
+        for i in range(10)
+    ]
+    datas = {"fundStocks": stocks, "fundboods": [], "fundfofs": [], "ETFCODE": None}
+    return _mobile_envelope(datas, expansion="2024-12-31")
+
+
+def _mobile_envelope(datas, expansion: str | None = None) -> str:
+    """移动端响应外壳 / Wrap `Datas` in the mobile API response envelope."""
+    return json.dumps(
+        {
+            "Datas": datas,
+            "ErrCode": 0,
+            "Success": True,
+            "ErrMsg": None,
+            "Message": None,
+            "ErrorCode": "0",
+            "ErrorMessage": None,
+            "ErrorMsgLst": None,
+            "TotalCount": 1,
+            "Expansion": expansion,
+        },
+        ensure_ascii=False,
+    )
+
+
+def upstream_transport(history_total: int = 2500) -> httpx.MockTransport:
+    """离线上游 / MockTransport answering every TianTianAPI endpoint from fixtures.
+
+    Routing is by path, so it works for both the real hosts and a rebased
+    origin. Every fund gets a `history_total`-row history seeded by its code.
+
+    Args:
+        history_total: Rows in each fund's full F10 history
+    """
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        params = request.url.params
+        if path.startswith("/js/"):
+            return httpx.Response(200, text=estimate_payload(path[4:].removesuffix(".js")))
+        if path.endswith("/F10DataApi.aspx"):
+            sdate = params.get("sdate")
+            text = history_payload(
+                history_total,
+                int(params.get("page", 1)),
+                int(params.get("per", 10)),
+                date.fromisoformat(sdate) if sdate else None,
+                int(params["code"]),
+            )
+            return httpx.Response(200, text=text)
+        if path.endswith("/FundMNBasicInformation"):
+            return httpx.Response(200, text=detail_payload(params["FCODE"]))
+        if path.endswith("/FundMNInverstPosition"):
+            return httpx.Response(200, text=holdings_payload(params["FCODE"]))
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
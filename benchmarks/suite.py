@@ -0,0 +1,274 @@
+"""Offline benchmark suite: API parsers, FundService methods and CLI commands.
+
+Every upstream request is answered from `benchmarks.fixtures` through
+httpx.MockTransport, with a throwaway data home and caching off, so the
+numbers measure this code and nothing on the network. Each case reports
+the best per-call time over several runs. Results are compared with a
+stored baseline, and cases slower than the tolerance count as regressions
+and make the run exit with status 1.
+
+Baselines are machine-specific: save one on the machine you compare on.
+
+Usage:
+    python -m benchmarks.suite                # run, compare with baseline.json
+    python -m benchmarks.suite --save         # run, store a new baseline
+    python -m benchmarks.suite -k cli/calc    # only cases whose name contains the text
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+
+import httpx
+
+from benchmarks.fixtures import (
+    detail_payload,
+    estimate_payload,
+    history_payload,
+    holdings_payload,
+    upstream_transport,
+)
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# A case is slower than its baseline by more than this fraction to count as a regression
+DEFAULT_TOLERANCE = 0.3
+
+# Rows in each fund's full history: about ten years of trading days
+HISTORY_ROWS = 2500
+
+# Funds in the batch cases
+BATCH_SIZE = 20
+
+# Runs per case; each run repeats the call enough times to last ~0.2 s
+REPEAT = 5
+
+
+def make_api():
+    """离线客户端 / TianTianAPI on the fixture transport, without a rate limit."""
+    from fund_assistant.api import TianTianAPI
+    from fund_assistant.api.resilience import Resilience
+
+    return TianTianAPI(
+        transport=upstream_transport(HISTORY_ROWS),
+        resilience=Resilience(rate=1e9, burst=10**9),
+    )
+
+
+def make_service(nav_path: str | Path):
+    """离线服务 / FundService on the fixture transport with its own NAV store."""
+    from fund_assistant.services import FundService
+    from fund_assistant.storage import NavStore
+
+    return FundService(nav_store=NavStore(nav_path), api=make_api())
+
+
+def response(url: str, text: str) -> httpx.Response:
+    return httpx.Response(200, text=text, request=httpx.Request("GET", url))
+
+
+def parser_cases(code: str) -> dict[str, Callable]:
+    """解析器用例 / Each TianTianAPI parse step on a recorded payload."""
+    api = make_api()
+    estimate = response(api.ESTIMATE_URL.format(code=code), estimate_payload(code))
+    detail = response(api.MOBILE_BASE_URL, detail_payload(code))
+    holdings = response(api.MOBILE_BASE_URL, holdings_payload(code))
+    cases = {
+        "parse/estimate": lambda: api._parse_realtime_estimate(estimate),
+        "parse/detail": lambda: api._parse_fund_detail(detail),
+        "parse/holdings": lambda: api._parse_fund_holdings(code, holdings),
+    }
+    for rows in (20, api.HISTORY_PAGE_SIZE, HISTORY_ROWS):
+        history = response(api.HISTORY_URL, history_payload(HISTORY_ROWS, per=rows))
+        cases[f"parse/history-{rows}"] = lambda history=history: api._parse_historical_nav(history)
+    full = response(api.HISTORY_URL, history_payload(HISTORY_ROWS))
+    cases[f"parse/series-{HISTORY_ROWS}"] = lambda: api._parse_nav_series(code, full)
+    return cases
+
+
+def service_cases(service, codes: list[str], home: Path) -> dict[str, Callable]:
+    """服务用例 / FundService methods against the fixture upstream.
+
+    The service's store is synced for `codes` first, so history-based
+    methods measure the steady state; the sync cases start from an empty
+    store each call.
+    """
+    code = codes[0]
+    service.sync_histories(codes)
+    fresh = iter(range(10**9))
+
+    def full_sync():
+        empty = make_service(home / f"sync-{next(fresh)}.sqlite3")
+        empty.sync_history(code)
+        empty.nav_store.close()
+
+    def full_sync_batch():
+        empty = make_service(home / f"sync-{next(fresh)}.sqlite3")
+        empty.sync_histories(codes)
+        empty.nav_store.close()
+
+    return {
+        "service/get_fund_price": lambda: service.get_fund_price(code),
+        "service/get_fund_detail": lambda: service.get_fund_detail(code),
+        "service/get_fund_holdings": lambda: service.get_fund_holdings(code),
+        "service/get_fund_prices": lambda: service.get_fund_prices(codes),
+        "service/get_fund_details": lambda: service.get_fund_details(codes),
+        "service/get_fund_holdings_batch": lambda: service.get_fund_holdings_batch(codes),
+        "service/get_histories": lambda: service.get_histories(codes),
+        "service/get_history": lambda: service.get_history(code, limit=None),
+        "service/sync_history": full_sync,
+        "service/sync_histories": full_sync_batch,
+        "service/get_metrics": lambda: service.get_metrics(code),
+        "service/get_metrics_batch": lambda: service.get_metrics_batch(codes),
+        "service/get_correlation": lambda: service.get_correlation(codes[:5]),
+        "service/get_holdings_index": lambda: service.get_holdings_index(codes),
+        "service/get_fund_list": lambda: service.get_fund_list(),
+        "service/get_hot_funds": lambda: service.get_hot_funds(),
+        "service/search_funds": lambda: service.search_funds("易方达"),
+        "service/calculate_dca": lambda: service.calculate_dca(code, 1000, 10),
+        "service/backtest_dca": lambda: service.backtest_dca(code, 1000, 5),
+        "service/sweep_dca": lambda: service.sweep_dca(code, 1000, 3),
+        "service/simulate_dca": lambda: service.simulate_dca(code, 1000, 5, paths=2000, workers=1),
+    }
+
+
+def cli_cases(service, codes: list[str], home: Path) -> dict[str, Callable]:
+    """命令用例 / CLI commands end to end, in process, rendering included."""
+    from typer.testing import CliRunner
+
+    from fund_assistant import cli
+
+    # Commands look the service up by name on every call
+    cli.get_service = cache(lambda: service)
+    runner = CliRunner()
+    code = codes[0]
+    watchlist = home / "watchlist.txt"
+    watchlist.write_text("\n".join(codes))
+
+    def command(*args: str) -> Callable:
+        def run():
+            result = runner.invoke(cli.app, args)
+            if result.exit_code != 0:
+                raise RuntimeError(f"`{' '.join(args)}` failed: {result.output}")
+
+        return run
+
+    return {
+        "cli/info": command("info", code),
+        "cli/holding": command("holding", code),
+        "cli/compare": command("compare", *codes[:4]),
+        "cli/price": command("price", code),
+        "cli/price-watchlist": command("price", "-w", str(watchlist)),
+        "cli/price-json": command("--output", "json", "price", "-w", str(watchlist)),
+        "cli/history": command("history", code, "-n", "30"),
+        "cli/list": command("list"),
+        "cli/hot": command("hot"),
+        "cli/search": command("search", "易方达"),
+        "cli/calc": command("calc", code, "1000", "10"),
+        "cli/calc-backtest": command("calc", code, "1000", "5", "-b"),
+        "cli/calc-sweep": command("calc", code, "1000", "3", "--sweep"),
+        "cli/calc-monte-carlo": command(
+            "calc", code, "1000", "5", "-m", "--paths", "2000", "--workers", "1"
+        ),
+        "cli/metrics": command("metrics", "-w", str(watchlist)),
+        "cli/correlation": command("correlation", *codes[:5]),
+        "cli/overlap": command("overlap", "-w", str(watchlist)),
+        "cli/summary": command("summary"),
+    }
+
+
+def measure(func: Callable, repeat: int = REPEAT) -> float:
+    """计时 / Best seconds per call over `repeat` runs of an auto-sized loop."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(name: str, seconds: float, base: float | None, tolerance: float) -> bool:
+    """对比基线 / Print one result against its baseline; True if it regressed."""
+    if base is None:
+        print(f"{name:<34} {_format(seconds):>10} {'-':>10} {'new':>7}", flush=True)
+        return False
+    ratio = seconds / base
+    flag = ""
+    if ratio > 1 + tolerance:
+        flag = "  REGRESSION"
+    elif ratio < 1 / (1 + tolerance):
+        flag = "  faster"
+    print(f"{name:<34} {_format(seconds):>10} {_format(base):>10} {ratio:6.2f}x{flag}", flush=True)
+    return ratio > 1 + tolerance
+
+
+def _format(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__)
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases containing this")
+    parser.add_argument("--save", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+    stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = stored.get("cases", {})
+
+    with tempfile.TemporaryDirectory(prefix="fund-bench-") as tmp:
+        home = Path(tmp)
+        os.environ["FUND_ASSISTANT_HOME"] = str(home)
+        os.environ["FUND_ASSISTANT_CACHE"] = "off"
+
+        service = make_service(home / "nav.sqlite3")
+        codes = service.catalog.codes[:BATCH_SIZE]
+        cases = {
+            **parser_cases(codes[0]),
+            **service_cases(service, codes, home),
+            **cli_cases(service, codes, home),
+        }
+        selected = {name: func for name, func in cases.items() if args.pattern in name}
+
+        results = {}
+        regressions = []
+        print(f"{'case':<34} {'time':>10} {'baseline':>10} {'ratio':>7}")
+        for name, func in selected.items():
+            results[name] = measure(func)
+            if report(name, results[name], baseline.get(name), args.tolerance):
+                regressions.append(name)
+        service.api.close()
+        service.nav_store.close()
+
+    if args.save:
+        cases = {**baseline, **results} if args.pattern else results
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "machine": f"{platform.system()} {platform.machine()}",
+                    "cases": {name: float(f"{seconds:.4g}") for name, seconds in cases.items()},
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if regressions:
+        names = ", ".join(regressions)
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {names}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,21 @@
 """API clients for fetching fund data."""
 
+from fund_assistant.api.cache import FundCache
+from fund_assistant.api.errors import (
+    CircuitOpenError,
+    FundAPIError,
+    RateLimitedError,
+    ResponseError,
+    UpstreamError,
+)
 from fund_assistant.api.tiantian import TianTianAPI
 
-__all__ = ["TianTianAPI"]
+__all__ = [
+    "CircuitOpenError",
+    "FundAPIError",
+    "FundCache",
+    "RateLimitedError",
+    "ResponseError",
+    "TianTianAPI",
+    "UpstreamError",
+]
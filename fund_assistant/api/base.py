@@ -1,28 +1,137 @@
 """Base HTTP client for API calls."""
 
+import asyncio
+import ssl
+import time
+from functools import cache, cached_property
+from importlib.util import find_spec
+
+import certifi
 import httpx
 
+from fund_assistant.api.errors import FundAPIError, RateLimitedError, ResponseError, UpstreamError
+from fund_assistant.api.resilience import Resilience, default_resilience
+from fund_assistant.api.singleflight import SingleFlight
+from fund_assistant.instrumentation import HTTPTrace, default_registry
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    )
+}
+
+# Pool shared by every upstream host; keep-alive outlives the gaps between batch waves
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=64, max_keepalive_connections=32, keepalive_expiry=30.0
+)
+
+
+@cache
+def ssl_context() -> ssl.SSLContext:
+    """共享 TLS 上下文 / One CA bundle load per process instead of one per client."""
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+@cache
+def http2_available() -> bool:
+    """是否支持 HTTP/2 / Whether the optional h2 package is installed."""
+    return find_spec("h2") is not None
+
 
 class BaseClient:
-    """基础 HTTP 客户端 / Base HTTP Client"""
+    """基础 HTTP 客户端 / Base HTTP Client
+
+    One blocking and one async httpx client serve every upstream host, so
+    the estimate, F10 and mobile API hosts share a connection pool sized by
+    `limits` and warm connections are reused across a whole batch. Both are
+    built on first use and released by `close` / `aclose`, or by using the
+    client as a (async) context manager.
 
-    def __init__(self, timeout: float = 10.0):
+    Requests are rate limited and circuit broken per host and transient
+    failures are retried with jittered backoff (see `resilience`). Anything
+    but a 2xx response ends in a typed `FundAPIError`. Endpoint methods of
+    subclasses coalesce identical concurrent calls through `flights`.
+    Attempts, connection setup, rate-limit waits and backoff are timed per
+    host into the instrumentation registry.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        resilience: Resilience | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool | None = None,
+        transport: httpx.BaseTransport | None = None,
+    ):
         """Initialize HTTP client.
 
         Args:
             timeout: Request timeout in seconds
+            resilience: Retry, rate-limit and breaker policy (defaults to the
+                process-wide one)
+            limits: Connection pool limits (defaults to DEFAULT_LIMITS)
+            http2: Negotiate HTTP/2 on TLS hosts; None enables it when the
+                `http2` extra (h2) is installed
+            transport: Transport used by both clients instead of the network,
+                e.g. an httpx.MockTransport (defaults to the record/replay
+                transport selected by FUND_ASSISTANT_CASSETTE, if any)
+        """
+        self.timeout = timeout
+        self.resilience = resilience or default_resilience()
+        self.flights = SingleFlight()
+        self.limits = limits or DEFAULT_LIMITS
+        self.http2 = http2_available() if http2 is None else http2
+        if transport is None:
+            from fund_assistant.api.replay import cassette_transport
+
+            transport = cassette_transport(self.limits, self.http2)
+        self.transport = transport
+        self._async_client: httpx.AsyncClient | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+        self.close()
+
+    def _client_options(self) -> dict:
+        """构建客户端参数 / Shared options for the sync and async clients."""
+        options = {
+            "timeout": self.timeout,
+            "headers": DEFAULT_HEADERS,
+            "follow_redirects": True,
+            "limits": self.limits,
+            "http2": self.http2,
+            "verify": ssl_context(),
+        }
+        if self.transport is not None:
+            options["transport"] = self.transport
+        return options
+
+    @cached_property
+    def client(self) -> httpx.Client:
+        """同步客户端 (首次使用时创建) / Blocking client, created on first use."""
+        return httpx.Client(**self._client_options())
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """异步客户端 (首次使用时创建) / Async client, created on first use.
+
+        The async client binds its connection pool to the running event loop,
+        so it is only built from inside a coroutine and released by `aclose`.
         """
-        self.client = httpx.Client(
-            timeout=timeout,
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            },
-            follow_redirects=True,
-        )
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(**self._client_options())
+        return self._async_client
 
     def get(self, url: str, **kwargs) -> httpx.Response:
         """发送 GET 请求 / Send GET request.
@@ -32,14 +141,138 @@ class BaseClient:
             **kwargs: Additional arguments for httpx.get
 
         Returns:
-            HTTP response
+            HTTP response with a 2xx status
+
+        Raises:
+            FundAPIError: If the request still fails after retries, or the
+                host's circuit is open
+        """
+        host = httpx.URL(url).host
+        limiter = self.resilience.limiter(host)
+        breaker = self.resilience.breaker(host)
+        retry = self.resilience.retry
+        registry = default_registry()
+        for attempt in range(retry.attempts):
+            breaker.check()
+            wait = limiter.reserve()
+            if wait:
+                registry.observe("throttle", host, wait)
+                time.sleep(wait)
+            start = time.perf_counter()
+            try:
+                extensions = {"trace": HTTPTrace(host)}
+                response = self.client.get(url, extensions=extensions, **kwargs)
+                outcome = _check_response(url, response)
+            except httpx.TransportError as e:
+                outcome = _transport_error(url, e)
+            registry.observe("http", host, time.perf_counter() - start)
+            if not self._record(breaker, outcome, attempt):
+                return outcome
+            delay = retry.delay(attempt, getattr(outcome, "retry_after", None))
+            registry.observe("backoff", host, delay)
+            time.sleep(delay)
+
+    async def aget(self, url: str, **kwargs) -> httpx.Response:
+        """发送异步 GET 请求 / Send GET request asynchronously.
+
+        Args:
+            url: Target URL
+            **kwargs: Additional arguments for httpx.AsyncClient.get
+
+        Returns:
+            HTTP response with a 2xx status
+
+        Raises:
+            FundAPIError: If the request still fails after retries, or the
+                host's circuit is open
+        """
+        host = httpx.URL(url).host
+        limiter = self.resilience.limiter(host)
+        breaker = self.resilience.breaker(host)
+        retry = self.resilience.retry
+        registry = default_registry()
+        for attempt in range(retry.attempts):
+            breaker.check()
+            wait = limiter.reserve()
+            if wait:
+                registry.observe("throttle", host, wait)
+                await asyncio.sleep(wait)
+            start = time.perf_counter()
+            try:
+                extensions = {"trace": HTTPTrace(host).atrace}
+                response = await self.async_client.get(url, extensions=extensions, **kwargs)
+                outcome = _check_response(url, response)
+            except httpx.TransportError as e:
+                outcome = _transport_error(url, e)
+            registry.observe("http", host, time.perf_counter() - start)
+            if not self._record(breaker, outcome, attempt):
+                return outcome
+            delay = retry.delay(attempt, getattr(outcome, "retry_after", None))
+            registry.observe("backoff", host, delay)
+            await asyncio.sleep(delay)
+
+    def _record(self, breaker, outcome, attempt: int) -> bool:
+        """记录结果 / Update the breaker and decide whether to retry.
+
+        Args:
+            breaker: The host's circuit breaker
+            outcome: The response, or the error the attempt ended in
+            attempt: 0-based attempt number
+
+        Returns:
+            True to retry; False when `outcome` is a response to return
 
         Raises:
-            httpx.HTTPError: If request fails
+            FundAPIError: If the error is not retryable or attempts are used up
         """
-        return self.client.get(url, **kwargs)
+        if not isinstance(outcome, FundAPIError):
+            breaker.record_success()
+            return False
+        if not isinstance(outcome, UpstreamError):
+            # The host answered, it is just not something we can use
+            breaker.record_success()
+            raise outcome
+        breaker.record_failure()
+        if attempt + 1 >= self.resilience.retry.attempts:
+            raise outcome
+        return True
+
+    def close(self):
+        """关闭同步客户端 / Close the blocking client and its connection pool."""
+        client = self.__dict__.pop("client", None)
+        if client is not None:
+            client.close()
+
+    async def aclose(self):
+        """关闭异步客户端 / Close the async client and its connection pool."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+
+def _check_response(url: str, response: httpx.Response) -> httpx.Response | FundAPIError:
+    """分类响应 / Pass a 2xx response through, map other statuses to typed errors."""
+    status = response.status_code
+    if response.is_success:
+        return response
+    message = f"HTTP {status} from {response.url.host}"
+    if status == 429:
+        return RateLimitedError(message, url, _retry_after(response))
+    if status >= 500:
+        return UpstreamError(message, url)
+    return ResponseError(message, url, status)
+
+
+def _transport_error(url: str, error: httpx.TransportError) -> UpstreamError:
+    """包装传输错误 / Wrap a timeout or connection error as a retryable error."""
+    wrapped = UpstreamError(f"{type(error).__name__}: {error}", url)
+    wrapped.__cause__ = error
+    return wrapped
+
 
-    def __del__(self):
-        """关闭客户端连接 / Close client connection."""
-        if hasattr(self, "client"):
-            self.client.close()
+def _retry_after(response: httpx.Response) -> float | None:
+    """Retry-After 秒数 / Seconds from a numeric Retry-After header, if any."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
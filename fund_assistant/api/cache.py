@@ -0,0 +1,244 @@
+"""TTL cache for API responses."""
+
+import functools
+import inspect
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fund_assistant import market
+from fund_assistant.api.singleflight import call_key
+
+# Sentinel distinguishing a cache miss from a cached falsy value
+MISSING = object()
+
+# How long an intraday estimate stays fresh while the market is open
+ESTIMATE_TTL = timedelta(minutes=2)
+
+# The disk tier is trimmed back to its size bound after this many writes
+DISK_PRUNE_INTERVAL = 256
+
+
+def estimate_expiry(now: datetime) -> datetime:
+    """估值过期时间 / Minutes during trading hours, else until the next open."""
+    if market.is_trading_time(now):
+        return now + ESTIMATE_TTL
+    return market.next_market_open(now)
+
+
+def nav_expiry(now: datetime) -> datetime:
+    """净值过期时间 / Until the next trading day's NAV is published."""
+    return market.next_nav_release(now)
+
+
+def holdings_expiry(now: datetime) -> datetime:
+    """持仓过期时间 / Until the next quarterly report date."""
+    return market.next_holdings_report(now)
+
+
+def detail_expiry(now: datetime) -> datetime:
+    """详情过期时间 / Fund details are refreshed daily."""
+    return market.next_day(now)
+
+
+class FundCache:
+    """两级 TTL 缓存 / Two-tier TTL cache.
+
+    An in-memory LRU tier sits in front of an optional SQLite tier, so
+    separate CLI processes can share results. Both tiers are size-bounded
+    and every entry carries its own absolute expiry.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        disk_path: str | Path | None = None,
+        disk_maxsize: int = 20000,
+    ):
+        """Initialize cache.
+
+        Args:
+            maxsize: Maximum entries kept in memory
+            disk_path: SQLite file for the on-disk tier (None disables it)
+            disk_maxsize: Maximum entries kept on disk
+        """
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self._disk: sqlite3.Connection | None = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, expires REAL NOT NULL, "
+                "accessed REAL NOT NULL, value BLOB NOT NULL)"
+            )
+
+    def get(self, key: str):
+        """读取缓存 / Look up a live entry.
+
+        Returns:
+            The cached value, or MISSING
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[0] > now:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry:
+                del self._memory[key]
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT expires, value FROM cache WHERE key = ? AND expires > ?",
+                    (key, now),
+                ).fetchone()
+                if row:
+                    with self._disk:
+                        self._disk.execute(
+                            "UPDATE cache SET accessed = ? WHERE key = ?", (now, key)
+                        )
+                    value = pickle.loads(row[1])
+                    self._remember(key, row[0], value)
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return MISSING
+
+    def set(self, key: str, value, expires_at: datetime):
+        """写入缓存 / Store a value until `expires_at`."""
+        expires = expires_at.timestamp()
+        with self._lock:
+            self._remember(key, expires, value)
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute(
+                        "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                        (key, expires, time.time(), pickle.dumps(value)),
+                    )
+                self._disk_writes += 1
+                if self._disk_writes % DISK_PRUNE_INTERVAL == 0:
+                    self._prune_disk()
+
+    def _prune_disk(self):
+        """裁剪磁盘层 / Drop expired entries, then the least recently used beyond the bound."""
+        now = time.time()
+        with self._disk:
+            self._disk.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+            self._disk.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                "ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.disk_maxsize,),
+            )
+
+    def _remember(self, key: str, expires: float, value):
+        """写入内存层 / Insert into the LRU tier, evicting the oldest entries."""
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        """清空缓存 / Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                with self._disk:
+                    self._disk.execute("DELETE FROM cache")
+
+    def stats(self) -> dict:
+        """缓存统计 / Hit and miss counts plus tier sizes."""
+        with self._lock:
+            disk_size = (
+                self._disk.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+                if self._disk is not None
+                else 0
+            )
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "memory_size": len(self._memory),
+                "disk_size": disk_size,
+            }
+
+
+def cached(endpoint: str, expiry: Callable[[datetime], datetime]):
+    """缓存装饰器 / Cache an API method's result through `self.cache`.
+
+    Works on both blocking and async methods; the sync and async variants of
+    an endpoint share entries when given the same `endpoint` name. Empty
+    results (None or []) are never cached so failures are retried.
+
+    Misses go through the client's single-flight group (`self.flights`), so
+    concurrent identical misses make one request and only its leader writes
+    the cache. This also holds when caching is off.
+
+    Args:
+        endpoint: Cache key prefix
+        expiry: Maps the current CST time to the entry's expiry time
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                cache = getattr(self, "cache", None)
+                flights = getattr(self, "flights", None)
+                if cache is None and flights is None:
+                    return await func(self, *args, **kwargs)
+                key = call_key(endpoint, signature, args, kwargs)
+                if cache is not None:
+                    value = cache.get(key)
+                    if value is not MISSING:
+                        return value
+
+                async def fetch():
+                    value = await func(self, *args, **kwargs)
+                    if value and cache is not None:
+                        cache.set(key, value, expiry(market.now_cn()))
+                    return value
+
+                return await (flights.ado(key, fetch) if flights is not None else fetch())
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "cache", None)
+            flights = getattr(self, "flights", None)
+            if cache is None and flights is None:
+                return func(self, *args, **kwargs)
+            key = call_key(endpoint, signature, args, kwargs)
+            if cache is not None:
+                value = cache.get(key)
+                if value is not MISSING:
+                    return value
+
+            def fetch():
+                value = func(self, *args, **kwargs)
+                if value and cache is not None:
+                    cache.set(key, value, expiry(market.now_cn()))
+                return value
+
+            return flights.do(key, fetch) if flights is not None else fetch()
+
+        return wrapper
+
+    return decorator
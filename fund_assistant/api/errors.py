@@ -0,0 +1,47 @@
+"""Typed errors raised by the API clients.
+
+A request either returns parsed data, returns None / [] when the upstream
+answered but has nothing for the fund, or raises one of these. Callers can
+therefore tell "fund not found" from "eastmoney is down" and decide whether
+to retry, fall back to stored data or report the failure.
+"""
+
+
+class FundAPIError(Exception):
+    """接口错误基类 / Base class for every API client error."""
+
+    def __init__(self, message: str, url: str | None = None):
+        super().__init__(message)
+        self.url = url
+
+
+class UpstreamError(FundAPIError):
+    """上游暂时故障 / Transient failure: timeout, connection error or 5xx.
+
+    Retried with backoff and counted by the host's circuit breaker.
+    """
+
+
+class RateLimitedError(UpstreamError):
+    """上游限流 / The upstream answered 429 Too Many Requests."""
+
+    def __init__(self, message: str, url: str | None = None, retry_after: float | None = None):
+        super().__init__(message, url)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(FundAPIError):
+    """熔断中 / The host's circuit breaker is open; the request was not sent."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"{host} is unavailable, retry in {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class ResponseError(FundAPIError):
+    """无效响应 / Non-retryable 4xx status or a payload that cannot be parsed."""
+
+    def __init__(self, message: str, url: str | None = None, status: int | None = None):
+        super().__init__(message, url)
+        self.status = status
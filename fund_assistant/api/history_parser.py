@@ -0,0 +1,138 @@
+"""Single-pass parser for the F10 NAV history payload.
+
+The F10DataApi `lsjz` endpoint answers with a JavaScript assignment wrapping
+an HTML table:
+
+    var apidata={ content:"<table>...</table>",records:3736,pages:374,curpage:1};
+
+All rows are extracted by one precompiled pattern in a single scan of the
+payload, instead of separate row, cell and tag-stripping passes. Rows can be
+parsed into HistoricalNav models or, for analytics, straight into NavSeries
+columns without building a model per row.
+"""
+
+import re
+from collections.abc import Iterator
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from fund_assistant.models import HistoricalNav
+
+if TYPE_CHECKING:
+    from fund_assistant.models.nav_series import NavSeries
+
+_PAYLOAD = re.compile(r'content:"(.*?)",records:(\d+),pages:(\d+)', re.DOTALL)
+
+# Inline markup inside a cell (e.g. <span>), never a cell boundary itself
+_TAG = r"(?:<(?!/?td)[^>]*>)*"
+
+# One data cell: opening <td>, optional inline tags around the text
+_CELL = rf"<td[^>]*>{_TAG}([^<]*){_TAG}</td>\s*"
+
+# A data row starts with a date cell; header rows use <th> and never match
+_ROW = re.compile(
+    rf"<tr>\s*<td[^>]*>{_TAG}(\d{{4}}-\d{{2}}-\d{{2}}){_TAG}</td>\s*" + _CELL * 3
+)
+
+# Daily change placeholders used upstream for the first NAV or suspended days
+_NO_CHANGE = {"", "---", "--"}
+
+
+def split_payload(text: str) -> tuple[str, int, int]:
+    """拆分响应 / Split a payload into its HTML table and paging totals.
+
+    Args:
+        text: Raw response body
+
+    Returns:
+        Tuple of (html, records, pages); html is empty if the payload is malformed
+    """
+    match = _PAYLOAD.search(text)
+    if not match:
+        return "", 0, 0
+    return match.group(1), int(match.group(2)), int(match.group(3))
+
+
+def iter_rows(html: str) -> Iterator[tuple[str, str, str, str]]:
+    """遍历原始行 / Yield raw (date, nav, accumulated_nav, daily_change) strings.
+
+    Args:
+        html: Table HTML from `split_payload`
+
+    Yields:
+        Cell text tuples, newest row first
+    """
+    for match in _ROW.finditer(html):
+        yield match.groups()
+
+
+def parse_rows(html: str) -> list[HistoricalNav]:
+    """解析净值行 / Parse every row of the table into HistoricalNav objects.
+
+    Rows whose numbers cannot be parsed are skipped.
+
+    Args:
+        html: Table HTML from `split_payload`
+
+    Returns:
+        List of HistoricalNav objects, newest first
+    """
+    results = []
+    for date_str, nav_str, acc_str, change_str in iter_rows(html):
+        change_str = change_str.strip().rstrip("%")
+        try:
+            results.append(
+                HistoricalNav(
+                    date=date.fromisoformat(date_str),
+                    nav=Decimal(nav_str),
+                    accumulated_nav=Decimal(acc_str),
+                    daily_change=Decimal(change_str) if change_str not in _NO_CHANGE else None,
+                )
+            )
+        except (ArithmeticError, ValueError):
+            continue
+    return results
+
+
+def parse_history(text: str) -> tuple[list[HistoricalNav], int, int]:
+    """解析历史净值响应 / Parse a full F10 lsjz payload.
+
+    Args:
+        text: Raw response body
+
+    Returns:
+        Tuple of (rows, records, pages)
+    """
+    html, records, pages = split_payload(text)
+    return parse_rows(html), records, pages
+
+
+def parse_series(html: str, code: str = "") -> "NavSeries":
+    """解析为列式序列 / Parse the table into a NavSeries, oldest first.
+
+    Whole columns are converted by NumPy at once. If any cell does not
+    parse, the rows are parsed one by one instead so only the bad ones are
+    skipped, as in `parse_rows`.
+
+    Args:
+        html: Table HTML from `split_payload`
+        code: Fund code stored on the series
+    """
+    from fund_assistant.models.nav_series import NavSeries
+
+    rows = list(iter_rows(html))
+    if not rows:
+        return NavSeries.empty(code)
+    dates, navs, accumulated, changes = zip(*rows)
+    changes = [change.strip().rstrip("%") for change in changes]
+    try:
+        return NavSeries.from_columns(
+            dates,
+            navs,
+            accumulated,
+            [change if change not in _NO_CHANGE else "nan" for change in changes],
+            code=code,
+        )
+    except ValueError:
+        return NavSeries.from_rows(parse_rows(html), code=code)
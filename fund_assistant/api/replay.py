@@ -0,0 +1,294 @@
+"""Record/replay transports for running without eastmoney.
+
+`RecordingTransport` sits under the httpx clients, passes requests on to
+the network and saves every response below 500 into a cassette directory,
+one JSON file per distinct request. `ReplayTransport` later answers the
+same requests from that directory without touching the network. It can
+also behave like a loaded upstream: added latency with jitter, a share of
+503s and timeouts, and per-host throttling answered with 429. Batch and
+concurrency changes can then be measured, and incidents reproduced, on an
+isolated machine.
+
+Both serve the blocking and the async client. `BaseClient` installs one
+when FUND_ASSISTANT_CASSETTE is set (see `cassette_transport`).
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+
+from fund_assistant.api.resilience import TokenBucket
+from fund_assistant.config import cassette_dir, cassette_mode, replay_spec
+
+# FUND_ASSISTANT_REPLAY keys and the ReplayTransport arguments they set
+SPEC_KEYS = {
+    "latency": "latency",
+    "jitter": "jitter",
+    "errors": "error_rate",
+    "timeouts": "timeout_rate",
+    "rate": "rate",
+    "seed": "seed",
+}
+
+
+def request_key(request: httpx.Request) -> str:
+    """请求标识 / Method, origin, path and sorted query of a request."""
+    url = request.url
+    origin = f"{url.scheme}://{url.host}" + (f":{url.port}" if url.port else "")
+    query = urlencode(sorted(url.params.multi_items()))
+    return f"{request.method} {origin}{url.path}" + (f"?{query}" if query else "")
+
+
+def cassette_path(directory: Path, request: httpx.Request) -> Path:
+    """录制文件路径 / File holding the recording of a request, grouped by host."""
+    digest = hashlib.sha1(request_key(request).encode()).hexdigest()[:16]
+    return directory / request.url.host / f"{digest}.json"
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """录制传输 / Forward requests to a real transport and save the responses.
+
+    Responses of 500 and above are transient and are passed through
+    unrecorded, so a flaky run never overwrites a good recording.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        transport: httpx.BaseTransport | None = None,
+        **options,
+    ):
+        """Initialize the recorder.
+
+        Args:
+            directory: Cassette directory, created if needed
+            transport: Transport to record from, serving both clients (e.g.
+                an httpx.MockTransport); defaults to the network
+            **options: httpx.HTTPTransport options (limits, http2, verify)
+                for the default network transports
+        """
+        self.directory = Path(directory)
+        self.transport = transport
+        self.options = options
+        self.recorded = 0
+        self._sync: httpx.HTTPTransport | None = None
+        self._async: httpx.AsyncHTTPTransport | None = None
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.transport is not None:
+            inner = self.transport
+        else:
+            inner = self._sync = self._sync or httpx.HTTPTransport(**self.options)
+        response = inner.handle_request(request)
+        response.read()
+        self._save(request, response)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.transport is not None:
+            inner = self.transport
+        else:
+            inner = self._async = self._async or httpx.AsyncHTTPTransport(**self.options)
+        response = await inner.handle_async_request(request)
+        await response.aread()
+        self._save(request, response)
+        return response
+
+    def close(self):
+        # A closed client drops its pool; the next client gets a fresh one
+        if self._sync is not None:
+            self._sync.close()
+            self._sync = None
+
+    async def aclose(self):
+        # The async pool belongs to one event loop, like BaseClient.async_client
+        if self._async is not None:
+            await self._async.aclose()
+            self._async = None
+
+    def _save(self, request: httpx.Request, response: httpx.Response):
+        """保存录制 / Write one response to the cassette."""
+        if response.status_code >= 500:
+            return
+        path = cassette_path(self.directory, request)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "request": request_key(request),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type", "").split(";")[0],
+            "body": response.text,
+        }
+        tmp_path = path.with_name(f"{path.stem}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(path)
+        self.recorded += 1
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """回放传输 / Answer requests from a cassette, simulating upstream behaviour.
+
+    Each request first waits `latency` seconds, give or take `jitter`.
+    It then gets one of the following, in order:
+    - a 429 if its host is over `rate`;
+    - otherwise a 503 with probability `error_rate`;
+    - otherwise a read timeout with probability `timeout_rate`;
+    - otherwise the recorded response.
+
+    Requests that were never recorded get a 404. `counts` tallies the
+    outcomes.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        rate: float | None = None,
+        seed: int | None = None,
+    ):
+        """Initialize the player.
+
+        Args:
+            directory: Cassette directory written by RecordingTransport
+            latency: Mean seconds added to every request
+            jitter: Maximum seconds the latency varies by, either way
+            error_rate: Share of requests answered 503
+            timeout_rate: Share of requests failing with a read timeout
+            rate: Requests per second each host accepts before answering 429
+                (None for no throttling)
+            seed: Seed for latency and fault draws, for repeatable runs
+        """
+        self.directory = Path(directory)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.rate = rate
+        self.counts: Counter[str] = Counter()
+        self._random = random.Random(seed)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._recordings: dict[Path, dict | None] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_spec(cls, directory: str | Path, spec: str) -> "ReplayTransport":
+        """按描述构建 / Build from a spec like `latency=0.08,jitter=0.03,errors=0.02`.
+
+        Keys are those of SPEC_KEYS; an empty spec replays without delays or faults.
+
+        Raises:
+            ValueError: If a key is unknown or a value is not a number
+        """
+        options = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            key, _, value = item.partition("=")
+            key = key.strip()
+            if key not in SPEC_KEYS:
+                expected = ", ".join(SPEC_KEYS)
+                raise ValueError(f"Unknown replay option {key!r}, expected one of {expected}")
+            name = SPEC_KEYS[key]
+            options[name] = int(value) if name == "seed" else float(value)
+        return cls(directory, **options)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay, outcome = self._draw(request)
+        if delay:
+            time.sleep(delay)
+        return self._respond(request, outcome)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay, outcome = self._draw(request)
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(request, outcome)
+
+    def _draw(self, request: httpx.Request) -> tuple[float, str]:
+        """抽取延迟与结果 / Pick this request's delay and simulated outcome."""
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+            if self.rate is not None:
+                host = request.url.host
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = self._buckets[host] = TokenBucket(self.rate, max(1, int(self.rate)))
+                if not bucket.try_take():
+                    return delay, "throttled"
+        if roll < self.error_rate:
+            return delay, "error"
+        if roll < self.error_rate + self.timeout_rate:
+            return delay, "timeout"
+        return delay, "ok"
+
+    def _respond(self, request: httpx.Request, outcome: str) -> httpx.Response:
+        """生成响应 / Build the response for a drawn outcome."""
+        if outcome == "ok":
+            record = self._recording(cassette_path(self.directory, request))
+            if record is None:
+                outcome = "missing"
+        self.counts[outcome] += 1
+        if outcome == "throttled":
+            return httpx.Response(429, headers={"Retry-After": "1"}, request=request)
+        if outcome == "error":
+            return httpx.Response(503, text="Simulated upstream error", request=request)
+        if outcome == "timeout":
+            raise httpx.ReadTimeout("Simulated upstream timeout", request=request)
+        if outcome == "missing":
+            message = f"No recording for {request_key(request)}"
+            return httpx.Response(404, text=message, request=request)
+        return httpx.Response(
+            record["status"],
+            headers={"Content-Type": f"{record['content_type']}; charset=utf-8"},
+            text=record["body"],
+            request=request,
+        )
+
+    def _recording(self, path: Path) -> dict | None:
+        """读取录制 / A cassette file's contents, read once and kept in memory."""
+        with self._lock:
+            if path in self._recordings:
+                return self._recordings[path]
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            record = None
+        with self._lock:
+            self._recordings[path] = record
+        return record
+
+
+def cassette_transport(limits: httpx.Limits, http2: bool) -> httpx.BaseTransport | None:
+    """环境配置的录制回放 / The transport selected by FUND_ASSISTANT_CASSETTE, if any.
+
+    Args:
+        limits: Pool limits for recording from the network
+        http2: Negotiate HTTP/2 when recording from the network
+
+    Returns:
+        RecordingTransport in `record` mode, a ReplayTransport configured by
+        FUND_ASSISTANT_REPLAY otherwise, or None when no cassette is set
+
+    Raises:
+        ValueError: If the mode or the replay spec is invalid
+    """
+    directory = cassette_dir()
+    if directory is None:
+        return None
+    mode = cassette_mode()
+    if mode == "record":
+        from fund_assistant.api.base import ssl_context
+
+        return RecordingTransport(directory, limits=limits, http2=http2, verify=ssl_context())
+    if mode == "replay":
+        return ReplayTransport.from_spec(directory, replay_spec())
+    raise ValueError(f"Unknown cassette mode {mode!r}, expected 'record' or 'replay'")
@@ -0,0 +1,216 @@
+"""Retries, rate limiting and circuit breaking for upstream hosts.
+
+Every request goes through its host's token bucket, so a wide batch cannot
+exceed the request rate eastmoney tolerates, and through its host's circuit
+breaker, so once a host keeps failing further requests fail immediately
+instead of each waiting out its own timeout and retries. Transient failures
+are retried with exponential backoff and full jitter.
+
+State is kept per host and shared by every client using the same
+`Resilience` (by default one per process), so the watcher's client and the
+service's client draw from the same quota.
+"""
+
+import random
+import threading
+import time
+from functools import cache
+from typing import NamedTuple
+
+from fund_assistant.api.errors import CircuitOpenError
+
+# Sustained requests per second allowed to one host
+DEFAULT_RATE = 20.0
+
+# Requests one host may receive in a burst after being idle
+DEFAULT_BURST = 40
+
+# Consecutive failures that open a host's circuit
+FAILURE_THRESHOLD = 5
+
+# Seconds an open circuit rejects requests before letting a probe through
+RESET_TIMEOUT = 30.0
+
+
+class RetryPolicy(NamedTuple):
+    """重试策略 / How often and how long to back off before retrying."""
+
+    attempts: int = 3  # Total tries, including the first
+    base_delay: float = 0.5  # Backoff ceiling of the first retry, in seconds
+    max_delay: float = 8.0  # Upper bound of any single backoff
+
+    def delay(self, retry: int, retry_after: float | None = None) -> float:
+        """退避时间 / Jittered delay before the given retry (0-based).
+
+        Full jitter: uniform between zero and an exponentially growing
+        ceiling, so clients that failed together do not retry together.
+        A server-provided Retry-After is honoured as a lower bound.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+        return max(delay, min(retry_after or 0.0, self.max_delay))
+
+
+class TokenBucket:
+    """令牌桶 / Token-bucket rate limiter usable from threads and coroutines.
+
+    `reserve` takes a token immediately, letting the balance go negative,
+    and returns how long the caller must wait for it. Blocking and async
+    callers then sleep in their own way, and waiting callers queue up in
+    order without holding the lock.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """预约令牌 / Take one token and return the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_take(self) -> bool:
+        """尝试取令牌 / Take one token only if one is available now."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class CircuitBreaker:
+    """熔断器 / Fail fast while a host keeps failing.
+
+    Closed: requests flow and consecutive failures are counted. Open: after
+    `threshold` failures every request is rejected for `reset_timeout`
+    seconds. Half-open: then a single probe is let through; its success
+    closes the circuit, its failure opens it again.
+    """
+
+    def __init__(
+        self, host: str, threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT
+    ):
+        """Initialize a closed breaker.
+
+        Args:
+            host: Host name, used in error messages
+            threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before probing
+        """
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """熔断状态 / "closed", "open" or "half-open"."""
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._probing else "open"
+
+    def check(self):
+        """放行检查 / Admit a request or raise while the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe in flight
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            remaining = self._opened_at + self.reset_timeout - now
+            if remaining > 0:
+                raise CircuitOpenError(self.host, remaining)
+            # Admit one probe and restart the timer: other callers keep failing
+            # fast, and a probe that never reports back is replaced after a timeout
+            self._opened_at = now
+            self._probing = True
+
+    def record_success(self):
+        """记录成功 / Close the circuit and reset the failure count."""
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        """记录失败 / Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class Resilience:
+    """弹性策略 / Retry policy plus per-host rate limiters and circuit breakers."""
+
+    def __init__(
+        self,
+        retry: RetryPolicy | None = None,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        """Initialize the policy.
+
+        Args:
+            retry: Retry policy (defaults to RetryPolicy())
+            rate: Sustained requests per second per host
+            burst: Burst size per host
+            threshold: Consecutive failures that open a host's circuit
+            reset_timeout: Seconds an open circuit waits before probing
+        """
+        self.retry = retry or RetryPolicy()
+        self.rate = rate
+        self.burst = burst
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._limiters: dict[str, TokenBucket] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, host: str) -> TokenBucket:
+        """主机限流器 / The host's token bucket, created on first use."""
+        with self._lock:
+            if host not in self._limiters:
+                self._limiters[host] = TokenBucket(self.rate, self.burst)
+            return self._limiters[host]
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """主机熔断器 / The host's circuit breaker, created on first use."""
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def states(self) -> dict[str, str]:
+        """熔断状态 / Circuit state of every host contacted so far."""
+        with self._lock:
+            return {host: breaker.state for host, breaker in self._breakers.items()}
+
+
+@cache
+def default_resilience() -> Resilience:
+    """进程级默认策略 / Process-wide policy shared by clients built without one."""
+    return Resilience()
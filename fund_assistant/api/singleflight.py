@@ -0,0 +1,147 @@
+"""Single-flight deduplication of identical in-flight requests.
+
+When several threads or coroutines ask for the same endpoint with the same
+arguments at once, only the first (the leader) issues the request; the rest
+wait for it and share its parsed result, or its exception. Nothing is kept
+once the call finishes, so this is not a cache: it only collapses bursts,
+such as many agents asking for a popular fund right after the close.
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+
+
+def call_key(endpoint: str, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """构建调用键 / Key a method call by its endpoint and bound arguments.
+
+    Binding against the signature makes `f(code, 10)` and `f(code, limit=10)`
+    share one key.
+    """
+    bound = signature.bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    values = list(bound.arguments.values())[1:]  # Drop self
+    return ":".join([endpoint, *map(str, values)])
+
+
+class SingleFlight:
+    """请求合并 / Collapse concurrent calls with the same key into one.
+
+    Blocking callers (`do`) and coroutines (`ado`) are tracked separately:
+    a thread cannot await an asyncio future, and an asyncio task belongs
+    to one event loop, so coroutines only share calls on the same loop.
+    """
+
+    def __init__(self):
+        self.shared = 0  # Calls answered by another caller's request
+        self._calls: dict[Hashable, Future] = {}
+        self._tasks: dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], object]):
+        """同步合并 / Run `fn` once for every thread calling with `key` meanwhile.
+
+        Args:
+            key: Identity of the call
+            fn: Performs the call
+
+        Returns:
+            The leader's result (its exception is raised in every caller)
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def ado(self, key: Hashable, factory: Callable[[], Awaitable]):
+        """异步合并 / Await one `factory()` for every coroutine calling with `key` meanwhile.
+
+        The call runs as its own task and callers await it through a
+        shield, so a caller that is cancelled (a client hanging up) does not
+        cancel the request the other callers are waiting on.
+
+        Args:
+            key: Identity of the call
+            factory: Returns the awaitable performing the call
+
+        Returns:
+            The shared result (the shared exception is raised in every caller)
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is not None and task.get_loop() is loop:
+                self.shared += 1
+            else:
+                task = loop.create_task(factory())
+                self._tasks[key] = task
+                task.add_done_callback(functools.partial(self._finished, key))
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        """调用结束 / Forget a finished task so later calls start afresh."""
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+        if not task.cancelled():
+            # Mark retrieved so an error whose callers all left is not logged
+            task.exception()
+
+
+def coalesced(endpoint: str):
+    """合并装饰器 / Deduplicate concurrent identical calls through `self.flights`.
+
+    Works on both blocking and async methods; calls are keyed by the
+    endpoint name and bound arguments. Objects without a `flights`
+    attribute call straight through.
+
+    Args:
+        endpoint: Key prefix
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                flights = getattr(self, "flights", None)
+                if flights is None:
+                    return await func(self, *args, **kwargs)
+                key = call_key(endpoint, signature, args, kwargs)
+                return await flights.ado(key, lambda: func(self, *args, **kwargs))
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            flights = getattr(self, "flights", None)
+            if flights is None:
+                return func(self, *args, **kwargs)
+            key = call_key(endpoint, signature, args, kwargs)
+            return flights.do(key, lambda: func(self, *args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -1,136 +1,257 @@
 """天天基金 API 客户端 / TianTian Fund API Client"""
 
+import asyncio
+import functools
 import json
 import re
-from datetime import datetime
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from decimal import Decimal
+from typing import TYPE_CHECKING, NamedTuple
+from urllib.parse import urlsplit
+
+import httpx
 
 from fund_assistant.api.base import BaseClient
+from fund_assistant.api.cache import (
+    FundCache,
+    cached,
+    detail_expiry,
+    estimate_expiry,
+    holdings_expiry,
+    nav_expiry,
+)
+from fund_assistant.api.errors import ResponseError
+from fund_assistant.api.history_parser import parse_history, parse_series, split_payload
+from fund_assistant.api.resilience import Resilience
+from fund_assistant.api.singleflight import coalesced
+from fund_assistant.config import api_base_url
+from fund_assistant.instrumentation import default_registry
 from fund_assistant.models import (
-    FundPrice, 
-    HistoricalNav, 
-    FundDetail, 
-    FundHolding, 
+    FundPrice,
+    HistoricalNav,
+    FundDetail,
+    FundHolding,
     HoldingStock
 )
 
+if TYPE_CHECKING:
+    from fund_assistant.models.nav_series import NavSeries
+
+
+def _to_decimal(val) -> Decimal | None:
+    """安全解析数值 / Parse a decimal, treating "--" and bad values as missing."""
+    if val and val != "--":
+        try:
+            return Decimal(val)
+        except Exception:
+            return None
+    return None
+
+
+def _to_date(val):
+    """安全解析日期 / Parse a YYYY-MM-DD date, treating "--" and bad values as missing."""
+    if val and val != "--":
+        try:
+            return datetime.strptime(val, "%Y-%m-%d").date()
+        except ValueError:
+            return None
+    return None
+
+
+def _parser(func):
+    """解析错误转换 / Turn a payload that does not have the expected shape into ResponseError.
+
+    Parse steps index straight into the upstream JSON; a missing key, a bad
+    number or non-JSON text means the upstream changed or sent an error page,
+    which callers should see as a typed API error rather than a KeyError.
+    Each step is timed under the `parse` stage.
+    """
+    name = func.__name__.removeprefix("_parse_")
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        try:
+            with default_registry().timer("parse", name):
+                return func(self, *args, **kwargs)
+        except (ValueError, KeyError, TypeError, ArithmeticError) as e:
+            response = next((arg for arg in args if isinstance(arg, httpx.Response)), None)
+            url = str(response.url) if response is not None else None
+            raise ResponseError(f"Malformed response: {type(e).__name__}: {e}", url) from e
+
+    return wrapper
+
+
+def _rebase(url: str, base_url: str) -> str:
+    """替换源站 / Move an endpoint URL onto another origin, keeping its path."""
+    return base_url.rstrip("/") + urlsplit(url).path
+
+
+class NavPage(NamedTuple):
+    """历史净值分页 / One page of the F10 NAV history."""
+
+    rows: list[HistoricalNav]
+    records: int  # Total rows across all pages
+    pages: int  # Total number of pages
+    page: int  # This page number, 1-based
+
 
 class TianTianAPI(BaseClient):
-    """天天基金 API / TianTian Fund API"""
+    """天天基金 API / TianTian Fund API
+
+    Every endpoint has a blocking method (`get_fund_detail`) and an asyncio
+    variant (`aget_fund_detail`) sharing the same request and parse steps, so
+    batch callers can fan requests out concurrently. When a `FundCache` is
+    attached, both variants are served from it with per-endpoint expiry.
+
+    Endpoints return None (or an empty list) when the upstream has no data
+    for the fund and raise `FundAPIError` when the request or parse fails.
+    """
 
     ESTIMATE_URL = "http://fundgz.1234567.com.cn/js/{code}.js"
     HISTORY_URL = "https://fundf10.eastmoney.com/F10DataApi.aspx"
-    
+
     # Mobile API endpoints
     MOBILE_BASE_URL = "https://fundmobapi.eastmoney.com/FundMNewApi"
-    
+
+    # Rows per page when walking a full F10 history
+    HISTORY_PAGE_SIZE = 200
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        cache: FundCache | None = None,
+        resilience: Resilience | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool | None = None,
+        transport: httpx.BaseTransport | None = None,
+        base_url: str | None = None,
+    ):
+        """Initialize API client.
+
+        Args:
+            timeout: Request timeout in seconds
+            cache: Optional response cache shared by all endpoints
+            resilience: Retry, rate-limit and breaker policy (defaults to the
+                process-wide one)
+            limits: Connection pool limits shared by all upstream hosts
+            http2: Negotiate HTTP/2 (None enables it when h2 is installed)
+            transport: Transport replacing the network, e.g. httpx.MockTransport
+            base_url: Send every endpoint to this origin instead of eastmoney,
+                keeping the paths (defaults to FUND_ASSISTANT_API_BASE)
+        """
+        super().__init__(
+            timeout=timeout,
+            resilience=resilience,
+            limits=limits,
+            http2=http2,
+            transport=transport,
+        )
+        self.cache = cache
+        base_url = base_url or api_base_url()
+        if base_url:
+            # A local stand-in serves all three hosts' paths from one origin
+            self.ESTIMATE_URL = _rebase(self.ESTIMATE_URL, base_url)
+            self.HISTORY_URL = _rebase(self.HISTORY_URL, base_url)
+            self.MOBILE_BASE_URL = _rebase(self.MOBILE_BASE_URL, base_url)
+
+    def _mobile_params(self, code: str) -> dict:
+        """移动端通用参数 / Common query params for the mobile API."""
+        return {
+            "FCODE": code,
+            "deviceid": "1",
+            "plat": "Iphone",
+            "product": "EFund",
+            "version": "11.0.0"
+        }
+
+    @cached("detail", detail_expiry)
     def get_fund_detail(self, code: str) -> FundDetail | None:
         """获取基金详细信息 / Get fund details."""
-        try:
-            url = f"{self.MOBILE_BASE_URL}/FundMNBasicInformation"
-            params = {
-                "FCODE": code,
-                "deviceid": "1",
-                "plat": "Iphone",
-                "product": "EFund",
-                "version": "11.0.0"
-            }
-            response = self.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if not data.get("Success") or not data.get("Datas"):
-                return None
-                
-            info = data["Datas"]
-            
-            # Helper to parse decimal safely
-            def to_dec(val):
-                if val and val != "--":
-                    try:
-                        return Decimal(val)
-                    except:
-                        return None
-                return None
-
-            # Helper to parse date safely
-            def to_date(val):
-                if val and val != "--":
-                    try:
-                        return datetime.strptime(val, "%Y-%m-%d").date()
-                    except:
-                        return None
-                return None
-
-            return FundDetail(
-                code=info["FCODE"],
-                name=info["SHORTNAME"],
-                fund_type=info["FTYPE"],
-                establish_date=to_date(info.get("ESTABDATE")),
-                company=info.get("JJGS"),
-                manager=info.get("JJJL"),
-                fund_size=to_dec(info.get("ENDNAV")),
-                management_fee=info.get("RATE") or info.get("rate") or info.get("SOURCERATE"),
-                risk_level=info.get("RISKLEVEL"),
-                
-                return_1m=to_dec(info.get("SYL_Y")),
-                return_6m=to_dec(info.get("SYL_6Y")),
-                return_1y=to_dec(info.get("SYL_1N")),
-                return_3y=to_dec(info.get("SYL_3N")),
-                return_inception=to_dec(info.get("SYL_LN")),
-            )
-        except Exception as e:
-            print(f"Error fetching detail for {code}: {e}")
+        url = f"{self.MOBILE_BASE_URL}/FundMNBasicInformation"
+        response = self.get(url, params=self._mobile_params(code))
+        return self._parse_fund_detail(response)
+
+    @cached("detail", detail_expiry)
+    async def aget_fund_detail(self, code: str) -> FundDetail | None:
+        """异步获取基金详细信息 / Get fund details asynchronously."""
+        url = f"{self.MOBILE_BASE_URL}/FundMNBasicInformation"
+        response = await self.aget(url, params=self._mobile_params(code))
+        return self._parse_fund_detail(response)
+
+    @_parser
+    def _parse_fund_detail(self, response: httpx.Response) -> FundDetail | None:
+        """解析基金详情响应 / Parse a FundMNBasicInformation response."""
+        data = response.json()
+        if not data.get("Success") or not data.get("Datas"):
             return None
 
+        info = data["Datas"]
+
+        return FundDetail(
+            code=info["FCODE"],
+            name=info["SHORTNAME"],
+            fund_type=info["FTYPE"],
+            establish_date=_to_date(info.get("ESTABDATE")),
+            company=info.get("JJGS"),
+            manager=info.get("JJJL"),
+            fund_size=_to_decimal(info.get("ENDNAV")),
+            management_fee=info.get("RATE") or info.get("rate") or info.get("SOURCERATE"),
+            risk_level=info.get("RISKLEVEL"),
+
+            return_1m=_to_decimal(info.get("SYL_Y")),
+            return_6m=_to_decimal(info.get("SYL_6Y")),
+            return_1y=_to_decimal(info.get("SYL_1N")),
+            return_3y=_to_decimal(info.get("SYL_3N")),
+            return_inception=_to_decimal(info.get("SYL_LN")),
+        )
+
+    @cached("holdings", holdings_expiry)
     def get_fund_holdings(self, code: str) -> FundHolding | None:
         """获取基金持仓 / Get fund holdings."""
-        try:
-            url = f"{self.MOBILE_BASE_URL}/FundMNInverstPosition"
-            params = {
-                "FCODE": code,
-                "deviceid": "1",
-                "plat": "Iphone",
-                "product": "EFund",
-                "version": "11.0.0"
-            }
-            response = self.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            if not data.get("Success") or not data.get("Datas"):
-                return None
-            
-            datas = data["Datas"]
-            fund_stocks = datas.get("fundStocks", [])
-            expansion = data.get("Expansion") # Date like "2025-12-31"
-            
-            stocks = []
-            for s in fund_stocks:
-                # GPDM, GPJC, JZBL
-                stocks.append(HoldingStock(
-                    code=s["GPDM"],
-                    name=s["GPJC"],
-                    percentage=Decimal(s["JZBL"])
-                ))
-            
-            report_date = datetime.now().date()
-            if expansion:
-                 try:
-                    report_date = datetime.strptime(expansion, "%Y-%m-%d").date()
-                 except:
-                    pass
-
-            return FundHolding(
-                code=code,
-                name="Unknown", # API doesn't return fund name here easily, can be filled by caller
-                report_date=report_date,
-                top_stocks=stocks
-            )
-        except Exception as e:
-            print(f"Error fetching holdings for {code}: {e}")
+        url = f"{self.MOBILE_BASE_URL}/FundMNInverstPosition"
+        response = self.get(url, params=self._mobile_params(code))
+        return self._parse_fund_holdings(code, response)
+
+    @cached("holdings", holdings_expiry)
+    async def aget_fund_holdings(self, code: str) -> FundHolding | None:
+        """异步获取基金持仓 / Get fund holdings asynchronously."""
+        url = f"{self.MOBILE_BASE_URL}/FundMNInverstPosition"
+        response = await self.aget(url, params=self._mobile_params(code))
+        return self._parse_fund_holdings(code, response)
+
+    @_parser
+    def _parse_fund_holdings(self, code: str, response: httpx.Response) -> FundHolding | None:
+        """解析基金持仓响应 / Parse a FundMNInverstPosition response."""
+        data = response.json()
+        if not data.get("Success") or not data.get("Datas"):
             return None
 
+        datas = data["Datas"]
+        fund_stocks = datas.get("fundStocks", [])
+        expansion = data.get("Expansion") # Date like "2025-12-31"
+
+        stocks = []
+        for s in fund_stocks:
+            # GPDM, GPJC, JZBL
+            stocks.append(HoldingStock(
+                code=s["GPDM"],
+                name=s["GPJC"],
+                percentage=Decimal(s["JZBL"])
+            ))
+
+        report_date = _to_date(expansion) or datetime.now().date()
+
+        return FundHolding(
+            code=code,
+            name="Unknown", # API doesn't return fund name here easily, can be filled by caller
+            report_date=report_date,
+            top_stocks=stocks
+        )
+
+    @cached("estimate", estimate_expiry)
     def get_realtime_estimate(self, code: str) -> FundPrice | None:
         """获取实时估值 / Get real-time estimate.
 
@@ -138,102 +259,251 @@ class TianTianAPI(BaseClient):
             code: Fund code (e.g., "110022")
 
         Returns:
-            FundPrice object with estimate data, or None if failed
+            FundPrice object with estimate data, or None if the fund has no estimate
+
+        Raises:
+            FundAPIError: If the request fails or the response cannot be parsed
         """
-        try:
-            url = self.ESTIMATE_URL.format(code=code)
-            response = self.get(url)
-            response.raise_for_status()
-
-            # Parse JSONP response: jsonpgz({"fundcode":"110022", ...});
-            match = re.search(r"jsonpgz\((.*?)\)", response.text)
-            if not match:
-                return None
-
-            data = json.loads(match.group(1))
-
-            # Parse estimate time (format: "2024-01-30 15:00")
-            estimate_time = None
-            if data.get("gztime"):
-                try:
-                    estimate_time = datetime.strptime(data["gztime"], "%Y-%m-%d %H:%M")
-                except ValueError:
-                    pass
-
-            # Parse NAV date
-            nav_date = None
-            if data.get("jzrq"):
-                try:
-                    nav_date = datetime.strptime(data["jzrq"], "%Y-%m-%d").date()
-                except ValueError:
-                    pass
-
-            return FundPrice(
-                code=data["fundcode"],
-                name=data["name"],
-                estimate_value=Decimal(data.get("gsz", "0")) if data.get("gsz") else None,
-                estimate_time=estimate_time,
-                estimate_change=(
-                    Decimal(data.get("gszzl", "0")) if data.get("gszzl") else None
-                ),
-                nav=Decimal(data.get("dwjz", "0")) if data.get("dwjz") else None,
-                nav_date=nav_date,
-            )
-        except Exception as e:
-            print(f"Error fetching estimate for {code}: {e}")
+        response = self.get(self.ESTIMATE_URL.format(code=code))
+        return self._parse_realtime_estimate(response)
+
+    @cached("estimate", estimate_expiry)
+    async def aget_realtime_estimate(self, code: str) -> FundPrice | None:
+        """异步获取实时估值 / Get real-time estimate asynchronously."""
+        response = await self.aget(self.ESTIMATE_URL.format(code=code))
+        return self._parse_realtime_estimate(response)
+
+    @_parser
+    def _parse_realtime_estimate(self, response: httpx.Response) -> FundPrice | None:
+        """解析估值 JSONP 响应 / Parse a fundgz JSONP response."""
+        # Parse JSONP response: jsonpgz({"fundcode":"110022", ...});
+        match = re.search(r"jsonpgz\((.*?)\)", response.text)
+        if not match:
             return None
 
-    def get_historical_nav(self, code: str, limit: int = 10) -> list[HistoricalNav]:
+        data = json.loads(match.group(1))
+
+        # Parse estimate time (format: "2024-01-30 15:00")
+        estimate_time = None
+        if data.get("gztime"):
+            try:
+                estimate_time = datetime.strptime(data["gztime"], "%Y-%m-%d %H:%M")
+            except ValueError:
+                pass
+
+        # Parse NAV date
+        nav_date = _to_date(data.get("jzrq"))
+
+        return FundPrice(
+            code=data["fundcode"],
+            name=data["name"],
+            estimate_value=Decimal(data.get("gsz", "0")) if data.get("gsz") else None,
+            estimate_time=estimate_time,
+            estimate_change=(
+                Decimal(data.get("gszzl", "0")) if data.get("gszzl") else None
+            ),
+            nav=Decimal(data.get("dwjz", "0")) if data.get("dwjz") else None,
+            nav_date=nav_date,
+        )
+
+    @cached("history", nav_expiry)
+    def get_historical_nav(
+        self, code: str, limit: int = 10, series: bool = False
+    ) -> "list[HistoricalNav] | NavSeries":
         """获取历史净值 / Get historical NAV.
 
         Args:
             code: Fund code
             limit: Number of records to fetch
+            series: Return a columnar NavSeries (oldest first) parsed straight
+                from the payload instead of HistoricalNav models
 
         Returns:
-            List of HistoricalNav objects
+            List of HistoricalNav objects, newest first, or a NavSeries
+
+        Raises:
+            FundAPIError: If the request fails or the response cannot be parsed
+        """
+        if series:
+            params = self._history_params(code, 1, limit, None, None)
+            return self._parse_nav_series(code, self.get(self.HISTORY_URL, params=params))
+        return self.get_historical_nav_page(code, per=limit).rows
+
+    @cached("history", nav_expiry)
+    async def aget_historical_nav(
+        self, code: str, limit: int = 10, series: bool = False
+    ) -> "list[HistoricalNav] | NavSeries":
+        """异步获取历史净值 / Get historical NAV asynchronously."""
+        if series:
+            params = self._history_params(code, 1, limit, None, None)
+            response = await self.aget(self.HISTORY_URL, params=params)
+            return self._parse_nav_series(code, response)
+        return (await self.aget_historical_nav_page(code, per=limit)).rows
+
+    @coalesced("history_page")
+    def get_historical_nav_page(
+        self,
+        code: str,
+        page: int = 1,
+        per: int = 10,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> NavPage:
+        """获取一页历史净值 / Get one page of historical NAV, newest first.
+
+        Args:
+            code: Fund code
+            page: Page number, 1-based
+            per: Rows per page
+            start_date: Earliest NAV date to include
+            end_date: Latest NAV date to include
+
+        Returns:
+            NavPage with the rows and paging totals
+
+        Raises:
+            FundAPIError: If the request fails or the response cannot be parsed
         """
+        params = self._history_params(code, page, per, start_date, end_date)
+        return self._parse_historical_nav(self.get(self.HISTORY_URL, params=params), page)
+
+    @coalesced("history_page")
+    async def aget_historical_nav_page(
+        self,
+        code: str,
+        page: int = 1,
+        per: int = 10,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> NavPage:
+        """异步获取一页历史净值 / Get one page of historical NAV asynchronously."""
+        params = self._history_params(code, page, per, start_date, end_date)
+        response = await self.aget(self.HISTORY_URL, params=params)
+        return self._parse_historical_nav(response, page)
+
+    def iter_historical_nav(
+        self,
+        code: str,
+        per: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        prefetch: int = 0,
+    ) -> Iterator[list[HistoricalNav]]:
+        """逐页遍历历史净值 / Walk every page of a fund's NAV history.
+
+        Yields one chunk of rows per page, newest first, as soon as that page
+        is parsed. The first page supplies the total page count; with
+        `prefetch` > 0 up to that many later pages are requested concurrently
+        on worker threads while the caller consumes earlier ones, so memory
+        stays bounded by the prefetch window.
+
+        Args:
+            code: Fund code
+            per: Rows per page (defaults to HISTORY_PAGE_SIZE)
+            start_date: Earliest NAV date to include
+            end_date: Latest NAV date to include
+            prefetch: Number of pages to fetch ahead concurrently
+
+        Yields:
+            Lists of HistoricalNav rows, one per page
+
+        Raises:
+            FundAPIError: If any page request fails
+        """
+        per = per or self.HISTORY_PAGE_SIZE
+        first = self.get_historical_nav_page(code, 1, per, start_date, end_date)
+        if not first.rows:
+            return
+        yield first.rows
+
+        def fetch(page: int) -> NavPage:
+            return self.get_historical_nav_page(code, page, per, start_date, end_date)
+
+        if prefetch <= 0:
+            for page in range(2, first.pages + 1):
+                rows = fetch(page).rows
+                if not rows:
+                    return
+                yield rows
+            return
+
+        pool = ThreadPoolExecutor(max_workers=prefetch)
+        pending = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= first.pages:
+                while next_page <= first.pages and len(pending) < prefetch:
+                    pending.append(pool.submit(fetch, next_page))
+                    next_page += 1
+                rows = pending.popleft().result().rows
+                if not rows:
+                    return
+                yield rows
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def aiter_historical_nav(
+        self,
+        code: str,
+        per: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        prefetch: int = 0,
+    ) -> AsyncIterator[list[HistoricalNav]]:
+        """异步逐页遍历历史净值 / Walk every page of a fund's NAV history asynchronously.
+
+        Same contract as `iter_historical_nav`, with prefetched pages running
+        as tasks on the current event loop.
+        """
+        per = per or self.HISTORY_PAGE_SIZE
+        first = await self.aget_historical_nav_page(code, 1, per, start_date, end_date)
+        if not first.rows:
+            return
+        yield first.rows
+
+        def fetch(page: int):
+            return self.aget_historical_nav_page(code, page, per, start_date, end_date)
+
+        pending: deque[asyncio.Task] = deque()
+        next_page = 2
+        window = max(1, prefetch)
         try:
-            url = f"{self.HISTORY_URL}?type=lsjz&code={code}&page=1&per={limit}"
-            response = self.get(url)
-            response.raise_for_status()
-
-            # Parse JavaScript response containing HTML table
-            # Format: var apidata={ content:"<table>...</table>",records:3736,pages:374,curpage:1};
-            match = re.search(r'content:"(.*?)",records', response.text, re.DOTALL)
-            if not match:
-                return []
-
-            html = match.group(1)
-            rows = re.findall(r"<tr>(.*?)</tr>", html)
-
-            results = []
-            for row in rows[1:]:  # Skip header row
-                cells = re.findall(r"<td[^>]*>(.*?)</td>", row)
-                if len(cells) >= 4:
-                    # Clean HTML tags
-                    date_str = re.sub(r"<[^>]+>", "", cells[0])
-                    nav_str = re.sub(r"<[^>]+>", "", cells[1])
-                    acc_str = re.sub(r"<[^>]+>", "", cells[2])
-                    change_str = re.sub(r"<[^>]+>", "", cells[3])
-
-                    try:
-                        results.append(
-                            HistoricalNav(
-                                date=datetime.strptime(date_str, "%Y-%m-%d").date(),
-                                nav=Decimal(nav_str),
-                                accumulated_nav=Decimal(acc_str),
-                                daily_change=(
-                                    Decimal(change_str.replace("%", ""))
-                                    if change_str != "---"
-                                    else None
-                                ),
-                            )
-                        )
-                    except (ValueError, IndexError):
-                        continue
-
-            return results
-        except Exception as e:
-            print(f"Error fetching history for {code}: {e}")
-            return []
+            while pending or next_page <= first.pages:
+                while next_page <= first.pages and len(pending) < window:
+                    pending.append(asyncio.ensure_future(fetch(next_page)))
+                    next_page += 1
+                rows = (await pending.popleft()).rows
+                if not rows:
+                    return
+                yield rows
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _history_params(
+        self,
+        code: str,
+        page: int,
+        per: int,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> dict:
+        """历史净值查询参数 / Query params for the F10 lsjz endpoint."""
+        params = {"type": "lsjz", "code": code, "page": page, "per": per}
+        if start_date:
+            params["sdate"] = start_date.isoformat()
+        if end_date:
+            params["edate"] = end_date.isoformat()
+        return params
+
+    @_parser
+    def _parse_historical_nav(self, response: httpx.Response, page: int = 1) -> NavPage:
+        """解析历史净值响应 / Parse an F10DataApi lsjz response."""
+        rows, records, pages = parse_history(response.text)
+        return NavPage(rows=rows, records=records, pages=pages, page=page)
+
+    @_parser
+    def _parse_nav_series(self, code: str, response: httpx.Response) -> "NavSeries":
+        """解析为列式序列 / Parse an F10DataApi lsjz response into a NavSeries."""
+        html, _, _ = split_payload(response.text)
+        return parse_series(html, code)
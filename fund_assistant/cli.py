@@ -1,13 +1,24 @@
-"""CLI commands for fund assistant."""
+"""CLI commands for fund assistant.
 
-from typing import List
+Startup cost matters because agents shell out to this CLI for every query,
+so only Typer is imported eagerly. The service (HTTP client, stores, fund
+data) and the Rich formatter are built on first use by the commands that
+need them, which keeps `--help` and offline commands fast.
+"""
+
+import functools
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 from typing_extensions import Annotated
 
 import typer
-from rich.console import Console
 
-from fund_assistant.services import FundService
-from fund_assistant.ui import FundFormatter
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from fund_assistant.services import FundService
+    from fund_assistant.ui import FundFormatter
 
 app = typer.Typer(
     name="fund-assistant",
@@ -16,43 +27,180 @@ app = typer.Typer(
     no_args_is_help=True,
 )
 
-console = Console()
-fund_service = FundService()
-formatter = FundFormatter(console)
+# Global options set by the app callback
+state = {"output": "table"}
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    output: Annotated[
+        str,
+        typer.Option(
+            "--output", "-o", help="输出格式: table/json/ndjson/csv / Output format"
+        ),
+    ] = "table",
+    profile: Annotated[
+        bool,
+        typer.Option("--profile", help="结束后输出耗时分解 / Print a timing breakdown to stderr"),
+    ] = False,
+):
+    """📊 基金投资助理 / Fund Investment Assistant"""
+    from fund_assistant.ui.serializer import FORMATS
+
+    if output not in FORMATS:
+        typer.echo(
+            f"❌ 输出格式必须是 {'/'.join(FORMATS)} / Output must be one of {', '.join(FORMATS)}",
+            err=True,
+        )
+        raise typer.Exit(1)
+    state["output"] = output
+    if profile:
+        # Close callbacks run last-registered first, so this reports after the close
+        ctx.call_on_close(functools.partial(print_profile, time.perf_counter()))
+    ctx.call_on_close(close_service)
+
+
+@functools.cache
+def get_console() -> "Console":
+    """终端控制台 (延迟创建) / Shared Rich console, created on first use."""
+    from rich.console import Console
+
+    return Console()
+
+
+@functools.cache
+def get_formatter() -> "FundFormatter":
+    """格式化器 (延迟创建) / Shared formatter, created on first use."""
+    from fund_assistant.ui import FundFormatter
+
+    return FundFormatter(get_console())
+
+
+@functools.cache
+def get_service() -> "FundService":
+    """基金服务 (延迟创建) / Shared fund service, created on first use."""
+    from fund_assistant.services import FundService
+
+    return FundService()
+
+
+def fetch(call, *args):
+    """调用数据源 / Run a service call, exiting with a message if the upstream fails.
+
+    Batch commands skip failed codes on their own; single-fund commands have
+    nothing to show without the answer.
+    """
+    from fund_assistant.api import FundAPIError
+
+    try:
+        return call(*args)
+    except FundAPIError as e:
+        typer.echo(f"❌ 数据源请求失败 / Upstream request failed: {e}", err=True)
+        raise typer.Exit(1)
+
+
+def emit(data) -> bool:
+    """机器可读输出 / Write data in the global output format.
+
+    Args:
+        data: Model, dict or iterable of records; None means the fetch failed
+
+    Returns:
+        False in table mode (the caller renders with Rich), True otherwise
+    """
+    if state["output"] == "table":
+        return False
+    if data is None:
+        typer.echo("❌ 无法获取数据 / Failed to fetch data", err=True)
+        raise typer.Exit(1)
+
+    from fund_assistant.ui.serializer import write
+
+    write(data, state["output"])
+    return True
+
+
+def report_failed(failed: "list[str]"):
+    """失败代码写到 stderr / Report failed codes on stderr in machine-readable mode."""
+    if failed:
+        typer.echo(f"⚠️ 获取失败 / Failed: {', '.join(failed)}", err=True)
+
+
+def close_service():
+    """关闭服务 / Release the service's connections if a command created it."""
+    if get_service.cache_info().currsize:
+        get_service().close()
+
+
+def print_profile(start: float):
+    """输出耗时分解 / Print the recorded stage timings of this command to stderr."""
+    from rich.console import Console
+
+    from fund_assistant.instrumentation import default_registry
+    from fund_assistant.ui import FundFormatter
+
+    rows = default_registry().snapshot()
+    FundFormatter(Console(stderr=True)).display_profile(rows, time.perf_counter() - start)
+
+
+def collect_codes(codes: "list[str] | None", watchlist: Path | None) -> "list[str]":
+    """合并代码与自选文件 / Merge command-line codes with a watchlist, deduplicated.
+
+    Exits with an error message when neither yields a code.
+    """
+    from fund_assistant.services.watchlist import load_watchlist
+
+    codes = [*(codes or []), *(load_watchlist(watchlist) if watchlist else [])]
+    codes = list(dict.fromkeys(codes))
+    if not codes:
+        get_console().print(
+            "[red]⚠️ 请输入基金代码或自选文件 / Please input fund codes or a watchlist[/red]"
+        )
+        raise typer.Exit(1)
+    return codes
 
 
 @app.command()
 def info(code: Annotated[str, typer.Argument(help="基金代码 / Fund code")]):
     """ℹ️ 基金详情 (规模/费率/业绩) / Fund Details"""
-    detail = fund_service.get_fund_detail(code)
-    formatter.display_fund_detail(detail)
+    detail = fetch(get_service().get_fund_detail, code)
+    if not emit(detail):
+        get_formatter().display_fund_detail(detail)
 
 
 @app.command()
 def holding(code: Annotated[str, typer.Argument(help="基金代码 / Fund code")]):
     """📊 持仓分析 (前十大重仓) / Holdings Analysis"""
-    holding = fund_service.get_fund_holdings(code)
-    formatter.display_fund_holdings(holding)
+    holding = fetch(get_service().get_fund_holdings, code)
+    if not emit(holding):
+        get_formatter().display_fund_holdings(holding)
 
 
 @app.command()
 def compare(
-    codes: Annotated[List[str], typer.Argument(help="基金代码列表 (空格分隔) / Fund codes")]
+    codes: Annotated[list[str], typer.Argument(help="基金代码列表 (空格分隔) / Fund codes")]
 ):
     """🆚 基金对比 (2-4只) / Compare Funds"""
     if len(codes) < 2:
-        console.print("[red]⚠️ 请至少输入2个基金代码进行对比 / Please input at least 2 fund codes[/red]")
+        get_console().print(
+            "[red]⚠️ 请至少输入2个基金代码进行对比 / Please input at least 2 fund codes[/red]"
+        )
         raise typer.Exit(1)
     
-    details = fund_service.compare_funds(codes)
-    formatter.display_comparison(details)
+    details = get_service().compare_funds(codes)
+    if not emit(details):
+        get_formatter().display_comparison(details)
 
 
 @app.command()
 def manager(code: Annotated[str, typer.Argument(help="基金代码 / Fund code")]):
     """🧑‍💼 基金经理 (姓名/公司) / Fund Manager"""
     # Currently reusing basic detail to get manager name
-    detail = fund_service.get_fund_detail(code)
+    detail = fetch(get_service().get_fund_detail, code)
+    if emit(detail and {"code": detail.code, "manager": detail.manager, "company": detail.company}):
+        return
+    console = get_console()
     if detail:
         console.print(f"🧑‍💼 基金经理: [bold cyan]{detail.manager}[/bold cyan]")
         console.print(f"🏢 基金公司: {detail.company}")
@@ -61,22 +209,118 @@ def manager(code: Annotated[str, typer.Argument(help="基金代码 / Fund code")
         console.print("[red]❌ 无法获取信息 / Failed to fetch info[/red]")
 
 
-@app.command()
-def list(
+@app.command("list")
+def list_funds(
     type: Annotated[
         str | None, typer.Option("--type", "-t", help="基金类型: stock/bond/hybrid/index/money")
     ] = None,
 ):
     """📋 显示常用基金列表 / Show fund list"""
-    funds = fund_service.get_fund_list(fund_type=type)
-    formatter.display_fund_list(funds)
+    funds = get_service().get_fund_list(fund_type=type)
+    if not emit(funds):
+        get_formatter().display_fund_list(funds)
 
 
 @app.command()
-def price(code: Annotated[str, typer.Argument(help="基金代码 / Fund code")]):
+def price(
+    codes: Annotated[
+        list[str] | None, typer.Argument(help="基金代码 (可多个) / Fund code(s)")
+    ] = None,
+    watchlist: Annotated[
+        Path | None,
+        typer.Option("--watchlist", "-w", help="自选基金文件 (每行一个代码) / Watchlist file"),
+    ] = None,
+):
     """💰 查询基金实时估值和净值 / Query fund price"""
-    fund_data = fund_service.get_fund_price(code)
-    formatter.display_fund_price(fund_data)
+    codes = collect_codes(codes, watchlist)
+    if len(codes) == 1:
+        fund_data = fetch(get_service().get_fund_price, codes[0])
+        if not emit(fund_data):
+            get_formatter().display_fund_price(fund_data)
+        return
+
+    prices = get_service().get_fund_prices(codes)
+    failed = [code for code, fund_price in zip(codes, prices) if fund_price is None]
+    if emit([p for p in prices if p is not None]):
+        report_failed(failed)
+    else:
+        get_formatter().display_price_table([p for p in prices if p is not None], failed)
+
+
+@app.command()
+def watch(
+    codes: Annotated[
+        list[str] | None, typer.Argument(help="基金代码 (可多个) / Fund code(s)")
+    ] = None,
+    watchlist: Annotated[
+        Path | None,
+        typer.Option("--watchlist", "-w", help="自选基金文件 (每行一个代码) / Watchlist file"),
+    ] = None,
+    interval: Annotated[
+        float, typer.Option("--interval", "-i", min=5, help="最短轮询间隔秒数 / Fastest poll (s)")
+    ] = 15.0,
+    max_interval: Annotated[
+        float, typer.Option("--max-interval", help="最长轮询间隔秒数 / Slowest poll (s)")
+    ] = 240.0,
+):
+    """👀 实时监控估值 (Ctrl+C 退出) / Live estimate dashboard"""
+    import asyncio
+
+    from rich.live import Live
+
+    from fund_assistant.services.watcher import EstimateWatcher
+
+    codes = collect_codes(codes, watchlist)
+    watcher = EstimateWatcher(
+        codes, interval, max_interval, concurrency=get_service().concurrency
+    )
+    if state["output"] != "table":
+        # An endless stream has no closing bracket or fixed header, so every
+        # machine-readable format streams changed estimates as NDJSON lines
+        import sys
+
+        from fund_assistant.ui.serializer import write
+
+        def stream(changed: set[str], status: str):
+            write([watcher.prices[code] for code in codes if code in changed], "ndjson")
+            sys.stdout.flush()
+
+        async def run_stream():
+            try:
+                await watcher.run(stream)
+            finally:
+                await watcher.aclose()
+
+        try:
+            asyncio.run(run_stream())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    formatter = get_formatter()
+
+    async def run():
+        with Live(
+            formatter.render_watch(watcher, set(), "加载中 / Loading..."),
+            console=get_console(),
+            auto_refresh=False,
+        ) as live:
+
+            def update(changed: set[str], status: str):
+                live.update(formatter.render_watch(watcher, changed, status), refresh=True)
+
+            try:
+                await watcher.run(update)
+            finally:
+                await watcher.aclose()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        get_console().print(
+            f"\n[dim]已退出，共请求 {watcher.requests} 次"
+            f" / Stopped after {watcher.requests} requests[/dim]"
+        )
 
 
 @app.command()
@@ -85,8 +329,9 @@ def history(
     limit: Annotated[int, typer.Option("--limit", "-n", help="显示条数 / Number of records")] = 10,
 ):
     """📅 查询历史净值 / Query historical NAV"""
-    history_data = fund_service.get_history(code, limit)
-    formatter.display_history(history_data, code)
+    history_data = get_service().get_history(code, limit)
+    if not emit(history_data):
+        get_formatter().display_history(history_data, code)
 
 
 @app.command()
@@ -96,15 +341,20 @@ def hot(
     ] = None,
 ):
     """🔥 显示热门基金 / Show hot funds"""
-    hot_funds = fund_service.get_hot_funds(fund_type=type)
-    formatter.display_hot_funds(hot_funds)
+    hot_funds = get_service().get_hot_funds(fund_type=type)
+    if not emit(hot_funds):
+        get_formatter().display_hot_funds(hot_funds)
 
 
 @app.command()
-def search(keyword: Annotated[str, typer.Argument(help="搜索关键词 / Search keyword")]):
-    """🔍 搜索基金 (支持名称/代码) / Search funds"""
-    results = fund_service.search_funds(keyword)
-    formatter.display_search_results(results, keyword)
+def search(
+    keyword: Annotated[str, typer.Argument(help="搜索关键词 / Search keyword")],
+    limit: Annotated[int, typer.Option("--limit", "-n", help="最多显示条数 / Max results")] = 20,
+):
+    """🔍 搜索基金 (支持名称/代码/拼音首字母) / Search funds"""
+    results = get_service().search_funds(keyword, limit)
+    if not emit(results):
+        get_formatter().display_search_results(results, keyword)
 
 
 @app.command()
@@ -115,16 +365,234 @@ def calc(
     frequency: Annotated[
         str, typer.Option("--freq", "-f", help="定投频率: monthly/weekly / Frequency")
     ] = "monthly",
+    backtest: Annotated[
+        bool, typer.Option("--backtest", "-b", help="基于真实净值回测 / Backtest on real NAV")
+    ] = False,
+    sweep: Annotated[
+        bool, typer.Option("--sweep", help="遍历所有起投日回测 / Backtest every start date")
+    ] = False,
+    monte_carlo: Annotated[
+        bool,
+        typer.Option("--monte-carlo", "-m", help="蒙特卡洛模拟 / Monte Carlo simulation"),
+    ] = False,
+    paths: Annotated[
+        int, typer.Option("--paths", min=100, help="模拟路径数 / Simulated paths")
+    ] = 10_000,
+    workers: Annotated[
+        int | None,
+        typer.Option("--workers", min=1, help="进程数 (默认自动) / Worker processes"),
+    ] = None,
 ):
     """🧮 定投计算器 / DCA Calculator"""
     if frequency not in ["monthly", "weekly", "daily"]:
-        console.print(
+        get_console().print(
             "[red]❌ 频率必须是 monthly/weekly/daily / Frequency must be monthly/weekly/daily[/red]"
         )
         raise typer.Exit(1)
 
-    result = fund_service.calculate_dca(code, amount, years, frequency)
-    formatter.display_calculator(result)
+    try:
+        if monte_carlo:
+            result = get_service().simulate_dca(
+                code, amount, years, frequency, paths=paths, workers=workers
+            )
+        elif sweep:
+            result = get_service().sweep_dca(code, amount, years, frequency)
+        elif backtest:
+            result = get_service().backtest_dca(code, amount, years, frequency)
+        else:
+            result = get_service().calculate_dca(code, amount, years, frequency)
+    except ValueError as e:
+        get_console().print(f"[red]❌ 计算失败 / Calculation failed: {e}[/red]")
+        raise typer.Exit(1)
+    if not emit(result):
+        get_formatter().display_calculator(result)
+
+
+@app.command()
+def metrics(
+    codes: Annotated[
+        list[str] | None, typer.Argument(help="基金代码 (可多个) / Fund code(s)")
+    ] = None,
+    watchlist: Annotated[
+        Path | None,
+        typer.Option("--watchlist", "-w", help="自选基金文件 (每行一个代码) / Watchlist file"),
+    ] = None,
+    years: Annotated[
+        float | None, typer.Option("--years", "-y", help="统计最近 N 年 / Trailing years")
+    ] = None,
+    sort: Annotated[
+        str, typer.Option("--sort", "-s", help="排序指标 / Sort by: sharpe/sortino/calmar/return")
+    ] = "sharpe",
+):
+    """📐 风险收益指标 / Risk and performance metrics"""
+    sort_keys = {
+        "sharpe": "sharpe",
+        "sortino": "sortino",
+        "calmar": "calmar",
+        "return": "annual_return",
+    }
+    if sort not in sort_keys:
+        get_console().print(
+            "[red]❌ 排序指标必须是 sharpe/sortino/calmar/return / Invalid sort key[/red]"
+        )
+        raise typer.Exit(1)
+
+    codes = collect_codes(codes, watchlist)
+    service = get_service()
+    if len(codes) == 1:
+        results = [service.get_metrics(codes[0], years)]
+    else:
+        results = service.get_metrics_batch(codes, years)
+
+    failed = [code for code, result in zip(codes, results) if result is None]
+    key = sort_keys[sort]
+    ranked = sorted(
+        (result for result in results if result is not None),
+        key=lambda result: result[key] if result[key] is not None else float("-inf"),
+        reverse=True,
+    )
+    if emit(ranked):
+        report_failed(failed)
+    else:
+        get_formatter().display_metrics(ranked, failed)
+
+
+@app.command()
+def correlation(
+    codes: Annotated[
+        list[str] | None, typer.Argument(help="基金代码 (可多个) / Fund code(s)")
+    ] = None,
+    watchlist: Annotated[
+        Path | None,
+        typer.Option("--watchlist", "-w", help="自选基金文件 (每行一个代码) / Watchlist file"),
+    ] = None,
+    days: Annotated[
+        int, typer.Option("--days", "-d", min=10, help="最近 N 个交易日 / Trading-day window")
+    ] = 250,
+    matrix: Annotated[
+        str, typer.Option("--matrix", "-m", help="矩阵: corr/cov / Matrix type")
+    ] = "corr",
+):
+    """🔗 基金相关性矩阵 / Return correlation matrix"""
+    matrices = {"corr": "correlation", "cov": "covariance"}
+    if matrix not in matrices:
+        get_console().print("[red]❌ 矩阵必须是 corr/cov / Matrix must be corr/cov[/red]")
+        raise typer.Exit(1)
+
+    codes = collect_codes(codes, watchlist)
+    if len(codes) < 2:
+        get_console().print(
+            "[red]⚠️ 请至少输入2个基金代码 / Please input at least 2 fund codes[/red]"
+        )
+        raise typer.Exit(1)
+
+    try:
+        result = get_service().get_correlation(codes, days)
+    except ValueError as e:
+        get_console().print(f"[red]❌ 计算失败 / Calculation failed: {e}[/red]")
+        raise typer.Exit(1)
+
+    if state["output"] == "table":
+        get_formatter().display_correlation(result, matrices[matrix])
+    else:
+        from fund_assistant.ui.serializer import write_matrix
+
+        write_matrix(result, matrices[matrix], state["output"])
+
+
+@app.command()
+def overlap(
+    codes: Annotated[
+        list[str] | None, typer.Argument(help="基金代码 (可多个) / Fund code(s)")
+    ] = None,
+    watchlist: Annotated[
+        Path | None,
+        typer.Option("--watchlist", "-w", help="自选基金文件 (每行一个代码) / Watchlist file"),
+    ] = None,
+    stock: Annotated[
+        str | None,
+        typer.Option(
+            "--stock", "-s", help="查询持有该股票的基金 (代码或名称) / Stock code or name"
+        ),
+    ] = None,
+    top: Annotated[int, typer.Option("--top", "-n", help="显示条数 / Number of rows")] = 10,
+):
+    """🧩 持仓重合分析 / Holdings overlap analysis"""
+    codes = collect_codes(codes, watchlist)
+    index, failed = get_service().get_holdings_index(codes)
+    if stock:
+        holders = index.holders(stock)
+        if emit(holders):
+            report_failed(failed)
+        else:
+            get_formatter().display_stock_holders(stock, holders, failed)
+    elif emit(index.overlap_pairs(top)):
+        report_failed(failed)
+    else:
+        get_formatter().display_overlap(index, top, failed)
+
+
+@app.command()
+def serve(
+    host: Annotated[str, typer.Option("--host", help="监听地址 / Bind address")] = "127.0.0.1",
+    port: Annotated[int, typer.Option("--port", "-p", help="端口 / Port")] = 8765,
+):
+    """🛰️ 启动本地 JSON API 服务 / Run the local JSON API server"""
+    import asyncio
+
+    from fund_assistant.server import FundServer
+
+    def ready(address):
+        get_console().print(
+            f"[green]🛰️ 服务已启动 / Serving on http://{address[0]}:{address[1]}[/green]"
+            " [dim](Ctrl+C 退出 / to stop)[/dim]"
+        )
+
+    try:
+        asyncio.run(FundServer(get_service()).serve(host, port, ready))
+    except KeyboardInterrupt:
+        get_console().print("[dim]服务已停止 / Server stopped[/dim]")
+
+
+@app.command("import-funds")
+def import_funds(
+    path: Annotated[
+        Path, typer.Argument(help="基金列表文件 (.js/.csv/.json) / Fund list file", exists=True)
+    ],
+):
+    """📥 导入全市场基金列表 / Import a full-market fund list"""
+    try:
+        catalog = get_service().import_catalog(path)
+    except ValueError as e:
+        typer.echo(f"❌ 无法导入 / Import failed: {e}", err=True)
+        raise typer.Exit(1)
+    get_console().print(
+        f"[green]✅ 已导入 {len(catalog)} 只基金 / Imported {len(catalog)} funds[/green]"
+    )
+    if catalog.skipped:
+        get_console().print(
+            f"[yellow]⚠️ 跳过 {catalog.skipped} 行无效记录 / "
+            f"Skipped {catalog.skipped} invalid rows[/yellow]"
+        )
+
+
+@app.command()
+def cache(
+    clear: Annotated[bool, typer.Option("--clear", help="清空缓存 / Clear the cache")] = False,
+):
+    """🗄️ 缓存状态 / Cache status"""
+    if get_service().cache is None:
+        get_console().print(
+            "[yellow]缓存已关闭 / Cache is disabled (FUND_ASSISTANT_CACHE=off)[/yellow]"
+        )
+        return
+    if clear:
+        get_service().cache.clear()
+        if state["output"] == "table":
+            get_console().print("[green]✅ 缓存已清空 / Cache cleared[/green]")
+    stats = get_service().cache.stats()
+    if not emit(stats):
+        get_formatter().display_cache_stats(stats)
 
 
 @app.command()
@@ -168,7 +636,7 @@ def summary():
 
 """
     md = Markdown(summary_text)
-    console.print(md)
+    get_console().print(md)
 
 
 if __name__ == "__main__":
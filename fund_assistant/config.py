@@ -0,0 +1,59 @@
+"""Runtime configuration."""
+
+import os
+from pathlib import Path
+
+# Override with FUND_ASSISTANT_HOME to relocate every local store and cache
+DEFAULT_HOME = "~/.fund-assistant"
+
+# Origin of a local stand-in for the eastmoney hosts, e.g. http://127.0.0.1:9000
+API_BASE_ENV = "FUND_ASSISTANT_API_BASE"
+
+# Cassette directory for recording or replaying upstream responses
+CASSETTE_ENV = "FUND_ASSISTANT_CASSETTE"
+
+# `record` captures from the network into the cassette, `replay` (default) serves from it
+CASSETTE_MODE_ENV = "FUND_ASSISTANT_CASSETTE_MODE"
+
+# Simulated upstream when replaying, e.g. latency=0.08,jitter=0.03,errors=0.02,rate=20
+REPLAY_ENV = "FUND_ASSISTANT_REPLAY"
+
+
+def data_home() -> Path:
+    """本地数据目录 / Directory holding local stores and caches.
+
+    Returns:
+        Existing directory path
+    """
+    path = Path(os.environ.get("FUND_ASSISTANT_HOME", DEFAULT_HOME)).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def api_base_url() -> str | None:
+    """接口源站覆盖 / Origin replacing the eastmoney hosts, for tests and mirrors.
+
+    Returns:
+        Base URL from FUND_ASSISTANT_API_BASE, or None to use the real hosts
+    """
+    return os.environ.get(API_BASE_ENV) or None
+
+
+def cassette_dir() -> Path | None:
+    """录制回放目录 / Cassette directory recording or replaying upstream responses.
+
+    Returns:
+        Path from FUND_ASSISTANT_CASSETTE, or None to use the network as is
+    """
+    path = os.environ.get(CASSETTE_ENV)
+    return Path(path).expanduser() if path else None
+
+
+def cassette_mode() -> str:
+    """录制或回放 / `record` or `replay`, from FUND_ASSISTANT_CASSETTE_MODE."""
+    return os.environ.get(CASSETTE_MODE_ENV, "replay").lower()
+
+
+def replay_spec() -> str:
+    """回放模拟参数 / Simulated upstream behaviour from FUND_ASSISTANT_REPLAY."""
+    return os.environ.get(REPLAY_ENV, "")
@@ -0,0 +1,254 @@
+"""Lightweight timing instrumentation.
+
+Hooks across the stack record durations into per-(stage, name) latency
+histograms of one process-wide registry:
+
+    http      one upstream attempt, by host
+    connect   TCP connect including DNS, by host (real network only)
+    tls       TLS handshake, by host
+    wait      request sent to response headers received, by host
+    throttle  time queued by the client-side rate limiter, by host
+    backoff   sleep between retries, by host
+    parse     one TianTianAPI parse step, by endpoint
+    service   one FundService method, by method (nested calls count in both)
+    render    one FundFormatter display method, by method
+    request   one `serve` endpoint, by route
+
+Recording costs two clock reads and a locked bucket increment, so the
+hooks stay on. `fund-assistant --profile` prints the breakdown after a
+command and `serve` exports it in the Prometheus text format.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in seconds, from sub-millisecond parses to slow pages
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prometheus metric name of the exported histograms
+METRIC_NAME = "fund_assistant_duration_seconds"
+
+# httpcore trace events timed per request, and the stage each is recorded under
+TRACE_STAGES = {
+    "connection.connect_tcp": "connect",
+    "connection.start_tls": "tls",
+    "http11.receive_response_headers": "wait",
+    "http2.receive_response_headers": "wait",
+}
+
+
+class Histogram:
+    """延迟直方图 / Fixed-bucket latency histogram with count, sum and max."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """分位数估计 / Estimate a quantile by interpolating inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            if count and seen + count >= rank:
+                lower = BUCKETS[i - 1] if i else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(estimate, self.max)
+            seen += count
+        return self.max
+
+
+class Registry:
+    """计时注册表 / Latency histograms keyed by (stage, name), safe across threads."""
+
+    def __init__(self):
+        self._histograms: dict[tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, name: str, seconds: float):
+        """记录耗时 / Add one duration to the (stage, name) histogram."""
+        key = (stage, name)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, name: str):
+        """计时块 / Time a `with` block, whether it returns or raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, name, time.perf_counter() - start)
+
+    def reset(self):
+        """清空 / Drop every histogram."""
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self) -> list[dict]:
+        """汇总 / Per-(stage, name) statistics in seconds, slowest stage total first.
+
+        Returns:
+            Dicts with stage, name, count, total, mean, p50, p95 and max
+        """
+        with self._lock:
+            items = [(key, _copy(histogram)) for key, histogram in self._histograms.items()]
+        stage_totals: dict[str, float] = {}
+        for (stage, _), histogram in items:
+            stage_totals[stage] = stage_totals.get(stage, 0.0) + histogram.total
+        items.sort(key=lambda item: (-stage_totals[item[0][0]], item[0][0], -item[1].total))
+        return [
+            {
+                "stage": stage,
+                "name": name,
+                "count": histogram.count,
+                "total": histogram.total,
+                "mean": histogram.total / histogram.count,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "max": histogram.max,
+            }
+            for (stage, name), histogram in items
+        ]
+
+    def prometheus(self) -> str:
+        """Prometheus 文本格式 / Every histogram in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted((key, _copy(histogram)) for key, histogram in self._histograms.items())
+        lines = [
+            f"# HELP {METRIC_NAME} Time spent per stage and operation.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for (stage, name), histogram in items:
+            labels = f'stage="{_escape(stage)}",name="{_escape(name)}"'
+            cumulative = 0
+            for bound, count in zip((*map(repr, BUCKETS), "+Inf"), histogram.buckets):
+                cumulative += count
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {histogram.total!r}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _copy(histogram: Histogram) -> Histogram:
+    """直方图副本 / Copy taken under the registry lock, so readers see one state."""
+    copy = Histogram()
+    copy.buckets = list(histogram.buckets)
+    copy.count, copy.total, copy.max = histogram.count, histogram.total, histogram.max
+    return copy
+
+
+def _escape(value: str) -> str:
+    """标签转义 / Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@functools.cache
+def default_registry() -> Registry:
+    """全局注册表 / Registry shared by every hook in the process."""
+    return Registry()
+
+
+def timed(stage: str, name: str | None = None):
+    """计时装饰器 / Record each call of a blocking or async function under `stage`.
+
+    Args:
+        stage: Histogram stage
+        name: Histogram name (defaults to the function name)
+    """
+
+    def decorator(func):
+        label = name or func.__name__
+        registry = default_registry()
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    registry.observe(stage, label, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                registry.observe(stage, label, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def instrumented(stage: str):
+    """类计时装饰器 / Time every public method of a class under `stage`.
+
+    Plain and async methods are wrapped with `timed`; properties, static
+    and class methods and generators are left alone.
+    """
+
+    def decorate(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith("_") or not inspect.isfunction(value):
+                continue
+            if inspect.isgeneratorfunction(value) or inspect.isasyncgenfunction(value):
+                continue
+            setattr(cls, attr, timed(stage, attr)(value))
+        return cls
+
+    return decorate
+
+
+class HTTPTrace:
+    """请求追踪 / httpx `trace` extension timing connection setup and server wait.
+
+    Pass the instance itself to the blocking client and `atrace` to the
+    async client, one instance per request.
+    """
+
+    __slots__ = ("host", "_started")
+
+    def __init__(self, host: str):
+        self.host = host
+        self._started: dict[str, float] = {}
+
+    def __call__(self, event: str, info: dict):
+        step, _, state = event.rpartition(".")
+        stage = TRACE_STAGES.get(step)
+        if stage is None:
+            return
+        if state == "started":
+            self._started[step] = time.perf_counter()
+        elif state == "complete" and step in self._started:
+            elapsed = time.perf_counter() - self._started.pop(step)
+            default_registry().observe(stage, self.host, elapsed)
+
+    async def atrace(self, event: str, info: dict):
+        self(event, info)
+
@@ -0,0 +1,88 @@
+"""A-share market calendar helpers.
+
+Trading days are approximated as weekdays; exchange holidays are not modelled,
+which only makes cached data expire earlier than necessary.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+# China Standard Time has no daylight saving, so a fixed offset is exact
+CN_TZ = timezone(timedelta(hours=8), "Asia/Shanghai")
+
+# Continuous trading sessions
+SESSIONS = ((time(9, 30), time(11, 30)), (time(13, 0), time(15, 0)))
+
+# Confirmed NAVs for a trading day are published in the evening
+NAV_RELEASE_TIME = time(20, 0)
+
+# Quarterly holdings reports are due within 15 working days of quarter end
+HOLDINGS_REPORT_DAYS = ((1, 22), (4, 22), (7, 22), (10, 25))
+
+
+def now_cn() -> datetime:
+    """当前北京时间 / Current time in China Standard Time."""
+    return datetime.now(CN_TZ)
+
+
+def _localize(now: datetime | None) -> datetime:
+    """转换为北京时间 / Normalize to an aware CST datetime, naive values taken as CST."""
+    if now is None:
+        return now_cn()
+    if now.tzinfo is None:
+        return now.replace(tzinfo=CN_TZ)
+    return now.astimezone(CN_TZ)
+
+
+def is_trading_day(day: date) -> bool:
+    """是否交易日 / Whether the exchange trades on this day."""
+    return day.weekday() < 5
+
+
+def is_trading_time(now: datetime | None = None) -> bool:
+    """是否交易时段 / Whether `now` falls inside a trading session."""
+    now = _localize(now)
+    if not is_trading_day(now.date()):
+        return False
+    return any(start <= now.time() < end for start, end in SESSIONS)
+
+
+def next_market_open(now: datetime | None = None) -> datetime:
+    """下一次开盘 / Start of the next trading session after `now`."""
+    now = _localize(now)
+    day = now.date()
+    while True:
+        if is_trading_day(day):
+            for start, _ in SESSIONS:
+                opens = datetime.combine(day, start, CN_TZ)
+                if opens > now:
+                    return opens
+        day += timedelta(days=1)
+
+
+def next_nav_release(now: datetime | None = None) -> datetime:
+    """下一次净值公布 / Earliest time a newer confirmed NAV can appear."""
+    now = _localize(now)
+    day = now.date()
+    while True:
+        if is_trading_day(day):
+            release = datetime.combine(day, NAV_RELEASE_TIME, CN_TZ)
+            if release > now:
+                return release
+        day += timedelta(days=1)
+
+
+def next_holdings_report(now: datetime | None = None) -> datetime:
+    """下一次季报披露 / Next quarterly holdings report deadline."""
+    now = _localize(now)
+    candidates = (
+        datetime(year, month, day, tzinfo=CN_TZ)
+        for year in (now.year, now.year + 1)
+        for month, day in HOLDINGS_REPORT_DAYS
+    )
+    return next(report for report in candidates if report > now)
+
+
+def next_day(now: datetime | None = None) -> datetime:
+    """次日零点 / Midnight starting the next calendar day."""
+    now = _localize(now)
+    return datetime.combine(now.date() + timedelta(days=1), time(0), CN_TZ)
@@ -1,4 +1,10 @@
-"""Data models for fund assistant."""
+"""Data models for fund assistant.
+
+`NavSeries` is exported lazily: it needs NumPy, which commands that only
+handle models should not pay for at startup.
+"""
+
+from typing import TYPE_CHECKING
 
 from fund_assistant.models.enums import FundType, RiskLevel
 from fund_assistant.models.fund import (
@@ -11,6 +17,9 @@ from fund_assistant.models.fund import (
     HoldingStock,
 )
 
+if TYPE_CHECKING:
+    from fund_assistant.models.nav_series import NavSeries
+
 __all__ = [
     "FundType",
     "RiskLevel",
@@ -21,4 +30,13 @@ __all__ = [
     "FundManager",
     "FundHolding",
     "HoldingStock",
+    "NavSeries",
 ]
+
+
+def __getattr__(name: str):
+    if name == "NavSeries":
+        from fund_assistant.models.nav_series import NavSeries
+
+        return NavSeries
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -18,6 +18,8 @@ class FundBasic(BaseModel):
 
     class Config:
         use_enum_values = True
+        # Catalog rows are cached and shared between callers
+        frozen = True
 
 
 class FundPrice(BaseModel):
@@ -0,0 +1,239 @@
+"""Columnar NAV history.
+
+A HistoricalNav row is a pydantic model holding a date and three Decimals,
+several hundred bytes per row. NavSeries keeps a fund's history as parallel
+NumPy columns instead: int64 day numbers plus float64 unit NAV, accumulated
+NAV and daily change (NaN where missing), 32 bytes per row. Rows are sorted
+oldest first, so a date range is a binary search and every slice is a view
+sharing the parent's buffers. HistoricalNav rows are only built on demand,
+for display.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from fund_assistant.models.fund import HistoricalNav
+
+# Day numbers count from the datetime64[D] epoch, so `dates` is a free view
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def adjust_nav(nav: np.ndarray, change: np.ndarray) -> np.ndarray:
+    """复权净值 / Compound daily changes (in %) into a dividend-adjusted NAV path.
+
+    Args:
+        nav: Unit NAV, oldest first
+        change: Published daily change in percent, NaN where missing
+
+    Returns:
+        Adjusted NAV anchored to the oldest unit NAV
+    """
+    if len(nav) == 0:
+        return nav
+    growth = np.ones_like(nav)
+    growth[1:] = np.where(np.isnan(change[1:]), nav[1:] / nav[:-1], 1 + change[1:] / 100)
+    return nav[0] * np.cumprod(growth)
+
+
+def _decimal(value: float) -> Decimal | None:
+    """还原小数 / Shortest decimal that round-trips a float, None for NaN."""
+    return None if value != value else Decimal(repr(value))
+
+
+class NavSeries:
+    """列式净值序列 / A fund's NAV history as NumPy columns, oldest first."""
+
+    __slots__ = ("code", "days", "nav", "accumulated_nav", "daily_change")
+
+    def __init__(
+        self,
+        days: np.ndarray,
+        nav: np.ndarray,
+        accumulated_nav: np.ndarray | None = None,
+        daily_change: np.ndarray | None = None,
+        code: str = "",
+    ):
+        """Wrap existing columns without copying them.
+
+        Args:
+            days: Days since 1970-01-01 (int64), strictly increasing
+            nav: Unit NAV (float64)
+            accumulated_nav: Accumulated NAV (defaults to the unit NAV)
+            daily_change: Daily change in percent, NaN where missing
+            code: Fund code
+        """
+        self.code = code
+        self.days = np.asarray(days, dtype=np.int64)
+        self.nav = np.asarray(nav, dtype=np.float64)
+        self.accumulated_nav = (
+            self.nav if accumulated_nav is None else np.asarray(accumulated_nav, dtype=np.float64)
+        )
+        self.daily_change = (
+            np.full(len(self.nav), np.nan)
+            if daily_change is None
+            else np.asarray(daily_change, dtype=np.float64)
+        )
+
+    @classmethod
+    def empty(cls, code: str = "") -> "NavSeries":
+        """空序列 / A series without rows."""
+        return cls(np.empty(0, dtype=np.int64), np.empty(0), code=code)
+
+    @classmethod
+    def from_columns(
+        cls,
+        dates: Sequence[str] | np.ndarray,
+        nav: Sequence[float],
+        accumulated_nav: Sequence[float] | None = None,
+        daily_change: Sequence[float | None] | None = None,
+        code: str = "",
+    ) -> "NavSeries":
+        """从列构建 / Build from plain columns in any date order.
+
+        Args:
+            dates: ISO date strings or datetime64 values
+            nav: Unit NAV values (numbers or numeric strings)
+            accumulated_nav: Accumulated NAV values
+            daily_change: Daily change in percent, None or NaN where missing
+            code: Fund code
+
+        Returns:
+            NavSeries sorted oldest first
+        """
+        days = np.asarray(dates, dtype="datetime64[D]").view(np.int64)
+        columns = [
+            np.asarray(column, dtype=np.float64) if column is not None else None
+            for column in (nav, accumulated_nav, daily_change)
+        ]
+        if len(days) > 1 and not np.all(days[1:] > days[:-1]):
+            order = np.argsort(days, kind="stable")
+            days = days[order]
+            columns = [column[order] if column is not None else None for column in columns]
+        return cls(days, *columns, code=code)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[HistoricalNav], code: str = "") -> "NavSeries":
+        """从模型构建 / Build from HistoricalNav rows in any order."""
+        rows = list(rows)
+        if not rows:
+            return cls.empty(code)
+        return cls.from_columns(
+            [row.date.isoformat() for row in rows],
+            [float(row.nav) for row in rows],
+            [float(row.accumulated_nav) for row in rows],
+            [float(row.daily_change) if row.daily_change is not None else np.nan for row in rows],
+            code=code,
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return f"NavSeries({self.code!r}, empty)"
+        return f"NavSeries({self.code!r}, {len(self)} rows, {self.start} to {self.end})"
+
+    def __getitem__(self, key):
+        """切片或取行 / A slice is a NavSeries view; an integer is a HistoricalNav row."""
+        if isinstance(key, slice):
+            return NavSeries(
+                self.days[key],
+                self.nav[key],
+                self.accumulated_nav[key],
+                self.daily_change[key],
+                self.code,
+            )
+        return HistoricalNav(
+            date=date.fromordinal(int(self.days[key]) + EPOCH_ORDINAL),
+            nav=_decimal(float(self.nav[key])),
+            accumulated_nav=_decimal(float(self.accumulated_nav[key])),
+            daily_change=_decimal(float(self.daily_change[key])),
+        )
+
+    def __iter__(self) -> Iterator[HistoricalNav]:
+        """逐行迭代 / Yield HistoricalNav rows oldest first, built one at a time."""
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def dates(self) -> np.ndarray:
+        """日期视图 / Dates as a datetime64[D] view of the day numbers."""
+        return self.days.view("datetime64[D]")
+
+    @property
+    def start(self) -> date | None:
+        """首个日期 / Oldest date, None when empty."""
+        return date.fromordinal(int(self.days[0]) + EPOCH_ORDINAL) if len(self) else None
+
+    @property
+    def end(self) -> date | None:
+        """最新日期 / Newest date, None when empty."""
+        return date.fromordinal(int(self.days[-1]) + EPOCH_ORDINAL) if len(self) else None
+
+    @property
+    def nbytes(self) -> int:
+        """内存占用 / Bytes held by the columns (shared buffers counted once)."""
+        columns = (self.days, self.nav, self.accumulated_nav, self.daily_change)
+        return sum({id(column): column.nbytes for column in columns}.values())
+
+    def between(self, start: date | None = None, end: date | None = None) -> "NavSeries":
+        """日期区间 / Rows dated within [start, end], as a view.
+
+        Args:
+            start: First date to include (None for the beginning)
+            end: Last date to include (None for the end)
+        """
+        lo = (
+            int(np.searchsorted(self.days, start.toordinal() - EPOCH_ORDINAL, side="left"))
+            if start
+            else 0
+        )
+        hi = (
+            int(np.searchsorted(self.days, end.toordinal() - EPOCH_ORDINAL, side="right"))
+            if end
+            else len(self)
+        )
+        return self[lo:hi]
+
+    def trailing(self, years: float) -> "NavSeries":
+        """最近 N 年 / The trailing window of `years` before the newest date, as a view."""
+        if not len(self):
+            return self
+        first = self.days[-1] - round(years * 365)
+        return self[int(np.searchsorted(self.days, first, side="left")) :]
+
+    def tail(self, limit: int) -> "NavSeries":
+        """最近 N 条 / The newest `limit` rows, as a view."""
+        return self[max(len(self) - limit, 0) :]
+
+    def adjusted(self) -> np.ndarray:
+        """复权净值 / Dividend-adjusted NAV path (see `adjust_nav`)."""
+        return adjust_nav(self.nav, self.daily_change)
+
+    def rows(self, limit: int | None = None) -> list[HistoricalNav]:
+        """转换为模型 / The newest `limit` rows as HistoricalNav, newest first.
+
+        Matches the order of the upstream API and `NavStore.load`, for display.
+        """
+        series = self.tail(limit) if limit is not None else self
+        return [series[i] for i in range(len(series) - 1, -1, -1)]
+
+    def tolist(self) -> list[dict]:
+        """JSON 记录 / Rows as JSON-ready dicts, oldest first."""
+        return [
+            {
+                "date": day.isoformat(),
+                "nav": nav,
+                "accumulated_nav": accumulated,
+                "daily_change": None if change != change else change,
+            }
+            for day, nav, accumulated, change in zip(
+                self.dates.astype(object),
+                self.nav.tolist(),
+                self.accumulated_nav.tolist(),
+                self.daily_change.tolist(),
+            )
+        ]
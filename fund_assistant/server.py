@@ -0,0 +1,409 @@
+"""Local HTTP JSON API over FundService.
+
+`fund-assistant serve` keeps one FundService alive so agent integrations
+pay interpreter startup, catalog loading and TLS handshakes once instead of
+on every CLI call. The server is a small HTTP/1.1 implementation on top of
+`asyncio.start_server` (no web framework dependency) with keep-alive.
+
+Network I/O runs on the server's event loop through the service's pooled
+async client; CPU and SQLite work (metrics, backtests, search) runs in
+worker threads after the needed histories have been synced asynchronously.
+Identical requests that arrive while one is in flight share its result,
+and the API client coalesces identical upstream fetches across endpoints.
+Upstream failures answer 502, or 503 while eastmoney is throttling us or
+its circuit is open; batch endpoints report failed codes as null.
+
+Endpoints (GET with query parameters, or POST with a JSON object body;
+`codes` accepts a comma-separated string or a JSON list):
+
+    /health                      liveness, cache statistics and upstream circuit states
+    /funds?type=&hot=            fund list (list / hot)
+    /search?q=&limit=            fund search
+    /price/{code}                real-time estimate
+    /info/{code}                 fund detail
+    /holding/{code}              top holdings
+    /history/{code}?limit=       historical NAV, newest first
+    /calc/{code}?amount=&years=&freq=&mode=scenario|backtest|sweep|montecarlo&paths=
+    /prices?codes=               batch estimates
+    /infos?codes=                batch details
+    /holdings?codes=             batch holdings
+    /metrics?codes=&years=       risk metrics
+    /correlation?codes=&days=&matrix=correlation|covariance
+    /overlap?codes=&stock=&top=  holdings overlap, or holders of one stock
+    /prometheus                  stage latency histograms in the Prometheus text format
+
+Each endpoint call is timed under the `request` stage of the
+instrumentation registry, next to the upstream and service timings.
+"""
+
+import asyncio
+import json
+import sys
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from fund_assistant.api import CircuitOpenError, FundAPIError, RateLimitedError
+from fund_assistant.api.singleflight import SingleFlight
+from fund_assistant.instrumentation import default_registry
+from fund_assistant.services import FundService
+from fund_assistant.services.fund_service import skip_failures
+from fund_assistant.ui.serializer import to_jsonable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest request body accepted, in bytes
+MAX_BODY = 1 << 20
+
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_TIMEOUT = 30.0
+
+# Content type of text payloads (the Prometheus exposition format)
+TEXT_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class HTTPError(Exception):
+    """接口错误 / Error answered with an HTTP status and a JSON message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class FundServer:
+    """基金服务进程 / Long-lived JSON API around one FundService."""
+
+    def __init__(self, service: FundService | None = None):
+        """Initialize the server.
+
+        Args:
+            service: Shared service (defaults to a new FundService)
+        """
+        self.service = service or FundService()
+        self.flights = SingleFlight()
+        self.routes: dict[str, Callable[[dict, str | None], Awaitable]] = {
+            "health": self.health,
+            "funds": self.funds,
+            "search": self.search,
+            "price": self.price,
+            "info": self.info,
+            "holding": self.holding,
+            "history": self.history,
+            "calc": self.calc,
+            "prices": self.prices,
+            "infos": self.infos,
+            "holdings": self.holdings,
+            "metrics": self.metrics,
+            "correlation": self.correlation,
+            "overlap": self.overlap,
+            "prometheus": self.prometheus,
+        }
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready=None):
+        """运行服务 / Serve until cancelled.
+
+        Args:
+            host: Interface to bind
+            port: TCP port
+            ready: Optional callback receiving the bound (host, port)
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        if ready:
+            ready(server.sockets[0].getsockname()[:2])
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.service.api.aclose()
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """处理连接 / Serve requests on one keep-alive connection.
+
+        A malformed or oversized request head is answered with a 4xx and the
+        connection is closed, since the rest of the stream cannot be framed.
+        """
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(
+                        reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT
+                    )
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+                    return
+                except asyncio.LimitOverrunError:
+                    status = HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE
+                    await _respond(writer, status, {"error": "Request head too large"}, False)
+                    return
+
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    error = {"error": "Invalid Content-Length"}
+                    await _respond(writer, HTTPStatus.BAD_REQUEST, error, False)
+                    return
+
+                body = await reader.readexactly(length) if 0 < length <= MAX_BODY else b""
+                status, payload = await self.dispatch(request_line, body, length)
+
+                # An oversized body is left unread, so the connection cannot be reused
+                keep_alive = headers.get("connection", "").lower() != "close" and length <= MAX_BODY
+                await _respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+        finally:
+            writer.close()
+
+    async def dispatch(self, request_line: str, body: bytes, length: int = 0):
+        """分发请求 / Route one request and build the (status, payload) reply.
+
+        The payload is JSON-serializable, or a str sent as plain text.
+        """
+        try:
+            method, target, _ = request_line.split(" ", 2)
+            if method not in ("GET", "POST"):
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"Unsupported method {method}")
+            if length > MAX_BODY:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+
+            url = urlsplit(target)
+            params = dict(parse_qsl(url.query))
+            if body:
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+                if not isinstance(payload, dict):
+                    raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+                params.update(payload)
+
+            route, _, arg = url.path.strip("/").partition("/")
+            handler = self.routes.get(route)
+            if handler is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"Unknown endpoint /{route}")
+
+            key = (route, arg, json.dumps(params, sort_keys=True, default=str))
+            with default_registry().timer("request", route):
+                result = await self.flights.ado(key, lambda: handler(params, arg or None))
+            if result is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, "No data")
+            return HTTPStatus.OK, to_jsonable(result)
+        except HTTPError as e:
+            return e.status, {"error": e.message}
+        except (CircuitOpenError, RateLimitedError) as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}
+        except FundAPIError as e:
+            return HTTPStatus.BAD_GATEWAY, {"error": str(e)}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+
+    async def sync_histories(self, codes: list[str]):
+        """同步历史净值 / Bring NAV histories up to date on the server loop."""
+
+        async def sync(code: str):
+            try:
+                await self.flights.ado(
+                    ("sync", code), lambda: self.service.async_sync_history(code)
+                )
+            except Exception as e:
+                print(f"Error syncing history for {code}: {e}", file=sys.stderr)
+
+        await self.service.gather(sync, codes)
+
+    # Endpoints
+
+    async def health(self, params: dict, arg: str | None):
+        """健康检查 / Liveness and cache statistics."""
+        cache = self.service.cache
+        return {
+            "status": "ok",
+            "cache": cache.stats() if cache else None,
+            "upstream": self.service.api.resilience.states(),
+        }
+
+    async def prometheus(self, params: dict, arg: str | None):
+        """耗时指标 / Stage latency histograms for a Prometheus scrape."""
+        return default_registry().prometheus()
+
+    async def funds(self, params: dict, arg: str | None):
+        """基金列表 / Fund list, optionally only hot funds."""
+        fund_type = params.get("type") or None
+        if _flag(params.get("hot")):
+            return self.service.get_hot_funds(fund_type)
+        return self.service.get_fund_list(fund_type)
+
+    async def search(self, params: dict, arg: str | None):
+        """搜索基金 / Search funds by code, name or pinyin initials."""
+        keyword = params.get("q") or params.get("keyword") or arg
+        if not keyword:
+            raise ValueError("Missing search keyword q")
+        limit = int(params.get("limit", 20))
+        return await asyncio.to_thread(self.service.search_funds, keyword, limit)
+
+    async def price(self, params: dict, arg: str | None):
+        """实时估值 / Real-time estimate of one fund."""
+        return await self.service.api.aget_realtime_estimate(_code(params, arg))
+
+    async def info(self, params: dict, arg: str | None):
+        """基金详情 / Detail of one fund."""
+        return await self.service.api.aget_fund_detail(_code(params, arg))
+
+    async def holding(self, params: dict, arg: str | None):
+        """基金持仓 / Top holdings of one fund."""
+        return await self.service.api.aget_fund_holdings(_code(params, arg))
+
+    async def history(self, params: dict, arg: str | None):
+        """历史净值 / Stored NAV history, synced first."""
+        code = _code(params, arg)
+        limit = params.get("limit", 10)
+        await self.sync_histories([code])
+        return await asyncio.to_thread(
+            self.service.nav_store.load, code, int(limit) if limit else None
+        )
+
+    async def calc(self, params: dict, arg: str | None):
+        """定投计算 / DCA scenarios, backtest, sweep or Monte Carlo."""
+        code = _code(params, arg)
+        amount = float(params.get("amount", 1000))
+        years = int(params.get("years", 10))
+        frequency = params.get("freq") or params.get("frequency") or "monthly"
+        if frequency not in ("monthly", "weekly", "daily"):
+            raise ValueError("freq must be monthly/weekly/daily")
+
+        mode = params.get("mode", "scenario")
+        if mode == "scenario":
+            return self.service.calculate_dca(code, amount, years, frequency)
+
+        await self.sync_histories([code])
+        if mode == "backtest":
+            run = self.service.backtest_dca
+        elif mode == "sweep":
+            run = self.service.sweep_dca
+        elif mode == "montecarlo":
+            paths = int(params.get("paths", 10_000))
+            return await asyncio.to_thread(
+                self.service.simulate_dca, code, amount, years, frequency, paths
+            )
+        else:
+            raise ValueError("mode must be scenario/backtest/sweep/montecarlo")
+        return await asyncio.to_thread(run, code, amount, years, frequency)
+
+    async def prices(self, params: dict, arg: str | None):
+        """批量估值 / Estimates keyed by code."""
+        codes = _codes(params)
+        fetch = skip_failures(self.service.api.aget_realtime_estimate)
+        return dict(zip(codes, await self.service.gather(fetch, codes)))
+
+    async def infos(self, params: dict, arg: str | None):
+        """批量详情 / Details keyed by code."""
+        codes = _codes(params)
+        fetch = skip_failures(self.service.api.aget_fund_detail)
+        return dict(zip(codes, await self.service.gather(fetch, codes)))
+
+    async def holdings(self, params: dict, arg: str | None):
+        """批量持仓 / Holdings keyed by code."""
+        codes = _codes(params)
+        fetch = skip_failures(self.service.api.aget_fund_holdings)
+        return dict(zip(codes, await self.service.gather(fetch, codes)))
+
+    async def metrics(self, params: dict, arg: str | None):
+        """风险指标 / Risk metrics keyed by code."""
+        codes = _codes(params)
+        years = float(params["years"]) if params.get("years") else None
+        await self.sync_histories(codes)
+
+        def compute():
+            return [self.service.stored_metrics(code, years) for code in codes]
+
+        return dict(zip(codes, await asyncio.to_thread(compute)))
+
+    async def correlation(self, params: dict, arg: str | None):
+        """相关性矩阵 / Correlation or covariance matrix."""
+        codes = _codes(params)
+        days = int(params["days"]) if params.get("days") else None
+        matrix = params.get("matrix", "correlation")
+        if matrix not in ("correlation", "covariance"):
+            raise ValueError("matrix must be correlation/covariance")
+        await self.sync_histories(codes)
+        result = await asyncio.to_thread(self.service.stored_correlation, codes, days)
+        other = "covariance" if matrix == "correlation" else "correlation"
+        del result[other]
+        return result
+
+    async def overlap(self, params: dict, arg: str | None):
+        """持仓重合 / Overlap pairs, or the holders of one stock."""
+        codes = _codes(params)
+        fetch = skip_failures(self.service.api.aget_fund_holdings)
+        reports = await self.service.gather(fetch, codes)
+        index, failed = self.service.build_holdings_index(codes, reports)
+        if params.get("stock"):
+            stock = params["stock"]
+            return {"stock": stock, "holders": index.holders(stock), "failed": failed}
+        top = int(params.get("top", 20))
+        return {
+            "pairs": index.overlap_pairs(top),
+            "common_stocks": [
+                {"code": code, "name": name, "funds": count, "total_weight": total}
+                for code, name, count, total in index.common_stocks(top)
+            ],
+            "report_dates": dict(zip(index.codes, index.report_dates)),
+            "failed": failed,
+        }
+
+
+async def _respond(writer: asyncio.StreamWriter, status: HTTPStatus, payload, keep_alive: bool):
+    """写出响应 / Send one reply: a str as plain text, anything else as JSON."""
+    if isinstance(payload, str):
+        data, content_type = payload.encode(), TEXT_CONTENT_TYPE
+    else:
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        content_type = "application/json; charset=utf-8"
+    writer.write(
+        (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode()
+        + data
+    )
+    await writer.drain()
+
+
+def _code(params: dict, arg: str | None) -> str:
+    """单个代码参数 / Fund code from the path or the `code` parameter."""
+    code = arg or params.get("code")
+    if not code:
+        raise ValueError("Missing fund code")
+    return str(code)
+
+
+def _codes(params: dict) -> list[str]:
+    """多个代码参数 / Deduplicated fund codes from `codes` (list or comma string)."""
+    codes = params.get("codes") or []
+    if isinstance(codes, str):
+        codes = codes.split(",")
+    codes = [*dict.fromkeys(str(code).strip() for code in codes if str(code).strip())]
+    if not codes:
+        raise ValueError("Missing fund codes")
+    return codes
+
+
+def _flag(value) -> bool:
+    """布尔参数 / Interpret a query flag such as hot=1 or hot=true."""
+    return str(value).lower() in ("1", "true", "yes") if value is not None else False
@@ -1,5 +1,6 @@
 """Business logic services."""
 
 from fund_assistant.services.fund_service import FundService
+from fund_assistant.services.watchlist import load_watchlist
 
-__all__ = ["FundService"]
+__all__ = ["FundService", "load_watchlist"]
@@ -0,0 +1,270 @@
+"""Vectorized DCA backtest over a fund's real NAV path.
+
+Buys are scheduled on calendar targets (every day, every 7 days or the same
+day each month) and executed on the first trading day on or after each
+target. All arithmetic runs on NumPy arrays: one `searchsorted` maps every
+target of every start date to its trading day, so sweeping thousands of
+start dates costs a handful of array operations.
+"""
+
+import numpy as np
+
+from fund_assistant.models import HistoricalNav
+from fund_assistant.models.nav_series import NavSeries
+
+# Buys per year for each schedule, matching the scenario calculator
+PERIODS_PER_YEAR = {"monthly": 12, "weekly": 52, "daily": 250}
+
+DAYS_PER_YEAR = 365.0
+
+
+def nav_arrays(history: list[HistoricalNav]) -> tuple[np.ndarray, np.ndarray]:
+    """净值数组 / Dividend-adjusted NAV path from HistoricalNav rows.
+
+    The adjusted path compounds the published daily change, which already
+    accounts for dividends; days without a change fall back to the unit NAV
+    ratio. It is anchored to the oldest unit NAV. Callers holding a
+    NavSeries use its `dates` and `adjusted()` directly.
+
+    Args:
+        history: HistoricalNav rows in any order
+
+    Returns:
+        Tuple of (dates as datetime64[D], adjusted NAV as float64), oldest first
+    """
+    series = NavSeries.from_rows(history)
+    return series.dates, series.adjusted()
+
+
+def schedule_targets(starts: np.ndarray, periods: int, frequency: str) -> np.ndarray:
+    """定投目标日期 / Calendar buy targets for each start date.
+
+    Args:
+        starts: Start dates, datetime64[D] of shape (S,)
+        periods: Number of buys per start
+        frequency: monthly/weekly/daily
+
+    Returns:
+        datetime64[D] array of shape (S, periods)
+    """
+    k = np.arange(periods)
+    if frequency == "weekly":
+        return starts[:, None] + (7 * k).astype("timedelta64[D]")
+    if frequency == "daily":
+        return starts[:, None] + k.astype("timedelta64[D]")
+
+    # Same day of month, clamped to the month end (31st -> 28th/29th/30th)
+    months = starts.astype("datetime64[M]")
+    day_offset = starts - months.astype("datetime64[D]")
+    target_months = months[:, None] + k.astype("timedelta64[M]")
+    month_ends = (target_months + 1).astype("datetime64[D]") - 1
+    return np.minimum(target_months.astype("datetime64[D]") + day_offset[:, None], month_ends)
+
+
+def buy_indices(dates: np.ndarray, starts: np.ndarray, periods: int, frequency: str) -> np.ndarray:
+    """定投交易日 / Trading-day index of every scheduled buy.
+
+    Daily schedules buy on consecutive trading days; weekly and monthly ones
+    buy on the first trading day on or after each calendar target.
+
+    Returns:
+        int64 array of shape (S, periods); len(dates) marks buys past the data
+    """
+    if frequency == "daily":
+        first = np.searchsorted(dates, starts)
+        return np.minimum(first[:, None] + np.arange(periods), len(dates))
+    return np.searchsorted(dates, schedule_targets(starts, periods, frequency))
+
+
+def xirr(times: np.ndarray, flows: np.ndarray, iterations: int = 50) -> np.ndarray:
+    """内部收益率 / Annualized money-weighted return for many cash-flow rows at once.
+
+    Solves sum(flow * (1 + r) ** -t) = 0 per row with vectorized Newton steps,
+    starting from the rate that grows the total outflow into the total inflow
+    over the money-weighted holding period, which is usually within a few
+    iterations of the root.
+
+    Args:
+        times: Cash-flow times in years from the first flow, shape (S, K)
+        flows: Cash flows (negative for buys), shape (S, K); zeros are ignored
+        iterations: Newton iterations
+
+    Returns:
+        Annual rates of shape (S,); NaN where the solver did not converge
+    """
+    outflow = np.clip(-flows, 0, None)
+    inflow = np.clip(flows, 0, None)
+    out_total = outflow.sum(axis=1)
+    in_total = inflow.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        holding = (inflow * times).sum(axis=1) / in_total
+        holding -= (outflow * times).sum(axis=1) / out_total
+        rate = (in_total / out_total) ** (1 / np.maximum(holding, 1 / DAYS_PER_YEAR)) - 1
+    rate = np.clip(np.nan_to_num(rate, nan=0.1), -0.9999, 100.0)
+
+    for _ in range(iterations):
+        base = 1 + rate[:, None]
+        discount = base ** -times
+        npv = (flows * discount).sum(axis=1)
+        slope = (-times * flows * discount / base).sum(axis=1)
+        step = np.divide(npv, slope, out=np.zeros_like(npv), where=slope != 0)
+        rate = np.clip(rate - step, -0.9999, 100.0)
+        if np.all(np.abs(step) < 1e-10):
+            break
+    npv = (flows * (1 + rate[:, None]) ** -times).sum(axis=1)
+    scale = np.abs(flows).sum(axis=1)
+    return np.where(np.abs(npv) <= 1e-6 * scale, rate, np.nan)
+
+
+def backtest_dca(
+    dates: np.ndarray,
+    nav: np.ndarray,
+    amount: float,
+    frequency: str = "monthly",
+    start: np.datetime64 | None = None,
+) -> dict:
+    """定投回测 / Simulate periodic buys from `start` to the last NAV.
+
+    Args:
+        dates: Trading dates, datetime64[D], oldest first
+        nav: NAV per date (ideally dividend-adjusted)
+        amount: Investment per buy
+        frequency: monthly/weekly/daily
+        start: First buy target (defaults to the first date)
+
+    Returns:
+        Dictionary with units, cost basis, final value, XIRR and the fund's
+        NAV drawdowns from the first buy
+    """
+    if len(dates) < 2:
+        raise ValueError("At least two NAV points are required for a backtest")
+
+    start = dates[0] if start is None else np.datetime64(start, "D")
+    end = dates[-1]
+    span_years = (end - start).astype(np.int64) / DAYS_PER_YEAR
+    periods = int(np.ceil(span_years * PERIODS_PER_YEAR[frequency])) + 1
+
+    idx = buy_indices(dates, np.array([start]), periods, frequency)[0]
+    idx = idx[idx < len(dates)]
+    if frequency == "daily":
+        idx = np.unique(idx)
+    if len(idx) == 0:
+        raise ValueError("No buy dates fall inside the NAV history")
+
+    units_per_buy = amount / nav[idx]
+    units = units_per_buy.sum()
+    total_invest = amount * len(idx)
+    final_value = units * nav[-1]
+
+    # Drawdowns of the fund's NAV from the first buy onward. The plan's value
+    # divided by units held is just the NAV, and new contributions move neither
+    first = idx[0]
+    held_nav = nav[first:]
+    drawdown = held_nav / np.maximum.accumulate(held_nav) - 1
+    trough = int(np.argmin(drawdown))
+
+    times = np.append(dates[idx] - dates[first], end - dates[first]).astype(np.int64)
+    flows = np.append(np.full(len(idx), -amount), final_value)
+    irr = xirr(times[None, :] / DAYS_PER_YEAR, flows[None, :])[0]
+
+    profit = final_value - total_invest
+    return {
+        "mode": "backtest",
+        "amount": amount,
+        "frequency": frequency,
+        "start_date": str(dates[first]),
+        "end_date": str(end),
+        "periods": int(len(idx)),
+        "total_invest": round(total_invest, 2),
+        "units": round(float(units), 4),
+        "cost_basis": round(total_invest / float(units), 4),
+        "final_nav": round(float(nav[-1]), 4),
+        "final_value": round(float(final_value), 2),
+        "profit": round(float(profit), 2),
+        "return_rate": round(float(profit / total_invest) * 100, 2),
+        "irr": None if np.isnan(irr) else round(float(irr) * 100, 2),
+        "max_drawdown": round(float(drawdown[trough]) * 100, 2),
+        "max_drawdown_date": str(dates[first + trough]),
+        "drawdown_path": [
+            (str(day), round(float(dd) * 100, 2))
+            for day, dd in zip(dates[idx], drawdown[idx - first])
+        ],
+    }
+
+
+def sweep_start_dates(
+    dates: np.ndarray,
+    nav: np.ndarray,
+    amount: float,
+    years: int,
+    frequency: str = "monthly",
+) -> dict:
+    """滚动起点回测 / Backtest a `years`-long plan from every possible start date.
+
+    Every trading day that leaves a full horizon of data is a start. Final
+    values and XIRRs for all starts are computed as (S, K) matrices.
+
+    Args:
+        dates: Trading dates, datetime64[D], oldest first
+        nav: NAV per date (ideally dividend-adjusted)
+        amount: Investment per buy
+        years: Plan length in years
+        frequency: monthly/weekly/daily
+
+    Returns:
+        Dictionary with the distribution of outcomes across start dates
+    """
+    horizon = np.timedelta64(int(round(years * DAYS_PER_YEAR)), "D")
+    starts = dates[dates + horizon <= dates[-1]]
+    if len(starts) == 0:
+        raise ValueError(f"NAV history is shorter than {years} years")
+
+    periods = years * PERIODS_PER_YEAR[frequency]
+    idx = buy_indices(dates, starts, periods, frequency)
+    ends = np.searchsorted(dates, starts + horizon, side="right") - 1
+    valid = idx <= ends[:, None]
+
+    safe_idx = np.where(valid, idx, 0)
+    units = np.where(valid, amount / nav[safe_idx], 0.0)
+    buys = valid.sum(axis=1)
+    invested = amount * buys
+    final_value = units.sum(axis=1) * nav[ends]
+    returns = final_value / invested - 1
+
+    first = safe_idx[:, :1]
+    times = np.where(valid, (dates[safe_idx] - dates[first]).astype(np.int64), 0)
+    end_times = (dates[ends] - dates[first[:, 0]]).astype(np.int64)
+    irr = xirr(
+        np.column_stack([times, end_times]) / DAYS_PER_YEAR,
+        np.column_stack([np.where(valid, -amount, 0.0), final_value]),
+    )
+
+    best, worst = int(np.argmax(returns)), int(np.argmin(returns))
+    # XIRR may not converge for some starts; None when it converged for none
+    solved = irr[np.isfinite(irr)]
+    return {
+        "mode": "sweep",
+        "amount": amount,
+        "years": years,
+        "frequency": frequency,
+        "starts": int(len(starts)),
+        "first_start": str(starts[0]),
+        "last_start": str(starts[-1]),
+        "loss_probability": round(float((returns < 0).mean()) * 100, 2),
+        "return_rate": {
+            "min": round(float(returns[worst]) * 100, 2),
+            "median": round(float(np.median(returns)) * 100, 2),
+            "max": round(float(returns[best]) * 100, 2),
+        },
+        "irr": (
+            {
+                "min": round(float(solved.min()) * 100, 2),
+                "median": round(float(np.median(solved)) * 100, 2),
+                "max": round(float(solved.max()) * 100, 2),
+            }
+            if len(solved)
+            else None
+        ),
+        "best_start": str(starts[best]),
+        "worst_start": str(starts[worst]),
+    }
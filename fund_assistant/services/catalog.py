@@ -0,0 +1,327 @@
+"""Compact columnar fund catalog.
+
+The catalog stores one column per field instead of one dict per fund. Fund
+type and risk level are kept as one byte each, indexing the shared enum
+members, and the whole catalog is saved as a single binary file that loads
+without re-parsing the source list.
+"""
+
+import csv
+import hashlib
+import json
+import pickle
+import re
+from array import array
+from pathlib import Path
+
+from fund_assistant.models import FundBasic, FundType, RiskLevel
+from fund_assistant.services.search_index import pinyin_initials
+
+# Column codes index into these tuples, so every row shares the enum members
+FUND_TYPES = tuple(FundType)
+RISK_LEVELS = tuple(RiskLevel)
+_TYPE_INDEX = {fund_type: i for i, fund_type in enumerate(FUND_TYPES)}
+_RISK_INDEX = {risk: i for i, risk in enumerate(RISK_LEVELS)}
+
+# Bumped whenever the binary layout changes
+CATALOG_VERSION = 1
+
+# Upstream type labels (e.g. "混合型-灵活") by prefix, checked in order
+_TYPE_LABELS = (
+    ("QDII", FundType.QDII),
+    ("指数", FundType.INDEX),
+    ("股票", FundType.STOCK),
+    ("混合", FundType.HYBRID),
+    ("FOF", FundType.HYBRID),
+    ("债券", FundType.BOND),
+    ("货币", FundType.MONEY),
+    ("理财", FundType.MONEY),
+)
+
+# Full-market lists carry no risk rating, so approximate one from the type
+DEFAULT_RISK = {
+    FundType.STOCK: RiskLevel.HIGH,
+    FundType.HYBRID: RiskLevel.MEDIUM_HIGH,
+    FundType.BOND: RiskLevel.LOW,
+    FundType.INDEX: RiskLevel.MEDIUM_HIGH,
+    FundType.MONEY: RiskLevel.VERY_LOW,
+    FundType.QDII: RiskLevel.HIGH,
+}
+
+# eastmoney fundcode_search.js rows: ["000001","HXCZHH","华夏成长混合","混合型-灵活","..."]
+_EASTMONEY_ROW = re.compile(r'\["(\d{6})","([^"]*)","([^"]*)","([^"]*)"')
+
+
+def parse_fund_type(label: str) -> FundType | None:
+    """解析基金类型 / Map an enum value or upstream label to a FundType."""
+    label = label.strip()
+    try:
+        return FundType(label.lower())
+    except ValueError:
+        pass
+    for prefix, fund_type in _TYPE_LABELS:
+        if label.startswith(prefix):
+            return fund_type
+    return None
+
+
+def parse_risk_level(label: str) -> RiskLevel | None:
+    """解析风险等级 / Map a RiskLevel value to its member, None if unknown."""
+    try:
+        return RiskLevel(label.strip())
+    except ValueError:
+        return None
+
+
+class FundCatalog:
+    """基金目录 / Columnar catalog of funds.
+
+    Rows are addressed by position; `basic(position)` materializes a
+    FundBasic only when a caller needs one.
+    """
+
+    def __init__(
+        self,
+        codes: list[str],
+        names: list[str],
+        initials: list[str],
+        fund_types: array,
+        risk_levels: array,
+        hot: array,
+        fingerprint: str,
+    ):
+        self.codes = codes
+        self.names = names
+        self.initials = initials
+        self.fund_types = fund_types
+        self.risk_levels = risk_levels
+        self.hot = hot
+        self.fingerprint = fingerprint
+        # Source rows left out by `from_records`
+        self.skipped = 0
+        self._type_positions: dict[int, list[int]] | None = None
+        self._code_positions: dict[str, int] | None = None
+        self._basics: dict[int, FundBasic] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def from_records(cls, records) -> "FundCatalog":
+        """从记录构建 / Build a catalog from dicts.
+
+        Each record needs `code`, `name` and `fund_type`; `risk_level`,
+        `initials` and `hot` are optional. Records that are not dicts, lack a
+        name, have an unknown type or risk level or a code that is not six
+        digits are skipped and counted in `skipped`. Later duplicates of a
+        code replace earlier ones.
+
+        Args:
+            records: Iterable of fund dicts
+
+        Returns:
+            FundCatalog instance
+        """
+        rows: dict[str, tuple] = {}
+        skipped = 0
+        for record in records:
+            if not isinstance(record, dict):
+                skipped += 1
+                continue
+            code = str(record.get("code") or "").strip()
+            name = " ".join(str(record.get("name") or "").split())
+            fund_type = parse_fund_type(str(record.get("fund_type") or ""))
+            risk = record.get("risk_level")
+            if risk:
+                risk_level = parse_risk_level(str(risk))
+            else:
+                risk_level = DEFAULT_RISK.get(fund_type)
+            if (
+                fund_type is None
+                or risk_level is None
+                or not name
+                or len(code) != 6
+                or not code.isdigit()
+            ):
+                skipped += 1
+                continue
+            rows[code] = (
+                name,
+                (record.get("initials") or pinyin_initials(name)).lower(),
+                _TYPE_INDEX[fund_type],
+                _RISK_INDEX[risk_level],
+                1 if record.get("hot") else 0,
+            )
+
+        digest = hashlib.sha1()
+        for code, (name, _, type_index, risk_index, hot) in rows.items():
+            digest.update(f"{code}\t{name}\t{type_index}{risk_index}{hot}\n".encode())
+
+        columns = list(zip(*rows.values())) or [(), (), (), (), ()]
+        catalog = cls(
+            codes=list(rows),
+            names=list(columns[0]),
+            initials=list(columns[1]),
+            fund_types=array("B", columns[2]),
+            risk_levels=array("B", columns[3]),
+            hot=array("B", columns[4]),
+            fingerprint=digest.hexdigest(),
+        )
+        catalog.skipped = skipped
+        return catalog
+
+    @classmethod
+    def from_file(cls, path: str | Path, curated: "FundCatalog | None" = None) -> "FundCatalog":
+        """导入基金列表文件 / Import a fund list file.
+
+        Supported formats, chosen by extension:
+        - `.js`: eastmoney full-market list (`fundcode_search.js`)
+        - `.csv`: header row with code,name,fund_type[,risk_level,hot]
+        - `.json`: a list of records, or records grouped by category like funds.json
+
+        Args:
+            path: Source file
+            curated: Catalog whose risk levels and hot flags override the import
+
+        Returns:
+            FundCatalog instance
+
+        Raises:
+            ValueError: If the file is not valid JSON, or not a list of records
+        """
+        path = Path(path)
+        text = path.read_text(encoding="utf-8-sig")
+        suffix = path.suffix.lower()
+
+        if suffix == ".js":
+            records = [
+                {"code": code, "initials": initials, "name": name, "fund_type": label}
+                for code, initials, name, label in _EASTMONEY_ROW.findall(text)
+            ]
+        elif suffix == ".csv":
+            records = list(csv.DictReader(text.splitlines()))
+            for record in records:
+                record["hot"] = str(record.get("hot", "")).lower() in ("1", "true", "yes")
+        else:
+            try:
+                data = json.loads(text)
+            except ValueError as e:
+                raise ValueError(f"{path.name} is not valid JSON: {e}") from e
+            if isinstance(data, dict):
+                data = [
+                    item
+                    for category in data.values()
+                    if isinstance(category, list)
+                    for item in category
+                ]
+            if not isinstance(data, list):
+                raise ValueError(f"{path.name} must hold a list of fund records")
+            records = data
+
+        if curated is not None:
+            overrides = {
+                curated.codes[i]: (RISK_LEVELS[curated.risk_levels[i]].value, curated.hot[i])
+                for i in range(len(curated))
+            }
+            for record in records:
+                if isinstance(record, dict) and record.get("code") in overrides:
+                    record["risk_level"], record["hot"] = overrides[record["code"]]
+
+        return cls.from_records(records)
+
+    def save(self, path: str | Path):
+        """保存二进制目录 / Write the catalog to a binary file.
+
+        Codes are fixed width and stored as one string; names and initials are
+        newline-joined; the enum and flag columns are raw bytes.
+        """
+        payload = {
+            "version": CATALOG_VERSION,
+            "fingerprint": self.fingerprint,
+            "codes": "".join(self.codes),
+            "names": "\n".join(self.names),
+            "initials": "\n".join(self.initials),
+            "fund_types": self.fund_types.tobytes(),
+            "risk_levels": self.risk_levels.tobytes(),
+            "hot": self.hot.tobytes(),
+        }
+        path = Path(path)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "FundCatalog":
+        """读取二进制目录 / Load a catalog written by `save`.
+
+        Raises:
+            ValueError: If the file was written by an incompatible version
+        """
+        with open(path, "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("version") != CATALOG_VERSION:
+            raise ValueError(f"Unsupported catalog version: {payload.get('version')}")
+
+        codes = payload["codes"]
+        count = len(payload["fund_types"])
+        width = len(codes) // count if count else 0
+        return cls(
+            codes=[codes[i : i + width] for i in range(0, len(codes), width)] if count else [],
+            names=payload["names"].split("\n") if count else [],
+            initials=payload["initials"].split("\n") if count else [],
+            fund_types=array("B", payload["fund_types"]),
+            risk_levels=array("B", payload["risk_levels"]),
+            hot=array("B", payload["hot"]),
+            fingerprint=payload["fingerprint"],
+        )
+
+    def positions(self, fund_type: str | None = None, hot_only: bool = False) -> list[int]:
+        """筛选行号 / Positions of funds matching a type and/or the hot flag.
+
+        Args:
+            fund_type: FundType value to filter by (None for all)
+            hot_only: Only include hot funds
+
+        Returns:
+            Positions in catalog order; empty for an unknown fund type
+        """
+        if fund_type:
+            try:
+                type_index = _TYPE_INDEX[FundType(fund_type)]
+            except ValueError:
+                return []
+            if self._type_positions is None:
+                self._type_positions = {}
+                for position, index in enumerate(self.fund_types):
+                    self._type_positions.setdefault(index, []).append(position)
+            positions = self._type_positions.get(type_index, [])
+        else:
+            positions = range(len(self))
+
+        if hot_only:
+            hot = self.hot
+            return [position for position in positions if hot[position]]
+        return list(positions)
+
+    def position(self, code: str) -> int | None:
+        """按代码查找行号 / Position of a fund code, None if it is not listed."""
+        if self._code_positions is None:
+            self._code_positions = {code: i for i, code in enumerate(self.codes)}
+        return self._code_positions.get(code)
+
+    def basic(self, position: int) -> FundBasic:
+        """基金基本信息 / FundBasic for one catalog row, built once and then shared.
+
+        Rows never change and FundBasic is frozen, so one instance per row
+        serves every listing and search.
+        """
+        basic = self._basics.get(position)
+        if basic is None:
+            basic = self._basics[position] = FundBasic(
+                code=self.codes[position],
+                name=self.names[position],
+                fund_type=FUND_TYPES[self.fund_types[position]],
+                risk_level=RISK_LEVELS[self.risk_levels[position]],
+            )
+        return basic
@@ -0,0 +1,102 @@
+"""Cross-fund return correlation and covariance.
+
+Histories are aligned without per-pair work: one `np.unique` over every
+fund's dates builds the shared calendar, one `searchsorted` per fund places
+its NAV on that calendar, gaps are forward-filled with one cumulative max,
+and the matrices come from a single pass over the resulting (T, N) return
+array. The calendar is capped to the most recent `days` trading days, so
+memory stays at T x N floats however long the histories are.
+"""
+
+import numpy as np
+
+from fund_assistant.services.metrics import TRADING_DAYS
+
+# Default number of most recent trading days to align on
+DEFAULT_DAYS = 250
+
+# Funds quoting on fewer than this share of the window are left out, so one
+# young fund cannot shrink the common calendar for everyone else
+MIN_COVERAGE = 0.9
+
+
+def align_navs(
+    series: list[tuple[np.ndarray, np.ndarray]], days: int = DEFAULT_DAYS
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """对齐净值 / Place many NAV series on a shared recent trading calendar.
+
+    The calendar is the union of all funds' dates. Funds quoting on too few
+    of them are dropped; the rest carry their last NAV over missing days.
+
+    Args:
+        series: (dates, NAV) array pairs, oldest first, one per fund
+        days: Window length in trading days
+
+    Returns:
+        Tuple of (calendar dates, NAV matrix of shape (T, K), indexes of the K
+        funds kept in the input order)
+    """
+    if not series:
+        return np.array([], dtype="datetime64[D]"), np.empty((0, 0)), np.array([], dtype=int)
+
+    calendar = np.unique(np.concatenate([dates for dates, _ in series]))[-days:]
+    grid = np.full((len(calendar), len(series)), np.nan)
+    for column, (dates, nav) in enumerate(series):
+        positions = np.searchsorted(calendar, dates)
+        inside = (positions < len(calendar)) & (dates >= calendar[0])
+        inside[inside] &= calendar[positions[inside]] == dates[inside]
+        grid[positions[inside], column] = nav[inside]
+
+    quoted = ~np.isnan(grid)
+    kept = np.flatnonzero(quoted.mean(axis=0) >= MIN_COVERAGE)
+    grid, quoted = grid[:, kept], quoted[:, kept]
+
+    # Carry the last NAV over days a fund did not publish (e.g. QDII holidays),
+    # then drop the leading days before every kept fund has quoted once
+    last_quote = np.maximum.accumulate(
+        np.where(quoted, np.arange(len(calendar))[:, None], 0), axis=0
+    )
+    grid = grid[last_quote, np.arange(len(kept))]
+    common = ~np.isnan(grid).any(axis=1)
+    return calendar[common], grid[common], kept
+
+
+def correlation_matrix(
+    series: list[tuple[np.ndarray, np.ndarray]], days: int = DEFAULT_DAYS
+) -> dict:
+    """相关性矩阵 / Daily return correlation and annualized covariance.
+
+    Args:
+        series: (dates, NAV) array pairs, oldest first, one per fund
+        days: Window length in trading days
+
+    Funds whose NAV does not move over the window (e.g. money-market funds
+    quoting a constant NAV) have no defined correlation; they are left out
+    of the matrices and listed in `flat`.
+
+    Returns:
+        Dictionary with the kept and flat fund indexes, date range,
+        observation count, correlation and covariance matrices (NumPy arrays)
+
+    Raises:
+        ValueError: If fewer than two funds share enough trading dates
+    """
+    dates, navs, kept = align_navs(series, days)
+    if len(kept) < 2 or len(dates) < 3:
+        raise ValueError("At least two funds with overlapping NAV history are required")
+
+    returns = navs[1:] / navs[:-1] - 1
+    varying = np.ptp(returns, axis=0) > 0
+    flat = kept[~varying]
+    kept, returns = kept[varying], returns[:, varying]
+    if len(kept) < 2:
+        raise ValueError("At least two funds with moving NAVs are required for a correlation")
+    return {
+        "kept": kept,
+        "flat": flat,
+        "start_date": str(dates[0]),
+        "end_date": str(dates[-1]),
+        "observations": int(len(returns)),
+        "correlation": np.corrcoef(returns, rowvar=False),
+        "covariance": np.cov(returns, rowvar=False) * TRADING_DAYS,
+    }
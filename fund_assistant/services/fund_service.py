@@ -1,35 +1,190 @@
 """Fund query and analysis service."""
 
-import json
-from decimal import Decimal
+import asyncio
+import os
+import pickle
+import sys
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+from functools import cached_property
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fund_assistant.api import TianTianAPI
-from fund_assistant.models import (
-    FundBasic, 
-    FundPrice, 
-    FundType, 
-    HistoricalNav, 
-    RiskLevel,
-    FundDetail,
-    FundHolding
-)
+from fund_assistant.api import FundAPIError, FundCache, TianTianAPI
+from fund_assistant.config import data_home
+from fund_assistant.instrumentation import instrumented
+from fund_assistant.models import FundBasic, FundDetail, FundHolding, FundPrice, HistoricalNav
+from fund_assistant.services.catalog import FundCatalog
+from fund_assistant.services.search_index import FundSearchIndex
+from fund_assistant.storage import NavStore
 
+if TYPE_CHECKING:
+    from fund_assistant.models.nav_series import NavSeries
+    from fund_assistant.services.overlap import HoldingsIndex
 
+# Default number of requests a batch keeps in flight at once
+DEFAULT_CONCURRENCY = 8
+
+# A fund synced more recently than this is served from the store without a request
+SYNC_INTERVAL = timedelta(hours=1)
+
+# Curated fund list shipped with the package
+BUNDLED_FUNDS = Path(__file__).parent.parent / "data" / "funds.json"
+
+# Imported full-market catalog, relative to the data home
+CATALOG_FILE = "catalog.bin"
+
+
+def skip_failures(fetch: Callable[[str], Awaitable], default=None) -> Callable[[str], Awaitable]:
+    """批量容错 / Wrap a per-code fetch so an API error yields `default` instead of raising.
+
+    One fund failing (or its host being circuit broken) should not sink the
+    rest of a batch; the error is reported on stderr and the slot is filled
+    with `default`.
+    """
+
+    async def run(code: str):
+        try:
+            return await fetch(code)
+        except FundAPIError as e:
+            print(f"Error fetching {code}: {e}", file=sys.stderr)
+            return default
+
+    return run
+
+
+def default_cache() -> FundCache | None:
+    """默认缓存 / Build the cache selected by FUND_ASSISTANT_CACHE.
+
+    `disk` (default) adds an on-disk tier shared across processes,
+    `memory` keeps only the in-process LRU and `off` disables caching.
+    """
+    mode = os.environ.get("FUND_ASSISTANT_CACHE", "disk").lower()
+    if mode == "off":
+        return None
+    if mode == "memory":
+        return FundCache()
+    return FundCache(disk_path=data_home() / "cache.sqlite3")
+
+
+@instrumented("service")
 class FundService:
-    """基金查询服务 / Fund Query Service"""
+    """基金查询服务 / Fund Query Service
+
+    The API client, cache, NAV store and fund catalog are built on first access,
+    so commands that only need some of them do not pay for the rest.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        nav_store: NavStore | None = None,
+        cache: FundCache | None = None,
+        api: TianTianAPI | None = None,
+    ):
+        """Initialize fund service.
+
+        Args:
+            concurrency: Maximum number of concurrent requests in batch methods
+            nav_store: Local NAV history store (defaults to the one in the data home)
+            cache: API response cache (defaults to `default_cache()`)
+            api: API client, e.g. one on a mock transport (defaults to a
+                TianTianAPI using `cache`)
+        """
+        self.concurrency = concurrency
+        self._cache = cache
+        self._nav_store = nav_store
+        self._api = api
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """释放资源 / Close the API client and NAV store this service opened."""
+        if "api" in self.__dict__ and self._api is None:
+            self.api.close()
+        if "nav_store" in self.__dict__ and self._nav_store is None:
+            self.nav_store.close()
+
+    @cached_property
+    def cache(self) -> FundCache | None:
+        """接口缓存 / API response cache."""
+        return self._cache if self._cache is not None else default_cache()
+
+    @cached_property
+    def api(self) -> TianTianAPI:
+        """接口客户端 / TianTian API client."""
+        return self._api or TianTianAPI(cache=self.cache)
+
+    @cached_property
+    def nav_store(self) -> NavStore:
+        """本地净值库 / Local NAV history store."""
+        return self._nav_store or NavStore()
+
+    @cached_property
+    def catalog(self) -> FundCatalog:
+        """基金目录 / Imported full-market catalog, else the bundled fund list."""
+        imported = data_home() / CATALOG_FILE
+        if imported.exists():
+            try:
+                return FundCatalog.load(imported)
+            except (OSError, ValueError, pickle.UnpicklingError) as e:
+                print(f"Error loading catalog {imported}: {e}", file=sys.stderr)
+        return FundCatalog.from_file(BUNDLED_FUNDS)
+
+    @cached_property
+    def search_index(self) -> FundSearchIndex:
+        """搜索索引 / Search index over the catalog, cached on disk."""
+        catalog = self.catalog
+        return FundSearchIndex.load_or_build(
+            catalog.codes,
+            catalog.names,
+            data_home() / "search_index.pkl",
+            initials=catalog.initials,
+            fingerprint=catalog.fingerprint,
+        )
+
+    def import_catalog(self, path: str | Path) -> FundCatalog:
+        """导入全市场基金列表 / Import a full-market fund list as the catalog.
+
+        Risk levels and hot flags of the bundled curated funds are kept for
+        codes present in both lists.
 
-    def __init__(self):
-        """Initialize fund service."""
-        self.api = TianTianAPI()
-        self._load_fund_data()
+        Args:
+            path: Fund list file (see FundCatalog.from_file for formats)
+
+        Returns:
+            The imported catalog, which later services load from the data home
+
+        Raises:
+            ValueError: If the file cannot be read as a fund list or holds no
+                valid fund (the current catalog is then kept)
+        """
+        catalog = FundCatalog.from_file(path, curated=FundCatalog.from_file(BUNDLED_FUNDS))
+        if not len(catalog):
+            raise ValueError(f"No valid fund records in {Path(path).name}")
+        catalog.save(data_home() / CATALOG_FILE)
+        self.__dict__.pop("search_index", None)
+        self.catalog = catalog
+        return catalog
 
     def get_fund_detail(self, code: str) -> FundDetail | None:
-        """获取基金详细信息 / Get fund detail."""
+        """获取基金详细信息 / Get fund detail.
+
+        Raises:
+            FundAPIError: If the upstream request fails
+        """
         return self.api.get_fund_detail(code)
 
     def get_fund_holdings(self, code: str) -> FundHolding | None:
-        """获取基金持仓 / Get fund holdings."""
+        """获取基金持仓 / Get fund holdings.
+
+        Raises:
+            FundAPIError: If the upstream request fails
+        """
         return self.api.get_fund_holdings(code)
 
     def compare_funds(self, codes: list[str]) -> list[FundDetail]:
@@ -41,18 +196,112 @@ class FundService:
         Returns:
             List of FundDetail objects
         """
-        results = []
-        for code in codes:
-            detail = self.get_fund_detail(code)
-            if detail:
-                results.append(detail)
-        return results
+        return [detail for detail in self.get_fund_details(codes) if detail]
+
+    def get_fund_details(
+        self, codes: list[str], concurrency: int | None = None
+    ) -> list[FundDetail | None]:
+        """批量获取基金详情 / Get fund details for many codes concurrently.
+
+        Args:
+            codes: List of fund codes
+            concurrency: Maximum requests in flight (defaults to the service setting)
+
+        Returns:
+            One entry per input code, in input order; None where the fetch failed
+        """
+        return self._run_batch(skip_failures(self.api.aget_fund_detail), codes, concurrency)
 
-    def _load_fund_data(self):
-        """加载基金静态数据 / Load static fund data."""
-        data_file = Path(__file__).parent.parent / "data" / "funds.json"
-        with open(data_file, "r", encoding="utf-8") as f:
-            self.fund_data = json.load(f)
+    def get_fund_holdings_batch(
+        self, codes: list[str], concurrency: int | None = None
+    ) -> list[FundHolding | None]:
+        """批量获取基金持仓 / Get fund holdings for many codes concurrently.
+
+        Args:
+            codes: List of fund codes
+            concurrency: Maximum requests in flight (defaults to the service setting)
+
+        Returns:
+            One entry per input code, in input order; None where the fetch failed
+        """
+        return self._run_batch(skip_failures(self.api.aget_fund_holdings), codes, concurrency)
+
+    def get_fund_prices(
+        self, codes: list[str], concurrency: int | None = None
+    ) -> list[FundPrice | None]:
+        """批量获取实时估值 / Get real-time estimates for many codes concurrently.
+
+        Args:
+            codes: List of fund codes
+            concurrency: Maximum requests in flight (defaults to the service setting)
+
+        Returns:
+            One entry per input code, in input order; None where the fetch failed
+        """
+        return self._run_batch(skip_failures(self.api.aget_realtime_estimate), codes, concurrency)
+
+    def get_histories(
+        self, codes: list[str], limit: int = 10, concurrency: int | None = None
+    ) -> list[list[HistoricalNav]]:
+        """批量获取历史净值 / Get historical NAV for many codes concurrently.
+
+        Args:
+            codes: List of fund codes
+            limit: Number of records per fund
+            concurrency: Maximum requests in flight (defaults to the service setting)
+
+        Returns:
+            One history list per input code, in input order; empty where the fetch failed
+        """
+
+        async def fetch(code: str) -> list[HistoricalNav]:
+            return await self.api.aget_historical_nav(code, limit)
+
+        return self._run_batch(skip_failures(fetch, []), codes, concurrency)
+
+    def _run_batch(
+        self,
+        fetch: Callable[[str], Awaitable],
+        codes: list[str],
+        concurrency: int | None = None,
+    ) -> list:
+        """在事件循环中执行批量请求 / Run a batch fetch to completion.
+
+        The async client is closed when the batch finishes because its
+        connection pool belongs to the event loop created for this call.
+        """
+
+        async def run() -> list:
+            try:
+                return await self.gather(fetch, codes, concurrency)
+            finally:
+                await self.api.aclose()
+
+        return asyncio.run(run())
+
+    async def gather(
+        self,
+        fetch: Callable[[str], Awaitable],
+        codes: list[str],
+        concurrency: int | None = None,
+    ) -> list:
+        """并发执行并保持顺序 / Fan out `fetch` over codes with bounded concurrency.
+
+        Args:
+            fetch: Coroutine function taking a fund code
+            codes: List of fund codes
+            concurrency: Maximum calls in flight (defaults to the service setting)
+
+        Returns:
+            Results in the same order as `codes`
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.concurrency))
+
+        async def run_one(code: str):
+            async with semaphore:
+                return await fetch(code)
+
+        return await asyncio.gather(*(run_one(code) for code in codes))
 
     def get_fund_list(self, fund_type: str | None = None) -> list[FundBasic]:
         """获取基金列表 / Get fund list.
@@ -63,34 +312,8 @@ class FundService:
         Returns:
             List of FundBasic objects
         """
-        funds = []
-
-        if fund_type:
-            # Filter by specific type
-            if fund_type in self.fund_data:
-                for item in self.fund_data[fund_type]:
-                    funds.append(
-                        FundBasic(
-                            code=item["code"],
-                            name=item["name"],
-                            fund_type=FundType(item["fund_type"]),
-                            risk_level=RiskLevel(item["risk_level"]),
-                        )
-                    )
-        else:
-            # Return all funds
-            for category in self.fund_data.values():
-                for item in category:
-                    funds.append(
-                        FundBasic(
-                            code=item["code"],
-                            name=item["name"],
-                            fund_type=FundType(item["fund_type"]),
-                            risk_level=RiskLevel(item["risk_level"]),
-                        )
-                    )
-
-        return funds
+        catalog = self.catalog
+        return [catalog.basic(position) for position in catalog.positions(fund_type)]
 
     def get_fund_price(self, code: str) -> FundPrice | None:
         """获取基金价格信息 / Get fund price information.
@@ -100,20 +323,260 @@ class FundService:
 
         Returns:
             FundPrice object or None if not found
+
+        Raises:
+            FundAPIError: If the upstream request fails
         """
         return self.api.get_realtime_estimate(code)
 
-    def get_history(self, code: str, limit: int = 10) -> list[HistoricalNav]:
+    def get_history(self, code: str, limit: int | None = 10) -> list[HistoricalNav]:
         """获取历史净值 / Get historical NAV.
 
+        Answers come from the local NAV store, which is brought up to date
+        first. If the sync fails the stored rows are still served.
+
+        Args:
+            code: Fund code
+            limit: Number of records (None for the full history)
+
+        Returns:
+            List of HistoricalNav objects, newest first
+        """
+        self._sync_quietly(code)
+        return self.nav_store.load(code, limit)
+
+    def sync_history(self, code: str, force: bool = False) -> int:
+        """增量同步历史净值 / Incrementally sync a fund's NAV into the local store.
+
+        Only rows newer than the latest stored date are requested, with later
+        pages prefetched concurrently. Pages are collected first and written
+        in one transaction, so an interrupted sync never leaves a gap behind
+        the stored high-water mark.
+
         Args:
             code: Fund code
-            limit: Number of records
+            force: Sync even if the fund was synced within SYNC_INTERVAL
 
         Returns:
-            List of HistoricalNav objects
+            Number of rows written
+
+        Raises:
+            FundAPIError: If any page request fails
         """
-        return self.api.get_historical_nav(code, limit)
+        if not force and self._is_fresh(code):
+            return 0
+
+        rows: list[HistoricalNav] = []
+        for chunk in self.api.iter_historical_nav(
+            code, start_date=self._sync_start(code), prefetch=self.concurrency
+        ):
+            rows.extend(chunk)
+
+        written = self.nav_store.upsert(code, rows)
+        self.nav_store.mark_synced(code)
+        return written
+
+    async def async_sync_history(self, code: str, force: bool = False) -> int:
+        """异步增量同步历史净值 / Async variant of `sync_history` for batches."""
+        if not force and self._is_fresh(code):
+            return 0
+
+        rows: list[HistoricalNav] = []
+        async for chunk in self.api.aiter_historical_nav(code, start_date=self._sync_start(code)):
+            rows.extend(chunk)
+
+        written = self.nav_store.upsert(code, rows)
+        self.nav_store.mark_synced(code)
+        return written
+
+    def sync_histories(
+        self, codes: list[str], force: bool = False, concurrency: int | None = None
+    ) -> list[int | None]:
+        """批量同步历史净值 / Sync many funds' NAV history concurrently.
+
+        Args:
+            codes: List of fund codes
+            force: Sync even funds synced within SYNC_INTERVAL
+            concurrency: Maximum funds syncing at once (defaults to the service setting)
+
+        Returns:
+            Rows written per input code, in input order; None where the sync failed
+        """
+
+        async def fetch(code: str) -> int | None:
+            try:
+                return await self.async_sync_history(code, force)
+            except Exception as e:
+                print(f"Error syncing history for {code}: {e}", file=sys.stderr)
+                return None
+
+        return self._run_batch(fetch, codes, concurrency)
+
+    def _is_fresh(self, code: str) -> bool:
+        """是否刚同步过 / Whether the fund was synced within SYNC_INTERVAL."""
+        synced_at = self.nav_store.synced_at(code)
+        return bool(synced_at and datetime.now() - synced_at < SYNC_INTERVAL)
+
+    def _sync_start(self, code: str) -> date | None:
+        """增量起始日 / First date missing from the store, None for a full sync."""
+        latest = self.nav_store.latest_date(code)
+        return latest + timedelta(days=1) if latest else None
+
+    def nav_series(self, code: str, years: float | None = None) -> "NavSeries":
+        """本地净值序列 / Stored NAV history as a columnar NavSeries, without syncing.
+
+        Args:
+            code: Fund code
+            years: Only keep the trailing window of this many years
+
+        Returns:
+            NavSeries, oldest first; a trimmed window is a view of the full history
+        """
+        series = self.nav_store.load_series(code)
+        return series.trailing(years) if years is not None else series
+
+    def history_series(self, code: str, years: float | None = None) -> "NavSeries":
+        """同步后的净值序列 / Bring a fund's history up to date, then return it as a NavSeries.
+
+        If the sync fails the stored rows are still served.
+        """
+        self._sync_quietly(code)
+        return self.nav_series(code, years)
+
+    def _sync_quietly(self, code: str):
+        """尽力同步 / Sync a fund's history, reporting a failure instead of raising."""
+        try:
+            self.sync_history(code)
+        except Exception as e:
+            print(f"Error syncing history for {code}: {e}", file=sys.stderr)
+
+    def get_metrics(self, code: str, years: float | None = None) -> dict | None:
+        """风险收益指标 / Risk and performance metrics from the NAV history.
+
+        Args:
+            code: Fund code
+            years: Trailing window in years (None for the full history)
+
+        Returns:
+            Metrics dictionary with the fund code, or None without enough history
+        """
+        self._sync_quietly(code)
+        return self.stored_metrics(code, years)
+
+    def get_metrics_batch(
+        self, codes: list[str], years: float | None = None, concurrency: int | None = None
+    ) -> list[dict | None]:
+        """批量计算风险收益指标 / Metrics for many funds.
+
+        Histories are synced concurrently first, then each fund's metrics are
+        computed from stored columns without building HistoricalNav models.
+
+        Args:
+            codes: List of fund codes
+            years: Trailing window in years (None for the full history)
+            concurrency: Maximum funds syncing at once (defaults to the service setting)
+
+        Returns:
+            One metrics dictionary per input code, in input order; None without history
+        """
+        self.sync_histories(codes, concurrency=concurrency)
+        return [self.stored_metrics(code, years) for code in codes]
+
+    def stored_metrics(self, code: str, years: float | None = None) -> dict | None:
+        """从本地库计算指标 / Metrics for one fund from the NAV store, without syncing."""
+        from fund_assistant.services.metrics import compute_metrics
+
+        series = self.nav_series(code, years)
+        if len(series) < 2:
+            return None
+        metrics = compute_metrics(series.dates, series.adjusted())
+        return {"code": code, "name": self._fund_name(code), **metrics}
+
+    def get_correlation(
+        self, codes: list[str], days: int | None = None, concurrency: int | None = None
+    ) -> dict:
+        """相关性矩阵 / Return correlation and covariance across many funds.
+
+        Args:
+            codes: List of fund codes
+            days: Window of most recent common trading days
+            concurrency: Maximum funds syncing at once (defaults to the service setting)
+
+        Returns:
+            Dictionary with the funds kept (codes, names), the funds left out for
+            lack of history (excluded) or a constant NAV (flat), the date range
+            and the matrices as NumPy arrays
+
+        Raises:
+            ValueError: If fewer than two funds share enough trading dates
+        """
+        self.sync_histories(codes, concurrency=concurrency)
+        return self.stored_correlation(codes, days)
+
+    def stored_correlation(self, codes: list[str], days: int | None = None) -> dict:
+        """从本地库计算相关性 / `get_correlation` over the NAV store, without syncing."""
+        from fund_assistant.services.correlation import DEFAULT_DAYS, correlation_matrix
+        from fund_assistant.services.metrics import TRADING_DAYS
+
+        days = days or DEFAULT_DAYS
+        # Load a little more than the window; holidays make a year longer than 250 days
+        years = days / TRADING_DAYS + 0.1
+        series = [self.nav_series(code, years) for code in codes]
+        result = correlation_matrix([(s.dates, s.adjusted()) for s in series], days)
+
+        kept = [codes[i] for i in result.pop("kept")]
+        flat = [codes[i] for i in result.pop("flat")]
+        included = {*kept, *flat}
+        return {
+            "codes": kept,
+            "names": [self._fund_name(code) for code in kept],
+            "excluded": [code for code in codes if code not in included],
+            "flat": flat,
+            **result,
+        }
+
+    def get_holdings_index(
+        self, codes: list[str], concurrency: int | None = None
+    ) -> tuple["HoldingsIndex", list[str]]:
+        """持仓反向索引 / Reverse stock→fund index over many funds' holdings.
+
+        Reports are fetched concurrently; each is cached until the next
+        quarterly report date, so rebuilding the index for the same book is
+        served from the cache.
+
+        Args:
+            codes: List of fund codes
+            concurrency: Maximum requests in flight (defaults to the service setting)
+
+        Returns:
+            Tuple of (HoldingsIndex over the funds with holdings, codes that failed)
+        """
+        return self.build_holdings_index(codes, self.get_fund_holdings_batch(codes, concurrency))
+
+    def build_holdings_index(
+        self, codes: list[str], reports: list[FundHolding | None]
+    ) -> tuple["HoldingsIndex", list[str]]:
+        """构建持仓索引 / Index fetched reports, setting aside funds without holdings.
+
+        The holdings endpoint does not return fund names, so they are filled
+        in from the catalog.
+        """
+        from fund_assistant.services.overlap import HoldingsIndex
+
+        usable = [bool(report and report.top_stocks) for report in reports]
+        index = HoldingsIndex(
+            [
+                report.model_copy(update={"name": self._fund_name(report.code) or report.name})
+                for report, ok in zip(reports, usable)
+                if ok
+            ]
+        )
+        return index, [code for code, ok in zip(codes, usable) if not ok]
+
+    def _fund_name(self, code: str) -> str:
+        """目录中的基金名称 / Fund name from the catalog, empty if unlisted."""
+        position = self.catalog.position(code)
+        return self.catalog.names[position] if position is not None else ""
 
     def get_hot_funds(self, fund_type: str | None = None) -> list[FundBasic]:
         """获取热门基金 / Get hot funds.
@@ -124,63 +587,111 @@ class FundService:
         Returns:
             List of hot FundBasic objects
         """
-        funds = []
-
-        if fund_type:
-            if fund_type in self.fund_data:
-                for item in self.fund_data[fund_type]:
-                    if item.get("hot", False):
-                        funds.append(
-                            FundBasic(
-                                code=item["code"],
-                                name=item["name"],
-                                fund_type=FundType(item["fund_type"]),
-                                risk_level=RiskLevel(item["risk_level"]),
-                            )
-                        )
-        else:
-            for category in self.fund_data.values():
-                for item in category:
-                    if item.get("hot", False):
-                        funds.append(
-                            FundBasic(
-                                code=item["code"],
-                                name=item["name"],
-                                fund_type=FundType(item["fund_type"]),
-                                risk_level=RiskLevel(item["risk_level"]),
-                            )
-                        )
-
-        return funds
-
-    def search_funds(self, keyword: str) -> list[FundBasic]:
+        catalog = self.catalog
+        return [
+            catalog.basic(position)
+            for position in catalog.positions(fund_type, hot_only=True)
+        ]
+
+    def search_funds(self, keyword: str, limit: int | None = 20) -> list[FundBasic]:
         """搜索基金 / Search funds.
 
         Args:
-            keyword: Search keyword (code or name)
+            keyword: Search keyword (code prefix, name fragment or pinyin initials)
+            limit: Maximum number of results (None for all)
 
         Returns:
-            List of matching FundBasic objects
+            List of matching FundBasic objects, best match first
         """
-        keyword_lower = keyword.lower()
-        results = []
+        catalog = self.catalog
+        return [catalog.basic(position) for position in self.search_index.search(keyword, limit)]
 
-        for category in self.fund_data.values():
-            for item in category:
-                if (
-                    keyword_lower in item["code"].lower()
-                    or keyword_lower in item["name"].lower()
-                ):
-                    results.append(
-                        FundBasic(
-                            code=item["code"],
-                            name=item["name"],
-                            fund_type=FundType(item["fund_type"]),
-                            risk_level=RiskLevel(item["risk_level"]),
-                        )
-                    )
+    def backtest_dca(
+        self, code: str, amount: float, years: int, frequency: str = "monthly"
+    ) -> dict:
+        """定投回测 / Backtest a DCA plan on the fund's real NAV path.
 
-        return results
+        Buys run over the most recent `years` years of history (or the whole
+        history if it is shorter) on the real trading dates.
+
+        Args:
+            code: Fund code
+            amount: Investment amount per period
+            years: Investment period in years
+            frequency: Investment frequency (monthly/weekly/daily)
+
+        Returns:
+            Dictionary with units, cost basis, final value, XIRR and drawdowns
+
+        Raises:
+            ValueError: If there is not enough NAV history
+        """
+        # NumPy is only needed by the analytics commands, keep it off the CLI startup path
+        import numpy as np
+
+        from fund_assistant.services.backtest import backtest_dca
+
+        series = self.history_series(code)
+        dates, nav = series.dates, series.adjusted()
+        if len(dates) < 2:
+            raise ValueError(f"Not enough NAV history for {code}")
+        start = max(dates[0], dates[-1] - np.timedelta64(round(years * 365), "D"))
+        result = backtest_dca(dates, nav, amount, frequency, start=start)
+        return {"code": code, "years": years, **result}
+
+    def sweep_dca(
+        self, code: str, amount: float, years: int, frequency: str = "monthly"
+    ) -> dict:
+        """滚动起点回测 / Backtest a DCA plan from every possible start date.
+
+        Args:
+            code: Fund code
+            amount: Investment amount per period
+            years: Investment period in years
+            frequency: Investment frequency (monthly/weekly/daily)
+
+        Returns:
+            Dictionary with the distribution of outcomes across start dates
+
+        Raises:
+            ValueError: If the NAV history is shorter than `years`
+        """
+        from fund_assistant.services.backtest import sweep_start_dates
+
+        series = self.history_series(code)
+        dates, nav = series.dates, series.adjusted()
+        return {"code": code, **sweep_start_dates(dates, nav, amount, years, frequency)}
+
+    def simulate_dca(
+        self,
+        code: str,
+        amount: float,
+        years: int,
+        frequency: str = "monthly",
+        paths: int = 10_000,
+        workers: int | None = None,
+    ) -> dict:
+        """蒙特卡洛定投模拟 / Monte Carlo DCA on bootstrapped historical returns.
+
+        Args:
+            code: Fund code
+            amount: Investment amount per period
+            years: Investment period in years
+            frequency: Investment frequency (monthly/weekly/daily)
+            paths: Number of simulated paths
+            workers: Worker processes (None to decide from the path count)
+
+        Returns:
+            Dictionary with P5/P50/P95 outcomes and the probability of loss
+
+        Raises:
+            ValueError: If there is not enough NAV history
+        """
+        from fund_assistant.services.montecarlo import simulate_dca
+
+        nav = self.history_series(code).adjusted()
+        result = simulate_dca(nav, amount, years, frequency, paths=paths, workers=workers)
+        return {"code": code, **result}
 
     def calculate_dca(
         self, code: str, amount: float, years: int, frequency: str = "monthly"
@@ -0,0 +1,169 @@
+"""Holdings overlap across funds.
+
+Top-10 holdings of many funds are flattened into one sparse (fund, stock,
+weight) table. Sorting it by stock gives a reverse index, so "which funds
+hold X" is a slice instead of a scan over every report, and a self-join on
+stock groups yields every fund pair that shares a stock. Pair scores (the
+sum over shared stocks of the smaller weight) are accumulated with one
+`bincount`, so only pairs that actually overlap are ever materialized.
+"""
+
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+
+from fund_assistant.models import FundHolding
+
+
+class Holder(NamedTuple):
+    """持有某只股票的基金 / A fund holding a given stock."""
+
+    code: str
+    name: str
+    weight: float
+    report_date: date
+
+
+class OverlapPair(NamedTuple):
+    """两只基金的重合度 / Overlap between two funds."""
+
+    code_a: str
+    code_b: str
+    score: float
+    shared: int
+
+
+class HoldingsIndex:
+    """持仓反向索引 / Reverse stock→fund index over many holdings reports.
+
+    Entries are stored as parallel arrays sorted by stock, with the offsets
+    of each stock's run kept alongside, in CSR fashion.
+    """
+
+    def __init__(self, holdings: list[FundHolding]):
+        """Build the index.
+
+        Args:
+            holdings: One FundHolding report per fund; a stock listed twice in
+                a report has its weights summed
+        """
+        self.codes = [holding.code for holding in holdings]
+        self.names = [holding.name for holding in holdings]
+        self.report_dates = [holding.report_date for holding in holdings]
+
+        stock_ids: dict[str, int] = {}
+        self.stock_names: list[str] = []
+        funds, stocks, weights = [], [], []
+        for fund, holding in enumerate(holdings):
+            for stock in holding.top_stocks:
+                if stock.code not in stock_ids:
+                    stock_ids[stock.code] = len(stock_ids)
+                    self.stock_names.append(stock.name)
+                funds.append(fund)
+                stocks.append(stock_ids[stock.code])
+                weights.append(float(stock.percentage))
+        self.stock_codes = list(stock_ids)
+        self._stock_ids = stock_ids
+        self._name_ids = {name: i for i, name in enumerate(self.stock_names)}
+
+        # Merge duplicate (fund, stock) entries, then order by stock
+        n_funds = max(len(holdings), 1)
+        keys, inverse = np.unique(
+            np.asarray(stocks, dtype=np.int64) * n_funds + np.asarray(funds, dtype=np.int64),
+            return_inverse=True,
+        )
+        self.entry_weights = np.bincount(inverse, weights=weights, minlength=len(keys))
+        self.entry_stocks, self.entry_funds = np.divmod(keys, n_funds)
+        self.offsets = np.searchsorted(self.entry_stocks, np.arange(len(self.stock_codes) + 1))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def holders(self, stock: str) -> list[Holder]:
+        """持有某股票的基金 / Funds holding a stock, heaviest first.
+
+        Args:
+            stock: Stock code or exact stock name
+
+        Returns:
+            Holders with their weight (% of NAV); empty if no fund holds it
+        """
+        stock_id = self._stock_ids.get(stock, self._name_ids.get(stock))
+        if stock_id is None:
+            return []
+        lo, hi = self.offsets[stock_id], self.offsets[stock_id + 1]
+        order = np.argsort(-self.entry_weights[lo:hi], kind="stable")
+        return [
+            Holder(
+                self.codes[fund],
+                self.names[fund],
+                round(float(weight), 2),
+                self.report_dates[fund],
+            )
+            for fund, weight in zip(
+                self.entry_funds[lo:hi][order], self.entry_weights[lo:hi][order]
+            )
+        ]
+
+    def common_stocks(self, limit: int = 10) -> list[tuple[str, str, int, float]]:
+        """最常见重仓股 / Stocks held by the most funds.
+
+        Returns:
+            (stock code, stock name, number of holders, summed weight) tuples
+        """
+        counts = np.diff(self.offsets)
+        totals = np.add.reduceat(self.entry_weights, self.offsets[:-1]) if len(counts) else counts
+        order = np.lexsort((-totals, -counts))[:limit]
+        return [
+            (self.stock_codes[i], self.stock_names[i], int(counts[i]), round(float(totals[i]), 2))
+            for i in order
+        ]
+
+    def overlap_matrix(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """重合度矩阵 / Sparse upper-triangular overlap scores.
+
+        The score of a pair is the sum over shared stocks of the smaller of
+        the two weights, i.e. the share of NAV both funds hold in common.
+
+        Returns:
+            Tuple of (row fund index, column fund index, score, shared stock
+            count), one entry per overlapping pair with row < column
+        """
+        sizes = np.diff(self.offsets)
+        # Each entry pairs with every entry of its stock group
+        group_start = np.repeat(self.offsets[:-1], sizes)
+        group_size = np.repeat(sizes, sizes)
+        left = np.repeat(np.arange(len(self.entry_funds)), group_size)
+        run_start = np.repeat(np.cumsum(group_size) - group_size, group_size)
+        right = np.repeat(group_start, group_size) + np.arange(len(left)) - run_start
+
+        upper = self.entry_funds[left] < self.entry_funds[right]
+        left, right = left[upper], right[upper]
+        n_funds = len(self.codes)
+        pair_keys, inverse = np.unique(
+            self.entry_funds[left] * n_funds + self.entry_funds[right], return_inverse=True
+        )
+        scores = np.bincount(
+            inverse,
+            weights=np.minimum(self.entry_weights[left], self.entry_weights[right]),
+            minlength=len(pair_keys),
+        )
+        shared = np.bincount(inverse, minlength=len(pair_keys))
+        rows, cols = np.divmod(pair_keys, n_funds)
+        return rows, cols, scores, shared
+
+    def overlap_pairs(self, limit: int | None = None) -> list[OverlapPair]:
+        """重合度排名 / Overlapping fund pairs, highest score first.
+
+        Args:
+            limit: Maximum number of pairs (None for all)
+        """
+        rows, cols, scores, shared = self.overlap_matrix()
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [
+            OverlapPair(
+                self.codes[rows[i]], self.codes[cols[i]], round(float(scores[i]), 2), int(shared[i])
+            )
+            for i in order
+        ]
@@ -0,0 +1,216 @@
+"""Prebuilt fund search index.
+
+Funds are matched on code, Chinese name and pinyin initials (e.g. "yfd" for
+易方达). Each searchable string is indexed by its character unigrams and
+bigrams, so a query only verifies the funds in the intersection of its
+posting lists instead of scanning the whole universe.
+"""
+
+import bisect
+import hashlib
+import pickle
+from pathlib import Path
+
+# GB2312 level-1 hanzi are ordered by pinyin; each entry is the first code
+# point whose reading starts with that letter (i, u and v never start one)
+_GB2312_INITIALS = (
+    (0xB0A1, "a"), (0xB0C5, "b"), (0xB2C1, "c"), (0xB4EE, "d"), (0xB6EA, "e"),
+    (0xB7A2, "f"), (0xB8C1, "g"), (0xB9FE, "h"), (0xBBF7, "j"), (0xBFA6, "k"),
+    (0xC0AC, "l"), (0xC2E8, "m"), (0xC4C3, "n"), (0xC5B6, "o"), (0xC5BE, "p"),
+    (0xC6DA, "q"), (0xC8BB, "r"), (0xC8F6, "s"), (0xCBFA, "t"), (0xCDDA, "w"),
+    (0xCEF4, "x"), (0xD1B9, "y"), (0xD4D1, "z"),
+)  # fmt: skip
+_GB2312_BOUNDS = [bound for bound, _ in _GB2312_INITIALS]
+_GB2312_LEVEL1_END = 0xD7F9
+
+# Polyphones whose reading in fund names differs from the GB2312 ordering
+_INITIAL_OVERRIDES = {"行": "h"}
+
+# Match tiers, best first
+_CODE_EXACT, _CODE_PREFIX, _NAME_EXACT, _NAME_PREFIX = 0, 1, 2, 3
+_INITIALS_PREFIX, _NAME_CONTAINS, _INITIALS_CONTAINS, _CODE_CONTAINS = 4, 5, 6, 7
+
+
+def char_initial(char: str) -> str:
+    """汉字拼音首字母 / Pinyin initial of one character.
+
+    ASCII letters and digits map to themselves (lowercased); hanzi outside
+    GB2312 level 1 and punctuation map to "".
+    """
+    if char.isascii():
+        return char.lower() if char.isalnum() else ""
+    if char in _INITIAL_OVERRIDES:
+        return _INITIAL_OVERRIDES[char]
+    try:
+        raw = char.encode("gb2312")
+    except UnicodeEncodeError:
+        return ""
+    point = raw[0] << 8 | raw[1]
+    if point < _GB2312_BOUNDS[0] or point > _GB2312_LEVEL1_END:
+        return ""
+    return _GB2312_INITIALS[bisect.bisect_right(_GB2312_BOUNDS, point) - 1][1]
+
+
+def pinyin_initials(text: str) -> str:
+    """拼音首字母串 / Pinyin initials of a name, e.g. 易方达消费行业 -> yfdxfhy."""
+    return "".join(char_initial(char) for char in text)
+
+
+def _grams(text: str) -> set[str]:
+    """一元与二元字串 / Character unigrams and bigrams of a string."""
+    grams = set(text)
+    grams.update(text[i : i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+class _GramIndex:
+    """N 元倒排索引 / Unigram + bigram inverted index over one field."""
+
+    def __init__(self, values: list[str]):
+        self.values = values
+        postings: dict[str, list[int]] = {}
+        for position, value in enumerate(values):
+            for gram in _grams(value):
+                postings.setdefault(gram, []).append(position)
+        self.postings = postings
+
+    def candidates(self, query: str) -> set[int]:
+        """候选集合 / Positions whose value contains every gram of the query."""
+        if len(query) == 1:
+            grams = [query]
+        else:
+            grams = sorted(
+                {query[i : i + 2] for i in range(len(query) - 1)},
+                key=lambda gram: len(self.postings.get(gram, ())),
+            )
+
+        result: set[int] | None = None
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if not posting:
+                return set()
+            result = set(posting) if result is None else result.intersection(posting)
+            if not result:
+                return set()
+        # Bigrams can co-occur without being adjacent, so confirm the substring
+        return {position for position in result if query in self.values[position]}
+
+
+class FundSearchIndex:
+    """基金搜索索引 / Search index over (code, name) entries.
+
+    Results are positions into the entry list the index was built from.
+    """
+
+    def __init__(self, codes: list[str], names: list[str], initials: list[str] | None = None):
+        """Build the index.
+
+        Args:
+            codes: Fund codes
+            names: Fund names, aligned with codes
+            initials: Pinyin initials, aligned with codes (derived from names if omitted)
+        """
+        self.codes = codes
+        self.names = [name.lower() for name in names]
+        self.initials = initials or [pinyin_initials(name) for name in names]
+        self._code_index = _GramIndex(self.codes)
+        self._name_index = _GramIndex(self.names)
+        self._initials_index = _GramIndex(self.initials)
+
+    def search(self, keyword: str, limit: int | None = 20) -> list[int]:
+        """搜索 / Rank entries matching a keyword.
+
+        Ordering: exact code, code prefix, exact name, name prefix, initials
+        prefix, name substring, initials substring, code substring; ties go
+        to the shorter name, then the lower code.
+
+        Args:
+            keyword: Code, name fragment or pinyin initials
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            Entry positions, best match first
+        """
+        query = keyword.strip().lower()
+        if not query:
+            return []
+
+        tiers: dict[int, int] = {}
+
+        def rank(position: int, tier: int):
+            if tier < tiers.get(position, _CODE_CONTAINS + 1):
+                tiers[position] = tier
+
+        if query.isdigit():
+            for position in self._code_index.candidates(query):
+                code = self.codes[position]
+                tier = (
+                    _CODE_EXACT
+                    if code == query
+                    else _CODE_PREFIX if code.startswith(query) else _CODE_CONTAINS
+                )
+                rank(position, tier)
+
+        for position in self._name_index.candidates(query):
+            name = self.names[position]
+            tier = (
+                _NAME_EXACT
+                if name == query
+                else _NAME_PREFIX if name.startswith(query) else _NAME_CONTAINS
+            )
+            rank(position, tier)
+
+        if query.isascii() and query.isalnum():
+            for position in self._initials_index.candidates(query):
+                initials = self.initials[position]
+                tier = _INITIALS_PREFIX if initials.startswith(query) else _INITIALS_CONTAINS
+                rank(position, tier)
+
+        ranked = sorted(tiers, key=lambda p: (tiers[p], len(self.names[p]), self.codes[p]))
+        return ranked if limit is None else ranked[:limit]
+
+    @staticmethod
+    def fingerprint(codes: list[str], names: list[str]) -> str:
+        """数据指纹 / Digest of the indexed entries, used to validate a cached index."""
+        digest = hashlib.sha1()
+        for code, name in zip(codes, names):
+            digest.update(f"{code}\t{name}\n".encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def load_or_build(
+        cls,
+        codes: list[str],
+        names: list[str],
+        cache_path: str | Path,
+        initials: list[str] | None = None,
+        fingerprint: str | None = None,
+    ) -> "FundSearchIndex":
+        """加载或构建索引 / Load the on-disk index if it matches the entries, else rebuild.
+
+        Args:
+            codes: Fund codes
+            names: Fund names, aligned with codes
+            cache_path: Pickle file holding the prebuilt index
+            initials: Pinyin initials, aligned with codes
+            fingerprint: Precomputed identity of the entries (hashed from them if omitted)
+
+        Returns:
+            FundSearchIndex instance
+        """
+        cache_path = Path(cache_path)
+        fingerprint = fingerprint or cls.fingerprint(codes, names)
+        try:
+            with open(cache_path, "rb") as f:
+                cached_fingerprint, index = pickle.load(f)
+            if cached_fingerprint == fingerprint:
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            pass
+
+        index = cls(codes, names, initials)
+        tmp_path = cache_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((fingerprint, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(cache_path)
+        return index
@@ -0,0 +1,162 @@
+"""Adaptive polling of real-time estimates for a live dashboard.
+
+Each fund keeps its own polling interval: it drops back to the minimum as
+soon as the fund's estimate moves and doubles (up to a cap) every poll it
+stays the same. Funds whose estimate rarely changes (bond and money funds,
+QDII funds during the A-share session, funds without estimates) therefore
+settle at the slow rate while active equity funds stay fresh. Nothing is
+polled outside trading sessions.
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from datetime import datetime
+
+from fund_assistant import market
+from fund_assistant.api import FundAPIError, TianTianAPI
+from fund_assistant.models import FundPrice
+from fund_assistant.services.fund_service import DEFAULT_CONCURRENCY
+
+# Fastest per-fund polling interval in seconds
+MIN_INTERVAL = 15.0
+
+# Slowest per-fund polling interval in seconds
+MAX_INTERVAL = 240.0
+
+# Longest single sleep while the market is closed, keeps the clock display current
+CLOSED_SLEEP = 60.0
+
+
+class EstimateWatcher:
+    """估值监控 / Poll real-time estimates for many funds on adaptive intervals.
+
+    The watcher owns an uncached API client: the shared estimate cache would
+    hide updates for its TTL. One async connection pool is reused for every
+    poll until `aclose`.
+    """
+
+    def __init__(
+        self,
+        codes: list[str],
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        api: TianTianAPI | None = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            codes: Fund codes in display order
+            min_interval: Fastest per-fund polling interval in seconds
+            max_interval: Slowest per-fund polling interval in seconds
+            concurrency: Maximum requests in flight per poll
+            api: API client (defaults to an uncached TianTianAPI)
+        """
+        self.codes = codes
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.api = api or TianTianAPI()
+        self.prices: dict[str, FundPrice | None] = dict.fromkeys(codes)
+        self.previous: dict[str, FundPrice | None] = dict.fromkeys(codes)
+        self.requests = 0
+        self.polls = 0
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._interval = dict.fromkeys(codes, min_interval)
+        self._due = dict.fromkeys(codes, 0.0)
+
+    def due_codes(self, now: float | None = None) -> list[str]:
+        """到期基金 / Codes whose next poll time has passed."""
+        now = time.monotonic() if now is None else now
+        return [code for code in self.codes if self._due[code] <= now]
+
+    def next_due(self, now: float | None = None) -> float:
+        """下次轮询等待 / Seconds until the next fund is due."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(self._due.values(), default=now) - now)
+
+    async def poll(self, codes: list[str] | None = None) -> set[str]:
+        """轮询一次 / Fetch due (or given) funds concurrently.
+
+        Args:
+            codes: Funds to fetch (defaults to the due ones)
+
+        Returns:
+            Codes whose estimate changed
+        """
+        codes = self.due_codes() if codes is None else codes
+
+        async def fetch(code: str) -> FundPrice | None:
+            async with self._semaphore:
+                try:
+                    return await self.api.aget_realtime_estimate(code)
+                except FundAPIError:
+                    # Treated like an unchanged estimate, so a failing fund backs off
+                    return None
+
+        results = await asyncio.gather(*(fetch(code) for code in codes))
+        self.requests += len(codes)
+        self.polls += 1
+
+        changed = set()
+        now = time.monotonic()
+        for code, price in zip(codes, results):
+            current = self.prices[code]
+            if price is not None and not _same_estimate(current, price):
+                changed.add(code)
+                self.previous[code] = current
+                self.prices[code] = price
+                self._interval[code] = self.min_interval
+            else:
+                self._interval[code] = min(self._interval[code] * 2, self.max_interval)
+            self._due[code] = now + self._interval[code]
+        return changed
+
+    async def run(self, on_update: Callable[[set[str], str], None]):
+        """持续监控 / Poll until cancelled, reporting after every poll.
+
+        Every fund is fetched once at start so the dashboard is filled even
+        when the market is closed.
+
+        Args:
+            on_update: Called with the changed codes and a status line
+        """
+        on_update(await self.poll(self.codes), self.status())
+        while True:
+            if not market.is_trading_time():
+                opens = market.next_market_open()
+                on_update(set(), self.status(opens))
+                wait = (opens - market.now_cn()).total_seconds()
+                await asyncio.sleep(min(max(wait, 1.0), CLOSED_SLEEP))
+                # Everyone is due again at the open
+                if market.is_trading_time():
+                    self._due = dict.fromkeys(self.codes, 0.0)
+                    self._interval = dict.fromkeys(self.codes, self.min_interval)
+                continue
+
+            await asyncio.sleep(self.next_due())
+            on_update(await self.poll(), self.status())
+
+    def status(self, opens: datetime | None = None) -> str:
+        """状态行 / One-line summary of the watcher state."""
+        clock = market.now_cn().strftime("%H:%M:%S")
+        if opens is not None:
+            return f"{clock} 休市，下次开盘 {opens:%m-%d %H:%M} / Market closed"
+        return (
+            f"{clock} 请求 {self.requests} 次 / requests  "
+            f"下次轮询 {self.next_due():.0f}s / next poll"
+        )
+
+    async def aclose(self):
+        """关闭连接池 / Release the async connection pool."""
+        await self.api.aclose()
+
+
+def _same_estimate(old: FundPrice | None, new: FundPrice) -> bool:
+    """估值是否未变 / Whether a fresh estimate repeats the previous one."""
+    return (
+        old is not None
+        and old.estimate_time == new.estimate_time
+        and old.estimate_value == new.estimate_value
+        and old.nav_date == new.nav_date
+    )
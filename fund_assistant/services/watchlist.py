@@ -0,0 +1,29 @@
+"""Watchlist file loading."""
+
+import re
+from pathlib import Path
+
+# Fund codes are six digits; anything else on a line is treated as a label
+_CODE_PATTERN = re.compile(r"\b(\d{6})\b")
+
+
+def load_watchlist(path: str | Path) -> list[str]:
+    """读取自选基金文件 / Load fund codes from a watchlist file.
+
+    One or more codes per line, separated by whitespace or commas. Text after
+    `#` is a comment, so lines like `110022  # 易方达消费行业` are allowed.
+    Duplicates are dropped while keeping first-seen order.
+
+    Args:
+        path: Watchlist file path
+
+    Returns:
+        List of fund codes
+    """
+    codes: dict[str, None] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            for code in _CODE_PATTERN.findall(line):
+                codes.setdefault(code, None)
+    return list(codes)
@@ -0,0 +1,5 @@
+"""Local persistent stores."""
+
+from fund_assistant.storage.nav_store import NavStore
+
+__all__ = ["NavStore"]
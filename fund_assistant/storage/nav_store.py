@@ -0,0 +1,179 @@
+"""SQLite-backed NAV history store."""
+
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from fund_assistant.config import data_home
+from fund_assistant.models import HistoricalNav
+
+if TYPE_CHECKING:
+    from fund_assistant.models.nav_series import NavSeries
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nav (
+    code TEXT NOT NULL,
+    date TEXT NOT NULL,
+    nav TEXT NOT NULL,
+    accumulated_nav TEXT NOT NULL,
+    daily_change TEXT,
+    PRIMARY KEY (code, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    code TEXT PRIMARY KEY,
+    synced_at TEXT NOT NULL
+);
+"""
+
+
+class NavStore:
+    """本地净值库 / Local NAV history store.
+
+    Rows are keyed by (fund code, date) and kept as decimal text so values
+    round-trip exactly. Reads return newest first, matching the upstream API.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        """Open (and create if needed) the store.
+
+        Args:
+            path: SQLite file path, defaults to `nav.sqlite3` in the data home
+        """
+        self.path = Path(path) if path else data_home() / "nav.sqlite3"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def latest_date(self, code: str) -> date | None:
+        """最新净值日期 / Most recent stored NAV date for a fund."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(date) FROM nav WHERE code = ?", (code,)
+            ).fetchone()
+        return date.fromisoformat(row[0]) if row and row[0] else None
+
+    def upsert(self, code: str, rows: list[HistoricalNav]) -> int:
+        """写入净值 / Insert or replace NAV rows for a fund.
+
+        Args:
+            code: Fund code
+            rows: HistoricalNav rows in any order
+
+        Returns:
+            Number of rows written
+        """
+        records = [
+            (
+                code,
+                row.date.isoformat(),
+                str(row.nav),
+                str(row.accumulated_nav),
+                str(row.daily_change) if row.daily_change is not None else None,
+            )
+            for row in rows
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO nav VALUES (?, ?, ?, ?, ?)", records
+            )
+        return len(records)
+
+    def load(
+        self,
+        code: str,
+        limit: int | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[HistoricalNav]:
+        """读取净值 / Read stored NAV rows, newest first.
+
+        Args:
+            code: Fund code
+            limit: Maximum number of rows (None for all)
+            start_date: Earliest date to include
+            end_date: Latest date to include
+
+        Returns:
+            List of HistoricalNav objects
+        """
+        sql = "SELECT date, nav, accumulated_nav, daily_change FROM nav WHERE code = ?"
+        params: list = [code]
+        if start_date:
+            sql += " AND date >= ?"
+            params.append(start_date.isoformat())
+        if end_date:
+            sql += " AND date <= ?"
+            params.append(end_date.isoformat())
+        sql += " ORDER BY date DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [
+            HistoricalNav(
+                date=date.fromisoformat(day),
+                nav=Decimal(nav),
+                accumulated_nav=Decimal(acc),
+                daily_change=Decimal(change) if change is not None else None,
+            )
+            for day, nav, acc, change in rows
+        ]
+
+    def load_series(self, code: str, start_date: date | None = None) -> "NavSeries":
+        """读取列式净值 / Read stored NAV as a NavSeries, oldest first.
+
+        Skips building HistoricalNav models for analytics that only need
+        floats; SQLite converts the decimal text while scanning.
+
+        Args:
+            code: Fund code
+            start_date: Earliest date to include
+
+        Returns:
+            NavSeries of the stored rows (empty if none)
+        """
+        from fund_assistant.models.nav_series import NavSeries
+
+        sql = (
+            "SELECT date, CAST(nav AS REAL), CAST(accumulated_nav AS REAL),"
+            " CAST(daily_change AS REAL) FROM nav WHERE code = ?"
+        )
+        params: list = [code]
+        if start_date:
+            sql += " AND date >= ?"
+            params.append(start_date.isoformat())
+        sql += " ORDER BY date"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        if not rows:
+            return NavSeries.empty(code)
+        return NavSeries.from_columns(*zip(*rows), code=code)
+
+    def synced_at(self, code: str) -> datetime | None:
+        """上次同步时间 / When the fund was last synced."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_at FROM sync_state WHERE code = ?", (code,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def mark_synced(self, code: str, when: datetime | None = None):
+        """记录同步时间 / Record a completed sync for a fund."""
+        when = when or datetime.now()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (code, when.isoformat())
+            )
+
+    def close(self):
+        """关闭数据库 / Close the database connection."""
+        with self._lock:
+            self._conn.close()
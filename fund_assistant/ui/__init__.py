@@ -1,5 +1,20 @@
-"""Terminal UI components."""
+"""Terminal UI components.
 
-from fund_assistant.ui.formatter import FundFormatter
+The Rich formatter is exported lazily so that machine-readable output
+(`fund_assistant.ui.serializer`) can be used without importing Rich.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fund_assistant.ui.formatter import FundFormatter
 
 __all__ = ["FundFormatter"]
+
+
+def __getattr__(name: str):
+    if name == "FundFormatter":
+        from fund_assistant.ui.formatter import FundFormatter
+
+        return FundFormatter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,15 @@
 """Rich formatter for terminal output."""
 
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
-from rich.console import Console
+from rich import box
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 
+from fund_assistant.instrumentation import instrumented
 from fund_assistant.models import (
     FundBasic, 
     FundPrice, 
@@ -15,13 +18,22 @@ from fund_assistant.models import (
     FundHolding
 )
 
+if TYPE_CHECKING:
+    from fund_assistant.services.overlap import Holder, HoldingsIndex
+    from fund_assistant.services.watcher import EstimateWatcher
 
+
+@instrumented("render")
 class FundFormatter:
     """格式化终端输出 / Terminal Output Formatter"""
+
+    # Largest fund set rendered as a full heatmap
+    HEATMAP_MAX = 10
     
     def __init__(self, console: Console | None = None):
         """Initialize formatter."""
         self.console = console or Console()
+        self._watch_rows: dict[str, tuple] = {}
 
     def display_fund_detail(self, detail: FundDetail):
         """显示基金详细信息 / Display fund details."""
@@ -164,6 +176,7 @@ class FundFormatter:
                 "bond": "债券型",
                 "index": "指数型",
                 "money": "货币型",
+                "qdii": "QDII",
             }
             table.add_row(
                 fund.code, fund.name, type_map.get(fund.fund_type, fund.fund_type), fund.risk_level
@@ -224,6 +237,393 @@ class FundFormatter:
         panel = Panel("\n".join(content), title=title, border_style="blue")
         self.console.print(panel)
 
+    def display_price_table(self, prices: list[FundPrice], failed: list[str] | None = None):
+        """显示多只基金估值 / Display estimates for many funds in one table.
+
+        Args:
+            prices: List of FundPrice objects
+            failed: Codes that could not be fetched
+        """
+        if not prices and not failed:
+            self.console.print("[red]❌ 无法获取基金数据 / Failed to fetch fund data[/red]")
+            return
+
+        if prices:
+            # Sort by estimate change, strongest first; funds without an estimate go last
+            ordered = sorted(
+                prices,
+                key=lambda p: (p.estimate_change is None, -(p.estimate_change or 0)),
+            )
+
+            table = Table(
+                title="💰 实时估值 / Real-time Estimates",
+                show_header=True,
+                header_style="bold cyan",
+            )
+            table.add_column("代码\nCode", style="cyan", width=8)
+            table.add_column("名称\nName", style="white", width=16)
+            table.add_column("估算净值\nEstimate", style="white", justify="right", width=8)
+            table.add_column("估算涨跌\nChange", justify="right", width=8)
+            table.add_column("单位净值\nNAV", style="white", justify="right", width=8)
+            table.add_column("估值时间\nTime", style="dim", width=11)
+
+            for fund_price in ordered:
+                if fund_price.estimate_change is not None:
+                    change_color = "green" if fund_price.estimate_change >= 0 else "red"
+                    change_str = (
+                        f"[{change_color}]{fund_price.estimate_change:+.2f}%[/{change_color}]"
+                    )
+                else:
+                    change_str = "---"
+
+                table.add_row(
+                    fund_price.code,
+                    fund_price.name,
+                    f"{fund_price.estimate_value:.4f}"
+                    if fund_price.estimate_value is not None
+                    else "---",
+                    change_str,
+                    f"{fund_price.nav:.4f}" if fund_price.nav is not None else "---",
+                    fund_price.estimate_time.strftime("%m-%d %H:%M")
+                    if fund_price.estimate_time
+                    else "---",
+                )
+
+            self.console.print(table)
+
+        if failed:
+            self.console.print(
+                f"[red]❌ 获取失败 / Failed ({len(failed)}): {', '.join(failed)}[/red]"
+            )
+
+    def display_metrics(self, results: list[dict], failed: list[str] | None = None):
+        """显示风险收益指标 / Display risk and performance metrics, one row per fund.
+
+        Args:
+            results: Metrics dictionaries in display order
+            failed: Codes without enough NAV history
+        """
+        if not results and not failed:
+            self.console.print("[red]❌ 无法获取基金数据 / Failed to fetch fund data[/red]")
+            return
+
+        def pct(value: float | None, colored: bool = False, digits: int = 1) -> str:
+            if value is None:
+                return "---"
+            if not colored:
+                return f"{value:.{digits}f}%"
+            color = "green" if value >= 0 else "red"
+            return f"[{color}]{value:+.{digits}f}%[/{color}]"
+
+        def num(value: float | None) -> str:
+            return f"{value:.2f}" if value is not None else "---"
+
+        if results:
+            table = Table(
+                title="📐 风险收益指标 / Risk Metrics",
+                show_header=True,
+                header_style="bold cyan",
+                box=box.SIMPLE_HEAD,
+                collapse_padding=True,
+                pad_edge=False,
+            )
+            table.add_column("代码\nCode", style="cyan", no_wrap=True)
+            table.add_column("名称\nName", style="white", ratio=1, no_wrap=True)
+            for header, style in [
+                ("年化\nAnnual", None),
+                ("波动\nVol", None),
+                ("回撤\nMaxDD", "red"),
+                ("夏普\nSharpe", None),
+                ("索提诺\nSortino", None),
+                ("卡玛\nCalmar", None),
+                ("近1年\n1Y", None),
+            ]:
+                table.add_column(header, justify="right", style=style, no_wrap=True)
+
+            for result in results:
+                rolling = result["rolling_1y"] or {}
+                table.add_row(
+                    result["code"],
+                    result["name"],
+                    pct(result["annual_return"], colored=True),
+                    pct(result["volatility"]),
+                    pct(result["max_drawdown"]),
+                    num(result["sharpe"]),
+                    num(result["sortino"]),
+                    num(result["calmar"]),
+                    pct(rolling.get("latest"), colored=True),
+                )
+
+            self.console.print(table)
+            if len(results) == 1:
+                result = results[0]
+                recovery = result["drawdown_recovery"] or "未修复 / not recovered"
+                self.console.print(
+                    f"[dim]区间 / Period: {result['start_date']} ~ {result['end_date']}\n"
+                    f"最大回撤 / Max drawdown: {result['drawdown_peak']} → "
+                    f"{result['drawdown_trough']} → {recovery} ({result['drawdown_days']} 天)[/dim]"
+                )
+                if rolling:
+                    self.console.print(
+                        f"[dim]滚动1年收益 / Rolling 1Y: 最低 {pct(rolling['min'], digits=2)}  "
+                        f"中位 {pct(rolling['median'], digits=2)}  "
+                        f"最高 {pct(rolling['max'], digits=2)}\n"
+                        f"正收益占比 / Positive share: {pct(rolling['positive'], digits=2)}[/dim]"
+                    )
+
+        if failed:
+            self.console.print(
+                f"[red]❌ 历史数据不足 / Not enough history ({len(failed)}): "
+                f"{', '.join(failed)}[/red]"
+            )
+
+    def display_correlation(self, result: dict, matrix: str = "correlation"):
+        """显示相关性热力图 / Display a correlation or covariance heatmap.
+
+        Small sets render as a colored matrix; larger ones list the most
+        correlated pairs, since hundreds of columns do not fit a terminal.
+
+        Args:
+            result: Result of FundService.get_correlation
+            matrix: "correlation" or "covariance"
+        """
+        import numpy as np
+
+        codes, values = result["codes"], result[matrix]
+        if matrix == "correlation":
+            title = "🔗 相关性 / Correlation"
+        else:
+            title = "🔗 协方差 (年化) / Annualized Covariance"
+
+        if len(codes) <= self.HEATMAP_MAX:
+            table = Table(
+                title=title, show_header=True, header_style="bold cyan", box=box.SIMPLE_HEAD
+            )
+            table.add_column("代码\nCode", style="cyan", no_wrap=True)
+            table.add_column("名称\nName", style="white", max_width=14, no_wrap=True)
+            for code in codes:
+                table.add_column(code, justify="right", no_wrap=True)
+
+            for code, name, row in zip(codes, result["names"], values):
+                if matrix == "correlation":
+                    cells = [f"[{self._heat_color(value)}]{value:.2f}[/]" for value in row]
+                else:
+                    cells = [f"{value:.4f}" for value in row]
+                table.add_row(code, name, *cells)
+            self.console.print(table)
+        else:
+            correlation = result["correlation"]
+            rows, cols = np.triu_indices(len(codes), k=1)
+            pair_values = correlation[rows, cols]
+            # Undefined (NaN) correlations sort last rather than first
+            ranked = np.where(np.isnan(pair_values), -np.inf, pair_values)
+            top = np.argsort(ranked)[::-1][: self.HEATMAP_MAX]
+
+            table = Table(
+                title="🔗 相关性最高的组合 / Most Correlated Pairs",
+                show_header=True,
+                header_style="bold cyan",
+            )
+            table.add_column("基金 A / Fund A", style="white")
+            table.add_column("基金 B / Fund B", style="white")
+            table.add_column("相关性\nCorr", justify="right")
+            for pair in top:
+                a, b = rows[pair], cols[pair]
+                table.add_row(
+                    f"{codes[a]} {result['names'][a]}",
+                    f"{codes[b]} {result['names'][b]}",
+                    f"[{self._heat_color(pair_values[pair])}]{pair_values[pair]:.2f}[/]",
+                )
+            self.console.print(table)
+            self.console.print(
+                f"[dim]共 {len(codes)} 只基金，完整矩阵请使用 --output json/csv"
+                f" / Use --output json/csv for the full {len(codes)}x{len(codes)} matrix[/dim]"
+            )
+
+        self.console.print(
+            f"[dim]区间 / Period: {result['start_date']} ~ {result['end_date']}"
+            f" ({result['observations']} 个交易日 / trading days)[/dim]"
+        )
+        if result["excluded"]:
+            self.console.print(
+                f"[yellow]⚠️ 历史数据不足，已排除 / Excluded for short history: "
+                f"{', '.join(result['excluded'])}[/yellow]"
+            )
+        if result.get("flat"):
+            self.console.print(
+                f"[yellow]⚠️ 净值无波动，已排除 / Excluded for a constant NAV: "
+                f"{', '.join(result['flat'])}[/yellow]"
+            )
+
+    @staticmethod
+    def _heat_color(value: float) -> str:
+        """相关性配色 / Heatmap color for a correlation coefficient."""
+        if value >= 0.8:
+            return "bold red"
+        if value >= 0.5:
+            return "yellow"
+        if value >= 0:
+            return "green"
+        return "cyan"
+
+    def display_overlap(
+        self, index: "HoldingsIndex", top: int = 10, failed: list[str] | None = None
+    ):
+        """显示持仓重合 / Display the most overlapping fund pairs and shared stocks.
+
+        Args:
+            index: HoldingsIndex over the analyzed funds
+            top: Number of pairs and stocks to show
+            failed: Codes without holdings data
+        """
+        if len(index) < 2:
+            self.console.print(
+                "[yellow]⚠️ 至少需要2只有持仓数据的基金 / Need 2+ funds with holdings[/yellow]"
+            )
+        else:
+            names = dict(zip(index.codes, index.names))
+            pairs = index.overlap_pairs(top)
+            table = Table(
+                title="🧩 持仓重合 / Holdings Overlap", show_header=True, header_style="bold cyan"
+            )
+            table.add_column("基金 A / Fund A", style="white")
+            table.add_column("基金 B / Fund B", style="white")
+            table.add_column("重合度\nOverlap", justify="right", style="yellow")
+            table.add_column("共同持股\nShared", justify="right")
+            for pair in pairs:
+                table.add_row(
+                    f"{pair.code_a} {names[pair.code_a]}",
+                    f"{pair.code_b} {names[pair.code_b]}",
+                    f"{pair.score:.2f}%",
+                    str(pair.shared),
+                )
+            if pairs:
+                self.console.print(table)
+            else:
+                self.console.print(
+                    "[green]✅ 前十大重仓无重合 / No overlap in top holdings[/green]"
+                )
+
+            stocks = Table(
+                title="📌 最常见重仓股 / Most Widely Held Stocks",
+                show_header=True,
+                header_style="bold cyan",
+            )
+            stocks.add_column("代码\nCode", style="cyan")
+            stocks.add_column("名称\nName", style="white")
+            stocks.add_column("持有基金数\nFunds", justify="right")
+            stocks.add_column("合计占比\nTotal %", justify="right")
+            for code, name, count, total in index.common_stocks(top):
+                stocks.add_row(code, name, str(count), f"{total:.2f}%")
+            self.console.print(stocks)
+
+            if len(set(index.report_dates)) > 1:
+                periods = ", ".join(sorted({str(day) for day in index.report_dates}))
+                self.console.print(f"[dim]报告期不一致 / Mixed report dates: {periods}[/dim]")
+
+        if failed:
+            self.console.print(
+                f"[red]❌ 无持仓数据 / No holdings ({len(failed)}): {', '.join(failed)}[/red]"
+            )
+
+    def display_stock_holders(
+        self, stock: str, holders: list["Holder"], failed: list[str] | None = None
+    ):
+        """显示持有某股票的基金 / Display the funds holding a stock.
+
+        Args:
+            stock: Stock code or name that was looked up
+            holders: Holders from HoldingsIndex.holders
+            failed: Codes without holdings data
+        """
+        if not holders:
+            self.console.print(f"[yellow]⚠️ 没有基金重仓 {stock} / No fund holds {stock}[/yellow]")
+        else:
+            table = Table(
+                title=f"📌 重仓 {stock} 的基金 / Funds Holding {stock}",
+                show_header=True,
+                header_style="bold cyan",
+            )
+            table.add_column("代码\nCode", style="cyan")
+            table.add_column("名称\nName", style="white")
+            table.add_column("占净值\nWeight", justify="right", style="yellow")
+            table.add_column("报告期\nReport", style="dim")
+            for holder in holders:
+                table.add_row(
+                    holder.code, holder.name, f"{holder.weight:.2f}%", str(holder.report_date)
+                )
+            self.console.print(table)
+
+        if failed:
+            self.console.print(
+                f"[red]❌ 无持仓数据 / No holdings ({len(failed)}): {', '.join(failed)}[/red]"
+            )
+
+    def render_watch(self, watcher: "EstimateWatcher", changed: set[str], status: str) -> Table:
+        """构建监控表格 / Build the live dashboard table.
+
+        Row cells are cached per fund and only rebuilt for funds in
+        `changed`; freshly updated rows are highlighted until the next poll.
+
+        Args:
+            watcher: EstimateWatcher holding the latest and previous estimates
+            changed: Codes updated by the last poll
+            status: Status line shown as the table caption
+
+        Returns:
+            Renderable table for rich.live.Live
+        """
+        table = Table(
+            title="👀 实时估值监控 / Live Estimates",
+            caption=status,
+            show_header=True,
+            header_style="bold cyan",
+            box=box.SIMPLE_HEAD,
+        )
+        table.add_column("代码\nCode", style="cyan", no_wrap=True)
+        table.add_column("名称\nName", style="white", max_width=16, no_wrap=True)
+        table.add_column("估算净值\nEstimate", justify="right", no_wrap=True)
+        table.add_column("估算涨跌\nChange", justify="right", no_wrap=True)
+        table.add_column("单位净值\nNAV", justify="right", no_wrap=True)
+        table.add_column("估值时间\nTime", style="dim", no_wrap=True)
+
+        for code in watcher.codes:
+            if code in changed or code not in self._watch_rows:
+                self._watch_rows[code] = self._watch_cells(
+                    code, watcher.prices[code], watcher.previous[code]
+                )
+            table.add_row(*self._watch_rows[code], style="bold" if code in changed else None)
+        return table
+
+    @staticmethod
+    def _watch_cells(code: str, price: FundPrice | None, previous: FundPrice | None) -> tuple:
+        """监控行 / Cells of one dashboard row, with a tick arrow against the last estimate."""
+        if price is None:
+            return (code, "---", "---", "---", "---", "---")
+
+        tick = ""
+        if (
+            previous is not None
+            and previous.estimate_value is not None
+            and price.estimate_value is not None
+            and price.estimate_value != previous.estimate_value
+        ):
+            tick = " ▲" if price.estimate_value > previous.estimate_value else " ▼"
+
+        if price.estimate_change is not None:
+            color = "green" if price.estimate_change >= 0 else "red"
+            change = f"[{color}]{price.estimate_change:+.2f}%{tick}[/{color}]"
+        else:
+            change = "---"
+        return (
+            code,
+            price.name,
+            f"{price.estimate_value:.4f}" if price.estimate_value is not None else "---",
+            change,
+            f"{price.nav:.4f}" if price.nav is not None else "---",
+            price.estimate_time.strftime("%m-%d %H:%M") if price.estimate_time else "---",
+        )
+
     def display_history(self, history: list[HistoricalNav], code: str = ""):
         """显示历史净值 / Display historical NAV.
 
@@ -286,6 +686,7 @@ class FundFormatter:
             "bond": "债券型",
             "index": "指数型",
             "money": "货币型",
+            "qdii": "QDII",
         }
 
         for fund in funds:
@@ -324,6 +725,7 @@ class FundFormatter:
             "bond": "债券型",
             "index": "指数型",
             "money": "货币型",
+            "qdii": "QDII",
         }
 
         for fund in results:
@@ -340,6 +742,16 @@ class FundFormatter:
         Args:
             result: Calculation result dictionary
         """
+        if result.get("mode") == "backtest":
+            self._display_backtest(result)
+            return
+        if result.get("mode") == "sweep":
+            self._display_sweep(result)
+            return
+        if result.get("mode") == "montecarlo":
+            self._display_montecarlo(result)
+            return
+
         title = f"🧮 定投计算器 / DCA Calculator - {result['code']}"
 
         content = []
@@ -372,3 +784,142 @@ class FundFormatter:
 
         panel = Panel("\n".join(content), title=title, border_style="green")
         self.console.print(panel)
+
+    def _display_backtest(self, result: dict):
+        """显示定投回测结果 / Display a DCA backtest on real NAV."""
+        title = f"🧮 定投回测 / DCA Backtest - {result['code']}"
+        profit_color = "green" if result["profit"] >= 0 else "red"
+        irr = f"{result['irr']:.2f}%" if result["irr"] is not None else "--"
+
+        content = [
+            "[bold]投资参数 / Investment Parameters[/bold]",
+            f"  每期金额: ¥{result['amount']:.2f}",
+            f"  定投频率: {result['frequency']}",
+            f"  回测区间: {result['start_date']} ~ {result['end_date']}",
+            f"  定投期数: {result['periods']}",
+            f"  总投入: [cyan]¥{result['total_invest']:,.2f}[/cyan]",
+            "",
+            "[bold]回测结果 / Backtest Result[/bold]",
+            f"  持有份额: {result['units']:,.4f}",
+            f"  平均成本: ¥{result['cost_basis']:.4f} (最新净值 ¥{result['final_nav']:.4f})",
+            f"  期末市值: [green]¥{result['final_value']:,.2f}[/green]",
+            f"  累计收益: [{profit_color}]¥{result['profit']:,.2f}[/{profit_color}]",
+            f"  收益率: [{profit_color}]{result['return_rate']:.2f}%[/{profit_color}]",
+            f"  年化收益 (XIRR): [blue]{irr}[/blue]",
+            f"  最大回撤: [red]{result['max_drawdown']:.2f}%[/red]"
+            f" ({result['max_drawdown_date']})",
+            "",
+            "[dim]💡 提示: 基于复权净值回测，历史收益不代表未来表现[/dim]",
+            "[dim]   Note: Backtested on adjusted NAV; past returns do not guarantee future[/dim]",
+        ]
+        panel = Panel("\n".join(content), title=title, border_style="green")
+        self.console.print(panel)
+
+    def _display_sweep(self, result: dict):
+        """显示滚动起点回测结果 / Display the outcome distribution over start dates."""
+        title = f"🧮 滚动回测 / Start-Date Sweep - {result['code']}"
+
+        table = Table(show_header=True, header_style="bold cyan", box=None)
+        table.add_column("指标 / Metric", style="cyan")
+        table.add_column("最差 / Worst", justify="right")
+        table.add_column("中位 / Median", justify="right")
+        table.add_column("最好 / Best", justify="right")
+        for label, key in [("收益率 / Return", "return_rate"), ("年化 / XIRR", "irr")]:
+            stats = result[key]
+            if stats is None:
+                table.add_row(label, "--", "--", "--")
+                continue
+            table.add_row(
+                label, f"{stats['min']:.2f}%", f"{stats['median']:.2f}%", f"{stats['max']:.2f}%"
+            )
+
+        content = Group(
+            f"[bold]投资参数 / Investment Parameters[/bold]\n"
+            f"  每期金额: ¥{result['amount']:.2f}  定投年限: {result['years']} 年"
+            f"  定投频率: {result['frequency']}\n"
+            f"  起投日: {result['first_start']} ~ {result['last_start']}"
+            f" (共 {result['starts']} 个 / starts)\n",
+            table,
+            f"\n  亏损概率 / Loss probability: [red]{result['loss_probability']:.2f}%[/red]\n"
+            f"  最佳起投日 / Best start: {result['best_start']}\n"
+            f"  最差起投日 / Worst start: {result['worst_start']}",
+        )
+        self.console.print(Panel(content, title=title, border_style="green"))
+
+    def _display_montecarlo(self, result: dict):
+        """显示蒙特卡洛模拟结果 / Display percentile bands of a Monte Carlo run."""
+        title = f"🧮 蒙特卡洛定投 / Monte Carlo DCA - {result['code']}"
+
+        table = Table(show_header=True, header_style="bold cyan", box=None)
+        table.add_column("分位 / Band", style="cyan")
+        table.add_column("期末价值 / Value", justify="right")
+        table.add_column("收益 / Profit", justify="right")
+        table.add_column("收益率 / Return", justify="right")
+        band_names = {"p5": "悲观 P5", "p50": "中位 P50", "p95": "乐观 P95"}
+        for key, band in result["percentiles"].items():
+            color = "green" if band["profit"] >= 0 else "red"
+            table.add_row(
+                band_names.get(key, key),
+                f"¥{band['future_value']:,.2f}",
+                f"[{color}]¥{band['profit']:,.2f}[/{color}]",
+                f"[{color}]{band['return_rate']:.2f}%[/{color}]",
+            )
+
+        content = Group(
+            f"[bold]投资参数 / Investment Parameters[/bold]\n"
+            f"  每期金额: ¥{result['amount']:.2f}  定投年限: {result['years']} 年"
+            f"  定投频率: {result['frequency']}\n"
+            f"  总投入: [cyan]¥{result['total_invest']:,.2f}[/cyan]\n"
+            f"  模拟路径: {result['paths']:,} (基于 {result['history_days']} 个交易日,"
+            f" {result['block']} 日区块 / day blocks)\n",
+            table,
+            f"\n  亏损概率 / Loss probability: [red]{result['loss_probability']:.2f}%[/red]",
+            "\n[dim]💡 提示: 模拟基于历史收益重抽样，不代表未来表现[/dim]\n"
+            "[dim]   Note: Resampled from past returns; not a forecast[/dim]",
+        )
+        self.console.print(Panel(content, title=title, border_style="green"))
+
+    def display_cache_stats(self, stats: dict):
+        """显示缓存统计 / Display cache statistics.
+
+        Args:
+            stats: Statistics from FundCache.stats()
+        """
+        content = [
+            f"  命中 / Hits: [green]{stats['hits']}[/green]",
+            f"  未命中 / Misses: [yellow]{stats['misses']}[/yellow]",
+            f"  命中率 / Hit rate: {stats['hit_rate'] * 100:.1f}%",
+            f"  内存条目 / Memory entries: {stats['memory_size']}",
+            f"  磁盘条目 / Disk entries: {stats['disk_size']}",
+        ]
+        panel = Panel("\n".join(content), title="🗄️ 缓存 / Cache", border_style="blue")
+        self.console.print(panel)
+
+    def display_profile(self, rows: list[dict], wall: float):
+        """显示耗时分解 / Display where a command spent its time.
+
+        Args:
+            rows: Stage statistics from Registry.snapshot()
+            wall: Seconds the whole command took
+        """
+        table = Table(title="⏱️ 耗时分解 / Profile (ms)", box=box.SIMPLE_HEAD)
+        table.add_column("Stage", style="cyan", no_wrap=True)
+        table.add_column("Name", overflow="fold")
+        for column in ("Calls", "Total", "Mean", "p50", "p95", "Max"):
+            table.add_column(column, justify="right", no_wrap=True)
+
+        def ms(seconds: float) -> str:
+            return f"{seconds * 1000:.1f}"
+
+        for row in rows:
+            table.add_row(
+                row["stage"],
+                row["name"],
+                str(row["count"]),
+                *(ms(row[key]) for key in ("total", "mean", "p50", "p95", "max")),
+            )
+        self.console.print(table)
+        self.console.print(
+            f"[dim]总耗时 / Wall time: {ms(wall)} ms "
+            "(嵌套阶段重复计入 / nested stages overlap)[/dim]"
+        )
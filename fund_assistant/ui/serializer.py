@@ -0,0 +1,151 @@
+"""Machine-readable output (JSON, NDJSON, CSV).
+
+Used by the global `--output` option and the HTTP server. Models are
+dumped straight to JSON types and written row by row, so long outputs
+(e.g. full NAV histories) never go through Rich or build one large string.
+This module imports neither Rich nor NumPy.
+"""
+
+import csv
+import json
+import math
+import sys
+from collections.abc import Iterable
+from datetime import date, datetime
+from decimal import Decimal
+from typing import IO
+
+from pydantic import BaseModel
+
+FORMATS = ("table", "json", "ndjson", "csv")
+
+
+def to_jsonable(value):
+    """转换为 JSON 类型 / Convert models, arrays and named tuples for json.dumps.
+
+    NaN and infinite floats become None, since JSON has no literal for them.
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if hasattr(value, "_asdict"):
+        return {key: to_jsonable(item) for key, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {str(key): to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(item) for item in value]
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if hasattr(value, "tolist"):
+        return to_jsonable(value.tolist())
+    return value
+
+
+def flatten(record, prefix: str = "") -> dict:
+    """展平记录 / Flatten nested objects into dotted CSV columns.
+
+    Lists are kept as one JSON-encoded cell.
+    """
+    if not isinstance(record, dict):
+        return {prefix or "value": record}
+    flat = {}
+    for key, value in record.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def write(data, fmt: str = "json", stream: IO[str] | None = None):
+    """写出数据 / Write a record or an iterable of records.
+
+    A single model or dict becomes one JSON document (or one NDJSON line /
+    one CSV row); lists and other iterables are written one row at a time.
+
+    Args:
+        data: Model, dict, named tuple or an iterable of them
+        fmt: "json", "ndjson" or "csv"
+        stream: Output stream (defaults to stdout)
+    """
+    stream = stream or sys.stdout
+    single = isinstance(data, (BaseModel, dict)) or hasattr(data, "_asdict")
+    rows: Iterable = [data] if single else data
+
+    if fmt == "json":
+        if single:
+            stream.write(_dumps(to_jsonable(data)) + "\n")
+            return
+        stream.write("[")
+        for i, row in enumerate(rows):
+            stream.write(("," if i else "") + "\n" + _dumps(to_jsonable(row)))
+        stream.write("\n]\n")
+    elif fmt == "ndjson":
+        for row in rows:
+            stream.write(_dumps(to_jsonable(row)) + "\n")
+    elif fmt == "csv":
+        writer = None
+        for row in rows:
+            flat = flatten(to_jsonable(row))
+            if writer is None:
+                writer = csv.DictWriter(stream, fieldnames=list(flat), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(flat)
+    else:
+        raise ValueError(f"Unknown output format {fmt}")
+
+
+def write_matrix(result: dict, matrix: str = "correlation", fmt: str = "json", stream=None):
+    """导出矩阵 / Write a correlation or covariance matrix row by row.
+
+    JSON writes one document with the fund list and a "values" matrix;
+    NDJSON and CSV write one line per fund.
+
+    Args:
+        result: Result of FundService.get_correlation
+        matrix: "correlation" or "covariance"
+        fmt: "json", "ndjson" or "csv"
+        stream: Output stream (defaults to stdout)
+    """
+    stream = stream or sys.stdout
+    values = result[matrix]
+    labelled = zip(result["codes"], result["names"], values)
+
+    if fmt == "csv":
+        writer = csv.writer(stream)
+        writer.writerow(["code", "name", *result["codes"]])
+        for code, name, row in labelled:
+            cells = (f"{value:.6f}" if math.isfinite(value) else "" for value in row)
+            writer.writerow([code, name, *cells])
+    elif fmt == "ndjson":
+        for code, name, row in labelled:
+            line = {"code": code, "name": name, matrix: _rounded(row)}
+            stream.write(_dumps(line) + "\n")
+    else:
+        header = {
+            key: result[key]
+            for key in (
+                "codes", "names", "excluded", "flat", "start_date", "end_date", "observations"
+            )
+        }
+        stream.write(_dumps({**header, "matrix": matrix})[:-1])
+        stream.write(', "values": [')
+        for i, row in enumerate(values):
+            stream.write(("," if i else "") + _dumps(_rounded(row)))
+        stream.write("]}\n")
+
+
+def _rounded(row) -> list:
+    """矩阵行 / A matrix row rounded to 6 places, non-finite values as None."""
+    return [round(value, 6) if math.isfinite(value) else None for value in row.tolist()]
+
+
+def _dumps(value) -> str:
+    """紧凑 JSON / Compact JSON keeping non-ASCII fund names readable."""
+    return json.dumps(value, ensure_ascii=False)
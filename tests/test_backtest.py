@@ -0,0 +1,58 @@
+"""Tests for the vectorized DCA backtest."""
+
+import numpy as np
+import pytest
+
+from fund_assistant.services import backtest
+from fund_assistant.services.backtest import backtest_dca, sweep_start_dates, xirr
+
+
+def rising_nav(years: int = 3, annual: float = 0.10) -> tuple[np.ndarray, np.ndarray]:
+    """Daily NAV growing steadily at `annual` per year."""
+    dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2020-01-01") + 365 * years)
+    days = np.arange(len(dates))
+    return dates, (1 + annual) ** (days / 365.0)
+
+
+@pytest.mark.parametrize("frequency", ["monthly", "weekly", "daily"])
+def test_rising_nav_has_no_drawdown(frequency):
+    dates, nav = rising_nav()
+    result = backtest_dca(dates, nav, 1000, frequency)
+
+    assert result["max_drawdown"] == 0
+    assert all(dd == 0 for _, dd in result["drawdown_path"])
+    assert result["profit"] > 0
+
+
+def test_drawdown_follows_nav_fall():
+    dates, nav = rising_nav(years=2)
+    nav = nav.copy()
+    nav[400:] *= 0.8  # 20% crash after the first year
+    result = backtest_dca(dates, nav, 1000, "monthly")
+
+    assert result["max_drawdown"] == pytest.approx(-20.0, abs=0.05)
+    assert result["max_drawdown_date"] == str(dates[400])
+
+
+def test_xirr_matches_constant_growth():
+    times = np.array([[0.0, 1.0, 2.0]])
+    flows = np.array([[-100.0, -100.0, 100 * 1.1**2 + 100 * 1.1]])
+    assert xirr(times, flows)[0] == pytest.approx(0.1, abs=1e-8)
+
+
+def test_sweep_reports_irr_range():
+    dates, nav = rising_nav()
+    result = sweep_start_dates(dates, nav, 1000, 1)
+
+    assert result["irr"]["min"] == pytest.approx(10.0, abs=0.5)
+    assert result["irr"]["min"] <= result["irr"]["median"] <= result["irr"]["max"]
+
+
+@pytest.mark.filterwarnings("error")
+def test_sweep_without_converged_irr_returns_none(monkeypatch):
+    monkeypatch.setattr(backtest, "xirr", lambda times, flows: np.full(len(times), np.nan))
+    dates, nav = rising_nav()
+    result = sweep_start_dates(dates, nav, 1000, 1)
+
+    assert result["irr"] is None
+    assert result["starts"] > 0
@@ -0,0 +1,125 @@
+"""Tests for the two-tier response cache and the `cached` decorator."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from fund_assistant.api.cache import (
+    ESTIMATE_TTL,
+    MISSING,
+    FundCache,
+    cached,
+    estimate_expiry,
+)
+from fund_assistant.api.singleflight import SingleFlight
+from fund_assistant.market import CN_TZ
+
+LATER = datetime.now() + timedelta(hours=1)
+
+
+def test_entry_expires():
+    cache = FundCache()
+    cache.set("live", 1, LATER)
+    cache.set("stale", 2, datetime.now() - timedelta(seconds=1))
+
+    assert cache.get("live") == 1
+    assert cache.get("stale") is MISSING
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_falsy_values_are_hits():
+    cache = FundCache()
+    cache.set("zero", 0, LATER)
+    assert cache.get("zero") == 0
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = FundCache(maxsize=2)
+    cache.set("a", 1, LATER)
+    cache.set("b", 2, LATER)
+    cache.get("a")
+    cache.set("c", 3, LATER)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_disk_tier_is_shared_between_instances(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    writer = FundCache(disk_path=path)
+    writer.set("nav", {"nav": "1.2345"}, LATER)
+    writer.set("old", "gone", datetime.now() - timedelta(seconds=1))
+
+    reader = FundCache(disk_path=path)
+    assert reader.stats()["memory_size"] == 0
+    assert reader.get("nav") == {"nav": "1.2345"}
+    # The disk hit is promoted into the reader's memory tier
+    assert reader.stats()["memory_size"] == 1
+    assert reader.get("old") is MISSING
+
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = FundCache(disk_path=tmp_path / "cache.sqlite3")
+    cache.set("key", "value", LATER)
+    cache.clear()
+
+    assert cache.get("key") is MISSING
+    assert cache.stats()["disk_size"] == 0
+
+
+def test_estimate_expiry_follows_market_hours():
+    trading = datetime(2026, 9, 16, 10, 0, tzinfo=CN_TZ)  # Wednesday morning session
+    assert estimate_expiry(trading) == trading + ESTIMATE_TTL
+
+    lunch = datetime(2026, 9, 16, 12, 0, tzinfo=CN_TZ)
+    assert estimate_expiry(lunch) == datetime(2026, 9, 16, 13, 0, tzinfo=CN_TZ)
+
+    friday_close = datetime(2026, 9, 18, 16, 0, tzinfo=CN_TZ)
+    assert estimate_expiry(friday_close) == datetime(2026, 9, 21, 9, 30, tzinfo=CN_TZ)
+
+
+class Client:
+    """Minimal API client with the attributes `cached` looks for."""
+
+    def __init__(self, result):
+        self.cache = FundCache()
+        self.flights = SingleFlight()
+        self.result = result
+        self.calls = 0
+
+    @cached("quote", lambda now: now + timedelta(hours=1))
+    def quote(self, code: str):
+        self.calls += 1
+        return self.result
+
+    @cached("quote", lambda now: now + timedelta(hours=1))
+    async def async_quote(self, code: str):
+        self.calls += 1
+        return self.result
+
+
+def test_cached_reuses_results():
+    client = Client({"code": "110022"})
+    assert client.quote("110022") == {"code": "110022"}
+    assert client.quote(code="110022") == {"code": "110022"}
+    assert client.calls == 1
+
+    client.quote("161725")
+    assert client.calls == 2
+
+
+def test_cached_does_not_store_empty_results():
+    for empty in (None, []):
+        client = Client(empty)
+        client.quote("110022")
+        client.quote("110022")
+        assert client.calls == 2
+        assert client.cache.stats()["memory_size"] == 0
+
+
+def test_sync_and_async_variants_share_entries():
+    client = Client(["row"])
+    client.quote("110022")
+    assert asyncio.run(client.async_quote("110022")) == ["row"]
+    assert client.calls == 1
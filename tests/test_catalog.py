@@ -0,0 +1,50 @@
+"""Tests for importing fund lists into the catalog."""
+
+import pytest
+
+from fund_assistant.models import FundType, RiskLevel
+from fund_assistant.services.catalog import FundCatalog
+
+CSV = """code,name,fund_type,risk_level
+110022,易方达消费行业,股票型,高风险
+000001,华夏成长混合,混合型-灵活,
+161725,招商中证白酒,指数型,超高风险
+005827,,混合型,
+12345,短代码基金,股票型,
+"""
+
+
+def test_csv_import_skips_and_counts_bad_rows(tmp_path):
+    path = tmp_path / "funds.csv"
+    path.write_text(CSV, encoding="utf-8")
+
+    catalog = FundCatalog.from_file(path)
+
+    # Unknown risk label, missing name and a five-digit code are left out
+    assert catalog.codes == ["110022", "000001"]
+    assert catalog.skipped == 3
+    assert catalog.basic(0).risk_level == RiskLevel.HIGH
+    assert catalog.basic(1).fund_type == FundType.HYBRID
+    assert catalog.basic(1).risk_level == RiskLevel.MEDIUM_HIGH
+
+
+def test_json_import_skips_records_without_name(tmp_path):
+    path = tmp_path / "funds.json"
+    path.write_text(
+        '[{"code": "110022", "name": "易方达消费行业", "fund_type": "stock"},'
+        ' {"code": "000001", "fund_type": "hybrid"}, "000002"]',
+        encoding="utf-8",
+    )
+
+    catalog = FundCatalog.from_file(path)
+
+    assert catalog.codes == ["110022"]
+    assert catalog.skipped == 2
+
+
+def test_invalid_json_raises_value_error(tmp_path):
+    path = tmp_path / "funds.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="funds.json"):
+        FundCatalog.from_file(path)
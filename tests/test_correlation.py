@@ -0,0 +1,72 @@
+"""Tests for cross-fund correlation and its machine-readable output."""
+
+import io
+import json
+
+import numpy as np
+import pytest
+from rich.console import Console
+
+from fund_assistant.services.correlation import correlation_matrix
+from fund_assistant.ui import FundFormatter
+from fund_assistant.ui.serializer import to_jsonable, write_matrix
+
+DATES = np.arange(np.datetime64("2026-01-01"), np.datetime64("2026-01-01") + 60)
+
+
+def walk(seed: int) -> np.ndarray:
+    returns = np.random.default_rng(seed).normal(0, 0.01, len(DATES))
+    return np.cumprod(1 + returns)
+
+
+def test_constant_nav_is_reported_as_flat():
+    series = [(DATES, walk(1)), (DATES, np.ones(len(DATES))), (DATES, walk(2))]
+    result = correlation_matrix(series)
+
+    assert result["kept"].tolist() == [0, 2]
+    assert result["flat"].tolist() == [1]
+    assert np.isfinite(result["correlation"]).all()
+    assert result["correlation"].shape == (2, 2)
+
+
+def test_too_few_moving_funds_raise():
+    series = [(DATES, walk(1)), (DATES, np.ones(len(DATES)))]
+    with pytest.raises(ValueError):
+        correlation_matrix(series)
+
+
+def result_with_nan(size: int) -> dict:
+    correlation = np.full((size, size), 0.5)
+    np.fill_diagonal(correlation, 1.0)
+    correlation[0, 1:] = correlation[1:, 0] = np.nan
+    codes = [f"{110000 + i}" for i in range(size)]
+    return {
+        "codes": codes,
+        "names": codes,
+        "excluded": [],
+        "flat": [],
+        "start_date": "2026-01-01",
+        "end_date": "2026-03-01",
+        "observations": 59,
+        "correlation": correlation,
+        "covariance": correlation,
+    }
+
+
+def test_non_finite_values_serialize_as_null():
+    assert to_jsonable({"values": np.array([1.0, np.nan, np.inf])}) == {
+        "values": [1.0, None, None]
+    }
+
+    stream = io.StringIO()
+    write_matrix(result_with_nan(3), "correlation", "json", stream)
+    document = json.loads(stream.getvalue())
+    assert document["values"][0] == [1.0, None, None]
+
+
+def test_nan_pairs_sort_last():
+    console = Console(record=True, width=200)
+    result = result_with_nan(FundFormatter.HEATMAP_MAX + 2)
+    FundFormatter(console).display_correlation(result)
+
+    assert "nan" not in console.export_text()
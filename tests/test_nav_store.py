@@ -0,0 +1,113 @@
+"""Tests for the local NAV store and incremental history sync."""
+
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from fund_assistant.models import HistoricalNav
+from fund_assistant.services import FundService
+from fund_assistant.services.fund_service import SYNC_INTERVAL
+from fund_assistant.storage import NavStore
+
+
+def nav_row(day: date, nav: str, change: str | None = "0.10") -> HistoricalNav:
+    return HistoricalNav(
+        date=day,
+        nav=Decimal(nav),
+        accumulated_nav=Decimal(nav) + 1,
+        daily_change=Decimal(change) if change is not None else None,
+    )
+
+
+ROWS = [
+    nav_row(date(2026, 9, 16), "1.0100"),
+    nav_row(date(2026, 9, 14), "1.0000", None),
+    nav_row(date(2026, 9, 15), "1.0050"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = NavStore(tmp_path / "nav.sqlite3")
+    yield store
+    store.close()
+
+
+def test_upsert_is_idempotent(store):
+    assert store.upsert("110022", ROWS) == 3
+    store.upsert("110022", ROWS)
+    store.upsert("110022", [nav_row(date(2026, 9, 16), "1.0200")])
+
+    rows = store.load("110022")
+    assert len(rows) == 3
+    assert rows[0].nav == Decimal("1.0200")
+    assert store.load("161725") == []
+
+
+def test_load_is_newest_first_and_exact(store):
+    store.upsert("110022", ROWS)
+
+    rows = store.load("110022")
+    assert [row.date for row in rows] == sorted((row.date for row in ROWS), reverse=True)
+    assert rows[1] == ROWS[2]
+    assert rows[2].daily_change is None
+    assert store.load("110022", limit=1) == [ROWS[0]]
+    assert [row.date for row in store.load("110022", start_date=date(2026, 9, 15))] == [
+        date(2026, 9, 16),
+        date(2026, 9, 15),
+    ]
+    assert store.latest_date("110022") == date(2026, 9, 16)
+
+
+def test_load_series_is_oldest_first(store):
+    store.upsert("110022", ROWS)
+
+    series = store.load_series("110022")
+    assert [str(day) for day in series.dates] == ["2026-09-14", "2026-09-15", "2026-09-16"]
+    assert list(series.nav) == [1.0, 1.005, 1.01]
+    assert len(store.load_series("161725")) == 0
+
+
+def test_sync_state_round_trips(store):
+    assert store.synced_at("110022") is None
+    when = datetime(2026, 9, 16, 20, 30, 15)
+    store.mark_synced("110022", when)
+    assert store.synced_at("110022") == when
+
+
+class HistoryAPI:
+    """Stand-in for TianTianAPI serving NAV rows from a list."""
+
+    def __init__(self, rows: list[HistoricalNav]):
+        self.rows = rows
+        self.starts: list[date | None] = []
+
+    def iter_historical_nav(self, code, start_date=None, prefetch=1):
+        self.starts.append(start_date)
+        yield [row for row in self.rows if start_date is None or row.date >= start_date]
+
+
+def test_sync_fetches_from_the_day_after_the_latest_row(store):
+    api = HistoryAPI(ROWS)
+    service = FundService(nav_store=store, api=api)
+
+    assert service.sync_history("110022") == 3
+    api.rows = [*ROWS, nav_row(date(2026, 9, 17), "1.0150")]
+    assert service.sync_history("110022", force=True) == 1
+
+    assert api.starts == [None, date(2026, 9, 17)]
+    assert store.latest_date("110022") == date(2026, 9, 17)
+
+
+def test_sync_is_skipped_within_the_interval(store):
+    api = HistoryAPI(ROWS)
+    service = FundService(nav_store=store, api=api)
+
+    service.sync_history("110022")
+    assert service.sync_history("110022") == 0
+    assert len(api.starts) == 1
+
+    store.mark_synced("110022", datetime.now() - SYNC_INTERVAL - timedelta(minutes=1))
+    service.sync_history("110022")
+    assert len(api.starts) == 2
@@ -0,0 +1,128 @@
+"""Tests for retries, rate limiting and circuit breaking."""
+
+import time
+
+import httpx
+import pytest
+
+from fund_assistant.api import CircuitOpenError
+from fund_assistant.api.base import BaseClient
+from fund_assistant.api.errors import ResponseError, UpstreamError
+from fund_assistant.api.resilience import CircuitBreaker, Resilience, RetryPolicy, TokenBucket
+
+URL = "https://fund.example/api"
+
+# No waiting between retries
+NO_BACKOFF = RetryPolicy(attempts=3, base_delay=0.0, max_delay=0.0)
+
+
+def open_breaker(threshold: int = 2, reset_timeout: float = 0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker("fund.example", threshold, reset_timeout)
+    for _ in range(threshold):
+        breaker.check()
+        breaker.record_failure()
+    return breaker
+
+
+def test_breaker_opens_at_threshold():
+    breaker = CircuitBreaker("fund.example", threshold=3)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("fund.example", threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+
+def test_half_open_probe_success_closes():
+    breaker = open_breaker()
+    time.sleep(0.06)
+
+    breaker.check()  # The probe is admitted
+    assert breaker.state == "half-open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()  # Other callers still fail fast
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    breaker.check()
+
+
+def test_half_open_probe_failure_reopens():
+    breaker = open_breaker()
+    time.sleep(0.06)
+
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_retry_delay_is_bounded_and_honours_retry_after():
+    policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=2.0)
+    for retry in range(5):
+        assert 0 <= policy.delay(retry) <= min(2.0, 0.5 * 2**retry)
+    assert policy.delay(0, retry_after=1.5) >= 1.5
+    assert policy.delay(0, retry_after=60) <= 2.0
+
+
+def test_token_bucket_reserves_beyond_burst():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert not bucket.try_take()
+
+
+def client(statuses: list[int], threshold: int = 5) -> tuple[BaseClient, list[int]]:
+    """A client whose upstream answers `statuses` in turn, then 200."""
+    seen = []
+
+    def handler(request):
+        status = statuses[len(seen)] if len(seen) < len(statuses) else 200
+        seen.append(status)
+        return httpx.Response(status, text="ok")
+
+    resilience = Resilience(retry=NO_BACKOFF, rate=1e9, burst=10**9, threshold=threshold)
+    return BaseClient(resilience=resilience, transport=httpx.MockTransport(handler)), seen
+
+
+def test_transient_failures_are_retried():
+    api, seen = client([503, 502])
+    assert api.get(URL).text == "ok"
+    assert seen == [503, 502, 200]
+
+
+def test_retry_budget_is_limited():
+    api, seen = client([503] * 10)
+    with pytest.raises(UpstreamError):
+        api.get(URL)
+    assert len(seen) == NO_BACKOFF.attempts
+
+
+def test_client_errors_are_not_retried():
+    api, seen = client([404])
+    with pytest.raises(ResponseError):
+        api.get(URL)
+    assert seen == [404]
+
+
+def test_open_circuit_fails_without_a_request():
+    api, seen = client([503] * 10, threshold=3)
+    with pytest.raises(UpstreamError):
+        api.get(URL)
+    assert api.resilience.states() == {"fund.example": "open"}
+
+    with pytest.raises(CircuitOpenError):
+        api.get(URL)
+    assert len(seen) == 3
@@ -0,0 +1,58 @@
+"""Tests for request framing in the local JSON API server."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from fund_assistant.api import TianTianAPI
+from fund_assistant.server import FundServer
+from fund_assistant.services import FundService
+from fund_assistant.storage import NavStore
+
+
+async def exchange(request: bytes) -> tuple[int, bytes]:
+    """Send a raw request to a fresh server; return the status and the rest of the reply."""
+    api = TianTianAPI(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+    server = FundServer(FundService(nav_store=NavStore(":memory:"), api=api))
+    bound = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(server.serve("127.0.0.1", 0, bound.set_result))
+    host, port = await bound
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(request)
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    finally:
+        task.cancel()
+    status_line, _, rest = reply.partition(b"\r\n")
+    return int(status_line.split()[1]), rest
+
+
+@pytest.fixture(autouse=True)
+def data_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("FUND_ASSISTANT_HOME", str(tmp_path))
+    monkeypatch.setenv("FUND_ASSISTANT_CACHE", "off")
+
+
+def test_health():
+    status, rest = asyncio.run(
+        exchange(b"GET /health HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+    )
+    assert status == 200
+    assert b'"status": "ok"' in rest
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_invalid_content_length(length):
+    request = b"POST /health HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n"
+    status, rest = asyncio.run(exchange(request))
+    assert status == 400
+    assert b"Connection: close" in rest
+
+
+def test_oversized_head():
+    request = b"GET /health HTTP/1.1\r\nX-Filler: " + b"a" * (1 << 17) + b"\r\n\r\n"
+    status, _ = asyncio.run(exchange(request))
+    assert status == 431
@@ -0,0 +1,133 @@
+"""Tests for single-flight deduplication."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fund_assistant.api.singleflight import SingleFlight
+
+CALLERS = 8
+
+# Lets the leader of a threaded call finish
+release = threading.Event()
+
+
+@pytest.fixture(autouse=True)
+def reset_release():
+    release.clear()
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_threads(flights: SingleFlight, fn) -> list:
+    """Call `fn` through `flights` from CALLERS threads; return each outcome."""
+
+    def call():
+        try:
+            return flights.do("key", fn)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(CALLERS) as pool:
+        futures = [pool.submit(call) for _ in range(CALLERS)]
+        # Hold the leader until every other caller is waiting on it
+        wait_for(lambda: flights.shared == CALLERS - 1)
+        release.set()
+        return [future.result() for future in futures]
+
+
+def test_threads_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return {"nav": 1.0}
+
+    results = run_threads(flights, fn)
+    assert len(calls) == 1
+    assert all(result == {"nav": 1.0} for result in results)
+    assert results[0] is results[-1]
+
+
+def test_threads_share_the_leaders_exception():
+    flights = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError("upstream broke")
+
+    results = run_threads(flights, fn)
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_finished_calls_are_not_reused():
+    flights = SingleFlight()
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("key", lambda: 2) == 2
+    assert flights.shared == 0
+
+
+def test_coroutines_share_one_call():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [1, 2, 3]
+
+    async def main():
+        return await asyncio.gather(*(flights.ado("key", fetch) for _ in range(CALLERS)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert flights.shared == CALLERS - 1
+    assert all(result == [1, 2, 3] for result in results)
+
+
+def test_coroutines_share_the_leaders_exception():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream broke")
+
+    async def main():
+        waiting = (flights.ado("key", fetch) for _ in range(CALLERS))
+        return await asyncio.gather(*waiting, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_call():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def main():
+        first = asyncio.create_task(flights.ado("key", fetch))
+        second = asyncio.create_task(flights.ado("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"